@@ -1,6 +1,9 @@
 # common.py
 import sys
 import platform
+import logging
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from PyQt6.QtCore import Qt, QAbstractTableModel, QThread, pyqtSignal
 from PyQt6.QtWidgets import QSizePolicy
@@ -8,6 +11,8 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 
+logger = logging.getLogger(__name__)
+
 # --- [Worker Thread with Progress] ---
 class Worker(QThread):
     finished = pyqtSignal(object)
@@ -31,44 +36,128 @@ class Worker(QThread):
         """진행률 업데이트 (0-100)"""
         self.progress.emit(value)
 
-# --- [Enhanced Pandas Model with Sorting] ---
+# --- [Virtualized Pandas Model with Block Cache & Background Sorting] ---
 class PandasModel(QAbstractTableModel):
-    def __init__(self, data):
+    """
+    대용량 DataFrame용 테이블 모델
+    - 컬럼별 NumPy 배열(숫자형) / ExtensionArray(문자열, 범주형, 날짜)를 그대로 참조 (복사 없음)
+    - 화면에 보이는 행 블록만 문자열로 변환해 LRU 캐시에 보관
+    - 정렬은 DataFrame을 재배열하지 않고 백그라운드에서 계산한 argsort 순열로 표시 순서만 변경
+    """
+    BLOCK_ROWS = 256
+    CACHE_BLOCKS = 256
+    SYNC_SORT_ROWS = 100_000  # 이보다 작은 데이터는 GUI 스레드에서 바로 정렬
+    _sort_workers = set()
+
+    def __init__(self, data, block_rows=None, cache_blocks=None):
         super(PandasModel, self).__init__()
         self._data = data
+        self._block_rows = block_rows or self.BLOCK_ROWS
+        self._cache_blocks = cache_blocks or self.CACHE_BLOCKS
+        self._columns = [self._column_values(data.iloc[:, i]) for i in range(data.shape[1])]
+        self._header = [str(c) for c in data.columns]
+        self._index = data.index
+        self._order = None  # 정렬 순열 (None이면 원본 순서)
+        self._blocks = OrderedDict()  # (컬럼, 블록 번호) -> 포맷된 문자열 리스트
         self._sort_column = None
         self._sort_order = Qt.SortOrder.AscendingOrder
-    
+        self._sort_request = 0
+
+    @staticmethod
+    def _column_values(series):
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufc':
+            return series.to_numpy()
+        return series.array  # 문자열/범주형/날짜는 값 타입(Timestamp 등)을 유지
+
+    @staticmethod
+    def _format(values):
+        if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+            return [f"{v:.4f}" for v in values.tolist()]
+        return [f"{v:.4f}" if isinstance(v, (float, np.floating)) else str(v) for v in values]
+
+    def _block(self, col, block):
+        key = (col, block)
+        cached = self._blocks.get(key)
+        if cached is not None:
+            self._blocks.move_to_end(key)
+            return cached
+        start = block * self._block_rows
+        stop = min(start + self._block_rows, self.rowCount())
+        rows = slice(start, stop) if self._order is None else self._order[start:stop]
+        cached = self._format(self._columns[col][rows])
+        self._blocks[key] = cached
+        if len(self._blocks) > self._cache_blocks:
+            self._blocks.popitem(last=False)
+        return cached
+
     def rowCount(self, parent=None):
         return self._data.shape[0]
-    
+
     def columnCount(self, parent=None):
         return self._data.shape[1]
-    
+
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
-        if index.isValid():
-            if role == Qt.ItemDataRole.DisplayRole:
-                val = self._data.iloc[index.row(), index.column()]
-                if isinstance(val, float): 
-                    return f"{val:.4f}"
-                return str(val)
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            row = index.row()
+            return self._block(index.column(), row // self._block_rows)[row % self._block_rows]
         return None
-    
+
     def headerData(self, col, orientation, role):
         if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
-            return str(self._data.columns[col])
+            return self._header[col]
         if orientation == Qt.Orientation.Vertical and role == Qt.ItemDataRole.DisplayRole:
-            return str(self._data.index[col])
+            return str(self._index[col if self._order is None else self._order[col]])
         return None
-    
+
+    @staticmethod
+    def sort_permutation(series, ascending=True):
+        """정렬 후 행 위치 순열 (결측값은 항상 마지막, 같은 값은 원래 순서 유지)"""
+        if not (isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf'):
+            positions = pd.Series(series.array, copy=False)
+            return positions.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        # 숫자형은 NumPy argsort 직접 사용 (pandas sort_values보다 수 배 빠름)
+        values = series.to_numpy()
+        valid = np.flatnonzero(~np.isnan(values)) if values.dtype.kind == 'f' else None
+        if valid is not None:
+            values = values[valid]
+        if ascending:
+            order = np.argsort(values, kind='stable')
+        else:  # 뒤집어서 정렬한 결과를 다시 뒤집으면 같은 값의 원래 순서가 유지됨
+            order = len(values) - 1 - np.argsort(values[::-1], kind='stable')[::-1]
+        if valid is None:
+            return order
+        return np.concatenate([valid[order], np.flatnonzero(np.isnan(series.to_numpy()))])
+
     def sort(self, column, order=Qt.SortOrder.AscendingOrder):
-        """컬럼 정렬 기능"""
-        self.layoutAboutToBeChanged.emit()
-        col_name = self._data.columns[column]
-        ascending = (order == Qt.SortOrder.AscendingOrder)
-        self._data = self._data.sort_values(by=col_name, ascending=ascending)
+        """컬럼 정렬 기능 (column < 0이면 원래 순서로 복원)"""
+        self._sort_request += 1
+        request = self._sort_request
         self._sort_column = column
         self._sort_order = order
+        if column < 0 or column >= self.columnCount():
+            self._apply_order(request, None)
+            return
+        series = self._data.iloc[:, column]
+        ascending = (order == Qt.SortOrder.AscendingOrder)
+        if self.rowCount() <= self.SYNC_SORT_ROWS:
+            self._apply_order(request, self.sort_permutation(series, ascending))
+            return
+        # 큰 데이터는 백그라운드에서 순열만 계산하고, 완료되면 표시 순서만 교체
+        worker = Worker(self.sort_permutation, series, ascending)
+        worker.finished.connect(lambda perm, request=request: self._apply_order(request, perm))
+        worker.error.connect(lambda msg: logger.warning(f"Sort failed: {msg}"))
+        # 모델이 교체되어도 실행 중인 스레드가 해제되지 않도록 클래스 단위로 보관
+        PandasModel._sort_workers.add(worker)
+        worker.finished.connect(lambda _, worker=worker: PandasModel._sort_workers.discard(worker))
+        worker.error.connect(lambda _, worker=worker: PandasModel._sort_workers.discard(worker))
+        worker.start()
+
+    def _apply_order(self, request, order):
+        if request != self._sort_request:
+            return  # 더 최근 정렬 요청이 있음
+        self.layoutAboutToBeChanged.emit()
+        self._order = order
+        self._blocks.clear()
         self.layoutChanged.emit()
 
 # --- [Optimized MplCanvas with Static Font Config] ---
@@ -19,7 +19,17 @@ class ConfigManager:
         'data': {
             'last_file': '',
             'auto_load_last': False,
-            'sample_threshold': 10000
+            'sample_threshold': 10000,
+            'chunk_size': 200000,
+            'use_parquet_cache': True,
+            'downcast_floats': True,
+            'partition_workers': 0
+        },
+        'history': {
+            'max_history': 10,
+            'checkpoint_interval': 10,
+            'spill_to_disk': False,
+            'spill_threshold_mb': 256
         },
         'ai': {
             'timeout': 30,
@@ -0,0 +1,287 @@
+# correlation.py
+"""
+상관계수 엔진 (Pearson / Spearman)
+전체 행을 청크로 나눠 float32 행렬곱(X^T X)으로 컬럼쌍 합계를 누적하고, 합계에서 상관계수를 계산합니다.
+결측값은 pandas DataFrame.corr()와 같이 쌍별 제거(pairwise complete)로 처리합니다.
+
+합계는 더하고 뺄 수 있으므로 전처리 후에는
+- 값이 바뀐/추가된 컬럼: 해당 행/열의 합계만 다시 계산
+- 삭제된 행: 삭제된 행의 기여분만 빼기 (Pearson, UndoHistory가 기록한 삭제 행 사용)
+로 갱신하며, 컬럼 수가 수백 개여도 바뀐 부분만큼만 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+CHUNK_CELLS = 4_000_000  # 청크 하나의 최대 셀 수 (float32 16MB). 청크마다 float64 합계에 더해 누적 오차를 줄임
+PAIRS_PER_CELL = 4096  # 프로파일링 1셀 비용에 해당하는 컬럼쌍-행 곱 수 (백그라운드 계산 판단용)
+METHODS = ('pearson', 'spearman')
+
+
+def numeric_columns(df):
+    """상관계수 대상 컬럼 (숫자형, bool 제외 - select_dtypes('number')와 동일)"""
+    return [col for col in df.columns
+            if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype)]
+
+
+class _PairSums:
+    """
+    컬럼쌍 합계 (행 i, 열 j)
+    xy  = sum(x_i * x_j)
+    n   = 둘 다 결측이 아닌 행 수
+    sx  = sum(x_i)          (x_j도 결측이 아닌 행만)
+    sxx = sum(x_i ** 2)     (x_j도 결측이 아닌 행만)
+    값은 컬럼마다 shift(평균)를 빼고 누적해 float32에서도 자릿수 손실을 줄입니다.
+    """
+
+    NAMES = ('xy', 'n', 'sx', 'sxx')
+
+    def __init__(self):
+        self.columns = []
+        self.shift = np.empty(0)
+        self.xy = self.n = self.sx = self.sxx = np.empty((0, 0))
+        self.ranks = {}  # spearman: 컬럼 -> 평균 순위 (float32, 결측 NaN)
+
+    def resize(self, columns):
+        """columns 순서로 재배치하고 새 컬럼의 위치 목록 반환 (새 컬럼 합계는 0 - 호출한 쪽에서 계산)"""
+        old = {col: i for i, col in enumerate(self.columns)}
+        pos = np.array([old.get(col, -1) for col in columns], dtype=np.intp)
+        present = pos >= 0
+        for name in self.NAMES:
+            matrix = np.zeros((len(columns), len(columns)))
+            matrix[np.ix_(present, present)] = getattr(self, name)[np.ix_(pos[present], pos[present])]
+            setattr(self, name, matrix)
+        shift = np.zeros(len(columns))
+        shift[present] = self.shift[pos[present]]
+        self.columns, self.shift = list(columns), shift
+        keep = set(columns)
+        self.ranks = {col: r for col, r in self.ranks.items() if col in keep}
+        return list(np.flatnonzero(~present))
+
+    def clear(self, idx):
+        """idx 컬럼의 행/열 합계를 0으로"""
+        for name in self.NAMES:
+            matrix = getattr(self, name)
+            matrix[idx, :] = 0
+            matrix[:, idx] = 0
+
+    def accumulate(self, source_a, idx_a, source_b, idx_b, n_rows, sign=1.0):
+        """
+        컬럼 idx_a와 idx_b 사이의 합계를 [idx_a, idx_b]와 [idx_b, idx_a] 위치에 누적 (한 번의 청크 순회)
+        source(start, stop): shift를 뺀 float32 2차원 청크 (결측 NaN)를 돌려주는 함수
+        """
+        same = source_b is source_a
+        chunk_rows = max(1024, CHUNK_CELLS // (len(idx_a) + (0 if same else len(idx_b)) or 1))
+        ab = [np.zeros((len(idx_a), len(idx_b))) for _ in self.NAMES]  # xy, n, sx, sxx
+        ba = [np.zeros((len(idx_b), len(idx_a))) for _ in range(2)]  # sx, sxx (xy, n는 대칭)
+        for start in range(0, n_rows, chunk_rows):
+            a = source_a(start, start + chunk_rows)
+            b = a if same else source_b(start, start + chunk_rows)
+            missing_a = np.isnan(a)
+            missing_b = missing_a if same else np.isnan(b)
+            if missing_a.any() or missing_b.any():
+                a0 = np.where(missing_a, np.float32(0), a)
+                b0 = a0 if same else np.where(missing_b, np.float32(0), b)
+                valid_a = (~missing_a).astype(np.float32)
+                valid_b = valid_a if same else (~missing_b).astype(np.float32)
+                ab[0] += a0.T @ b0
+                ab[1] += valid_a.T @ valid_b
+                ab[2] += a0.T @ valid_b
+                ab[3] += (a0 * a0).T @ valid_b
+                if not same:
+                    ba[0] += b0.T @ valid_a
+                    ba[1] += (b0 * b0).T @ valid_a
+            else:
+                ab[0] += a.T @ b
+                ab[1] += len(a)
+                ab[2] += a.sum(axis=0, dtype=np.float64)[:, None]
+                ab[3] += np.square(a, dtype=np.float64).sum(axis=0)[:, None]
+                if not same:
+                    ba[0] += b.sum(axis=0, dtype=np.float64)[:, None]
+                    ba[1] += np.square(b, dtype=np.float64).sum(axis=0)[:, None]
+
+        for name, value in zip(self.NAMES, ab):
+            getattr(self, name)[np.ix_(idx_a, idx_b)] += sign * value
+        if same:
+            return
+        # [idx_b, idx_a] 중 위에서 이미 더한 [idx_a, idx_a] 부분은 제외
+        rest = ~np.isin(idx_b, idx_a)
+        sub = np.ix_(np.asarray(idx_b)[rest], idx_a)
+        self.xy[sub] += sign * ab[0].T[rest]
+        self.n[sub] += sign * ab[1].T[rest]
+        self.sx[sub] += sign * ba[0][rest]
+        self.sxx[sub] += sign * ba[1][rest]
+
+    def matrix(self):
+        """누적 합계로 상관계수 행렬 계산 (분산이 0이거나 겹치는 행이 없으면 NaN)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = self.n
+            cov = self.xy - self.sx * self.sx.T / n
+            var_x = self.sxx - self.sx ** 2 / n
+            var_y = var_x.T
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[(n < 1) | ~(var_x > 0) | ~(var_y > 0)] = np.nan
+        np.clip(corr, -1, 1, out=corr)
+        diag = np.diag(corr).copy()
+        diag[~np.isnan(diag)] = 1.0  # 반올림 오차 없이 자기 자신과는 1
+        np.fill_diagonal(corr, diag)
+        return corr
+
+
+class CorrelationEngine:
+    """
+    상관계수 행렬 캐시
+
+    set_data(df, touched, dropped_rows)로 변경 내용을 알려주면 바로 계산하지 않고 표시만 해 두었다가,
+    matrix() / top_pairs() 호출 시 필요한 부분만 갱신합니다.
+    Spearman은 컬럼별 순위를 float32로 보관하며(행 수 x 컬럼 수 x 4바이트), 행이 삭제되면 순위가
+    모두 바뀌므로 다시 계산합니다. 순위는 컬럼마다 결측을 제외하고 매기므로, 결측이 있으면
+    쌍마다 순위를 다시 매기는 pandas의 spearman과 약간 다를 수 있습니다.
+    """
+
+    def __init__(self):
+        self.df = None
+        self._sums = {}  # method -> _PairSums
+        self._dirty = {}  # method -> 다시 계산할 컬럼 집합 (None이면 전체)
+        self._dropped = {}  # method -> [삭제된 행 DataFrame, ...] (아직 합계에서 빼지 않은 것)
+        self._matrices = {}  # method -> 마지막으로 계산한 DataFrame
+
+    def set_data(self, df, touched=None, dropped_rows=None):
+        """
+        Parameters:
+        -----------
+        df : DataFrame
+            현재 데이터
+        touched : list, optional
+            값이 바뀌거나 추가된 컬럼. None이면 전체 다시 계산
+        dropped_rows : DataFrame, optional
+            직전 작업이 삭제한 행 (값이 그대로인 컬럼만). 합계에서 이 행들의 기여분만 뺌
+        """
+        previous, self.df = self.df, df
+        self._matrices.clear()
+        for method in METHODS:
+            if touched is None or previous is None or method not in self._sums:
+                self._reset(method)
+                continue
+            if dropped_rows is not None:
+                # 순위는 모든 행이 바뀌고, 절반 넘게 삭제되면 남은 행으로 다시 계산하는 편이 빠름
+                if method == 'spearman' or len(dropped_rows) > len(df):
+                    self._reset(method)
+                    continue
+                self._dropped[method].append(dropped_rows)
+            if self._dirty[method] is not None:
+                self._dirty[method].update(touched)
+
+    def _reset(self, method):
+        self._sums.pop(method, None)
+        self._dirty[method] = None
+        self._dropped[method] = []
+
+    def stale_cells(self, method='pearson'):
+        """남은 계산량 (프로파일링 셀 수 단위의 대략적인 값)"""
+        if self.df is None or method in self._matrices:
+            return 0
+        p = len(numeric_columns(self.df))
+        dirty = self._dirty.get(method)
+        changed = p if dirty is None else len(dirty)
+        dropped = sum(len(rows) for rows in self._dropped.get(method, []))
+        return (len(self.df) * changed + dropped * p) * p // PAIRS_PER_CELL
+
+    def matrix(self, method='pearson'):
+        """상관계수 행렬 DataFrame (숫자형 컬럼 x 숫자형 컬럼)"""
+        if method not in METHODS:
+            raise ValueError(f"Unsupported correlation method: {method}")
+        if method not in self._matrices:
+            sums = self._update(method)
+            self._matrices[method] = pd.DataFrame(sums.matrix(), index=sums.columns, columns=sums.columns)
+        return self._matrices[method]
+
+    def top_pairs(self, k=5, method='pearson', absolute=True):
+        """
+        상관이 가장 강한 컬럼쌍 k개 (상삼각 원소만 보고 argpartition으로 선택)
+
+        Returns:
+        --------
+        list : [(컬럼1, 컬럼2, 상관계수), ...] - absolute=True면 절댓값 내림차순
+        """
+        corr = self.matrix(method)
+        rows, cols = np.triu_indices(len(corr), k=1)
+        values = corr.to_numpy()[rows, cols]
+        score = np.abs(values) if absolute else values.copy()
+        score[np.isnan(score)] = -np.inf
+        k = min(k, len(score))
+        if k <= 0:
+            return []
+        best = np.argpartition(-score, k - 1)[:k] if k < len(score) else np.arange(len(score))
+        best = best[np.argsort(-score[best], kind='stable')]
+        best = best[np.isfinite(score[best])]
+        names = corr.columns
+        return [(names[rows[i]], names[cols[i]], float(values[i])) for i in best]
+
+    def _update(self, method):
+        """보류된 행 삭제/컬럼 변경을 합계에 반영"""
+        sums = self._sums.get(method)
+        dirty = self._dirty[method]
+        if sums is None:
+            sums, dirty = _PairSums(), None
+        for dropped in self._dropped[method]:
+            self._subtract_rows(sums, dropped)
+        self._dropped[method] = []
+
+        columns = numeric_columns(self.df)
+        if dirty is None:
+            sums = _PairSums()
+            dirty = set(columns)
+        added = sums.resize(columns)
+        changed = sorted(set(added) | {i for i, col in enumerate(columns) if col in dirty})
+        if changed:
+            self._recompute(sums, changed, method)
+        self._sums[method] = sums
+        self._dirty[method] = set()
+        return sums
+
+    def _subtract_rows(self, sums, dropped):
+        """삭제된 행의 기여분을 뺌 (dropped에 없는 컬럼은 값이 바뀐 컬럼이라 이후 다시 계산됨)"""
+        idx = [i for i, col in enumerate(sums.columns) if col in dropped.columns]
+        if not idx or not len(dropped):
+            return
+        cols = [sums.columns[i] for i in idx]
+        source = self._pearson_source(dropped, cols, sums.shift[idx])
+        sums.accumulate(source, idx, source, idx, len(dropped), sign=-1.0)
+
+    def _recompute(self, sums, changed, method):
+        """changed 컬럼의 행/열 합계를 전체 행으로 다시 계산"""
+        columns = sums.columns
+        for i in changed:
+            if method == 'spearman':
+                ranks = self.df[columns[i]].rank(method='average').to_numpy(dtype=np.float32, na_value=np.nan)
+                sums.ranks[columns[i]] = ranks
+                sums.shift[i] = (np.count_nonzero(~np.isnan(ranks)) + 1) / 2  # 평균 순위의 평균
+            else:
+                mean = self.df[columns[i]].mean()
+                sums.shift[i] = float(mean) if pd.notna(mean) else 0.0
+        sums.clear(changed)
+
+        everything = list(range(len(columns)))
+        source_all = self._source(sums, everything, method)
+        if len(changed) == len(columns):
+            sums.accumulate(source_all, everything, source_all, everything, len(self.df))
+        else:
+            sums.accumulate(self._source(sums, changed, method), changed, source_all, everything, len(self.df))
+
+    def _source(self, sums, idx, method):
+        cols = [sums.columns[i] for i in idx]
+        if method == 'spearman':
+            ranks = [sums.ranks[col] for col in cols]
+            shift = sums.shift[idx].astype(np.float32)
+            return lambda start, stop: np.column_stack([r[start:stop] for r in ranks]) - shift
+        return self._pearson_source(self.df, cols, sums.shift[idx])
+
+    @staticmethod
+    def _pearson_source(df, cols, shift):
+        frame = df[cols]
+
+        def source(start, stop):
+            values = frame.iloc[start:stop].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+            values -= shift  # 큰 값(예: 1e6 + 작은 변화)도 float32로 줄이기 전에 평균을 빼서 정밀도 유지
+            return values.astype(np.float32)
+        return source
@@ -0,0 +1,199 @@
+# data_loader.py
+"""
+대용량 데이터 파일 로더
+CSV를 청크 단위로 읽으면서 컬럼 타입을 압축(정수/실수 다운캐스트, 저카디널리티 문자열은 category,
+나머지 문자열은 pyarrow string)하고, 파싱 결과를 Parquet 캐시로 저장해 다음 로드를 즉시 처리합니다.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 (string[pyarrow] 타입 및 Parquet 캐시에 필요)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+LOADER_VERSION = 1  # 타입 추론 규칙이 바뀌면 올려서 이전 캐시를 무효화
+DEFAULT_CHUNK_SIZE = 200_000
+CATEGORY_MAX_RATIO = 0.5  # 고유값 비율이 이 이하인 문자열 컬럼은 category로 변환
+CATEGORY_MAX_UNIQUE = 10_000
+DEFAULT_CACHE_DIR = Path.home() / '.eda_master' / 'cache'
+
+
+def _arrow_string_dtype():
+    """pyarrow 기반 문자열 타입 (결측값은 NaN으로 유지해 기존 비교/필터 코드와 호환)"""
+    if not HAS_PYARROW:
+        return None
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)  # pandas >= 2.3
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype('pyarrow_numpy')  # pandas 2.1 ~ 2.2
+    except (TypeError, ValueError):
+        return pd.StringDtype('pyarrow')
+
+
+STRING_DTYPE = _arrow_string_dtype()
+
+
+def _is_text(series):
+    return (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) \
+        and not isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def downcast_numeric(series, downcast_floats=True):
+    """정수는 가장 작은 정수 타입으로, 실수는 범위가 맞으면 float32로 다운캐스트"""
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+    if pd.api.types.is_float_dtype(series) and downcast_floats:
+        return pd.to_numeric(series, downcast='float')
+    return series
+
+
+def widen_integers(series):
+    """다운캐스트된 정수 컬럼을 int64로 되돌림 (제곱 등 오버플로가 날 수 있는 연산 전에 사용)"""
+    if pd.api.types.is_integer_dtype(series) and series.dtype != np.int64 and not series.hasnans:
+        return series.astype(np.int64)
+    return series
+
+
+def optimize_chunk(chunk, downcast_floats=True):
+    """청크 단위 1차 압축: 숫자 다운캐스트 + 문자열을 pyarrow string으로 변환"""
+    for col in chunk.columns:
+        s = chunk[col]
+        if pd.api.types.is_numeric_dtype(s):
+            chunk[col] = downcast_numeric(s, downcast_floats)
+        elif STRING_DTYPE is not None and _is_text(s) and s.dtype != STRING_DTYPE:
+            try:
+                chunk[col] = s.astype(STRING_DTYPE)
+            except (TypeError, ValueError, ArithmeticError):
+                pass  # 문자열로 바꿀 수 없는 혼합 객체는 그대로 둠
+    return chunk
+
+
+def optimize_dtypes(df, downcast_floats=True, category_max_ratio=CATEGORY_MAX_RATIO,
+                    category_max_unique=CATEGORY_MAX_UNIQUE):
+    """
+    전체 데이터 기준 타입 압축
+
+    청크 병합 후 다시 호출해 청크마다 달라진 타입(int8 + int16 등)을 정리하고,
+    고유값이 적은 문자열 컬럼을 category로 바꿉니다.
+    """
+    df = optimize_chunk(df, downcast_floats)
+    n_rows = len(df)
+    for col in df.columns:
+        s = df[col]
+        if not _is_text(s) or n_rows == 0:
+            continue
+        n_unique = s.nunique(dropna=True)
+        if n_unique <= category_max_unique and n_unique <= n_rows * category_max_ratio:
+            df[col] = s.astype('category')
+    return df
+
+
+def cache_path_for(file_name, cache_dir=None, downcast_floats=True):
+    """원본 경로/크기/수정 시각/로더 버전으로 캐시 파일 경로 결정 (원본이 바뀌면 자동으로 새 캐시)"""
+    stat = os.stat(file_name)
+    key = f"{os.path.abspath(file_name)}|{stat.st_size}|{stat.st_mtime_ns}|{LOADER_VERSION}|{downcast_floats}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir or DEFAULT_CACHE_DIR) / f"{Path(file_name).stem}-{digest}.parquet"
+
+
+def _read_csv_chunked(file_name, chunk_size, downcast_floats, report, encoding=None):
+    total = max(os.path.getsize(file_name), 1)
+    chunks = []
+    with open(file_name, 'rb') as f:
+        reader = pd.read_csv(f, chunksize=chunk_size, encoding=encoding, low_memory=False)
+        for chunk in reader:
+            chunks.append(optimize_chunk(chunk, downcast_floats))
+            report(90 * f.tell() / total)  # 파싱은 전체 진행률의 90%
+    if not chunks:
+        return pd.read_csv(file_name, encoding=encoding)  # 헤더만 있는 파일
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_data_file(file_name, chunk_size=DEFAULT_CHUNK_SIZE, use_cache=True, cache_dir=None,
+                   downcast_floats=True, progress_callback=None):
+    """
+    데이터 파일 로드 (CSV / Excel / Parquet)
+
+    Parameters:
+    -----------
+    file_name : str
+        불러올 파일 경로
+    chunk_size : int
+        CSV를 한 번에 읽을 행 수
+    use_cache : bool
+        Parquet 캐시 사용 여부 (pyarrow 필요)
+    cache_dir : str, optional
+        캐시 폴더. None이면 ~/.eda_master/cache
+    downcast_floats : bool
+        실수 컬럼을 float32로 다운캐스트할지 여부
+    progress_callback : callable, optional
+        진행률(0-100 정수)을 받는 함수 (예: Worker.update_progress)
+
+    Returns:
+    --------
+    tuple : (DataFrame, info) - info는 {'from_cache', 'memory_mb', 'cache_path'}
+    """
+    last = [-1]
+
+    def report(value):
+        value = int(min(max(value, 0), 100))
+        if progress_callback and value != last[0]:
+            last[0] = value
+            progress_callback(value)
+
+    report(0)
+    lower = file_name.lower()
+    cache_file = None
+    if use_cache and HAS_PYARROW and not lower.endswith('.parquet'):
+        cache_file = cache_path_for(file_name, cache_dir, downcast_floats)
+        if cache_file.exists():
+            try:
+                df = pd.read_parquet(cache_file)
+                report(100)
+                logger.info(f"Loaded {file_name} from cache {cache_file}")
+                return df, _load_info(df, True, cache_file)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache {cache_file}: {e}")
+
+    if lower.endswith('.csv'):
+        df = _read_csv_chunked(file_name, chunk_size, downcast_floats, report)
+    elif lower.endswith('.parquet'):
+        df = pd.read_parquet(file_name)
+    else:
+        df = pd.read_excel(file_name)
+    report(90)
+    df = optimize_dtypes(df, downcast_floats)
+    report(95)
+
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            df.to_parquet(tmp_file, index=False)
+            os.replace(tmp_file, cache_file)  # 중간에 실패해도 깨진 캐시가 남지 않도록
+        except Exception as e:
+            logger.warning(f"Failed to write parquet cache {cache_file}: {e}")
+            cache_file = None
+    report(100)
+    return df, _load_info(df, False, cache_file)
+
+
+def _load_info(df, from_cache, cache_file):
+    return {
+        'from_cache': from_cache,
+        'memory_mb': df.memory_usage(deep=True).sum() / 1024 ** 2,
+        'cache_path': str(cache_file) if cache_file else None,
+    }
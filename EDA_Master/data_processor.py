@@ -2,10 +2,32 @@
 """
 데이터 처리 로직을 중앙화한 모듈
 main.py에서 분리하여 재사용성과 테스트 용이성 향상
+
+PreprocessPlan: 작업을 바로 실행하지 않고 계획에 쌓아 두었다가, 인접한 호환 작업을 합쳐 한 번에 실행하는
+지연(lazy) 파이프라인. JSON으로 저장해 UI 없이 새 파일에 다시 적용할 수 있습니다.
+    python data_processor.py plan.json new_data.csv -o cleaned.parquet
+메모리보다 큰 파일은 --partitioned로 Parquet row group 단위로 처리합니다 (partitioned.py).
 """
+import argparse
+import json
+import logging
+
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, MinMaxScaler, StandardScaler, RobustScaler, MaxAbsScaler
+from data_loader import widen_integers, load_data_file
+
+logger = logging.getLogger(__name__)
+
+OUTLIER_METHODS = ('iqr', 'zscore', 'mad', 'isolation_forest')
+# 방식별 기본 기준 (iqr/zscore/mad: 경계 배수 k, isolation_forest: 이상치로 볼 행 비율)
+OUTLIER_THRESHOLDS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5, 'isolation_forest': 0.01}
+
+
+def outlier_columns(df, columns):
+    """이상치 처리 대상 컬럼 (존재하는 숫자형 컬럼, bool 제외)"""
+    return [c for c in columns if c in df.columns and pd.api.types.is_numeric_dtype(df[c])
+            and not pd.api.types.is_bool_dtype(df[c])]
 
 class DataProcessor:
     """데이터 전처리 작업을 담당하는 클래스"""
@@ -15,7 +37,7 @@ class DataProcessor:
         """결측치를 평균으로 채우기"""
         for col in columns:
             if pd.api.types.is_numeric_dtype(df[col]):
-                df[col].fillna(df[col].mean(), inplace=True)
+                df[col] = df[col].fillna(df[col].mean())
         return df
     
     @staticmethod
@@ -23,7 +45,7 @@ class DataProcessor:
         """결측치를 중앙값으로 채우기"""
         for col in columns:
             if pd.api.types.is_numeric_dtype(df[col]):
-                df[col].fillna(df[col].median(), inplace=True)
+                df[col] = df[col].fillna(df[col].median())
         return df
     
     @staticmethod
@@ -31,7 +53,7 @@ class DataProcessor:
         """결측치를 최빈값으로 채우기"""
         for col in columns:
             if not df[col].empty:
-                df[col].fillna(df[col].mode()[0], inplace=True)
+                df[col] = df[col].fillna(df[col].mode()[0])
         return df
     
     @staticmethod
@@ -52,27 +74,106 @@ class DataProcessor:
             df.dropna(axis=1, how='all', inplace=True)
         return df
     
+    @staticmethod
+    def outlier_bounds(df, columns, method='iqr', threshold=None, quartiles=None):
+        """
+        여러 컬럼의 이상치 경계를 한 번에 계산
+
+        Parameters:
+        -----------
+        columns : list
+            숫자형 컬럼 (bool 제외)
+        method : str
+            'iqr' (Q1 - k*IQR ~ Q3 + k*IQR), 'zscore' (평균 ± k*표준편차),
+            'mad' (중앙값 ± k*1.4826*MAD)
+        threshold : float, optional
+            k 값. None이면 OUTLIER_THRESHOLDS 기본값 (1.5 / 3 / 3.5)
+        quartiles : DataFrame, optional
+            이미 계산된 분위수 (index 0.25/0.75, 컬럼별) - 'iqr'에서 없는 컬럼만 새로 계산
+
+        Returns:
+        --------
+        tuple : (하한 Series, 상한 Series) - 퍼짐이 0인 컬럼(zscore/mad)은 경계 없음(±inf)
+        """
+        k = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
+        block = df[columns]
+        if method == 'iqr':
+            known = [c for c in columns if quartiles is not None and c in quartiles.columns]
+            missing = [c for c in columns if c not in known]
+            q = block[missing].quantile([0.25, 0.75]) if missing else None  # 모든 컬럼을 한 번에 집계
+            if known:
+                q = pd.concat([quartiles[known], q], axis=1) if q is not None else quartiles[known]
+            q = q[columns]
+            q1, q3 = q.loc[0.25], q.loc[0.75]
+            iqr = q3 - q1
+            return q1 - k * iqr, q3 + k * iqr
+        if method == 'zscore':
+            center, spread = block.mean(), block.std()
+        elif method == 'mad':
+            center = block.median()
+            spread = 1.4826 * (block - center).abs().median()  # 정규분포에서 표준편차와 같은 척도
+        else:
+            raise ValueError(f"경계를 계산할 수 없는 이상치 방식: {method}")
+        spread = spread.where(spread > 0, np.inf)
+        return center - k * spread, center + k * spread
+
+    @staticmethod
+    def outlier_mask(df, columns, method='iqr', threshold=None, quartiles=None):
+        """
+        하나 이상의 컬럼에서 이상치인 행 (bool ndarray, 결측값은 이상치가 아님)
+
+        'isolation_forest'는 선택한 컬럼을 함께 보고 이상 점수가 높은 threshold 비율의 행을 찾습니다
+        (결측은 중앙값으로 채워 학습). 나머지 방식은 outlier_bounds의 경계를 벗어난 값이 있는 행입니다.
+        """
+        if not columns or not len(df):
+            return np.zeros(len(df), dtype=bool)
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if method == 'isolation_forest':
+            from sklearn.ensemble import IsolationForest
+            contamination = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
+            medians = np.nan_to_num(np.nanmedian(values, axis=0))
+            filled = np.where(np.isnan(values), medians, values)
+            return IsolationForest(contamination=contamination, random_state=42).fit_predict(filled) == -1
+        lower, upper = DataProcessor.outlier_bounds(df, columns, method, threshold, quartiles)
+        return DataProcessor.outside_mask(df, columns, lower, upper, values)
+
+    @staticmethod
+    def outside_mask(df, columns, lower, upper, values=None):
+        """컬럼별 [하한, 상한]을 벗어난 값이 하나라도 있는 행 (bool ndarray)"""
+        if values is None:
+            values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        return ((values < np.asarray(lower, dtype=np.float64))
+                | (values > np.asarray(upper, dtype=np.float64))).any(axis=1)
+
+    @staticmethod
+    def remove_outliers(df, columns, method='iqr', threshold=None, quartiles=None):
+        """
+        이상치가 있는 행 제거
+
+        모든 컬럼의 경계를 같은 데이터에서 계산하고, 마스크 하나로 합쳐 행 선택은 한 번만 합니다.
+        """
+        cols = outlier_columns(df, columns)
+        mask = DataProcessor.outlier_mask(df, cols, method, threshold, quartiles)
+        return df[~mask] if mask.any() else df
+
+    @staticmethod
+    def cap_outliers(df, columns, method='iqr', threshold=None, quartiles=None):
+        """이상치를 경계값으로 바꿈 (모든 컬럼을 한 번에 clip)"""
+        cols = outlier_columns(df, columns)
+        if cols:
+            lower, upper = DataProcessor.outlier_bounds(df, cols, method, threshold, quartiles)
+            df[cols] = df[cols].clip(lower=lower, upper=upper, axis=1)
+        return df
+
     @staticmethod
     def remove_outliers_iqr(df, columns):
         """IQR 방식으로 이상치 제거"""
-        for col in columns:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                df = df[~((df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR)))]
-        return df
+        return DataProcessor.remove_outliers(df, columns, 'iqr')
     
     @staticmethod
     def cap_outliers_iqr(df, columns):
         """IQR 방식으로 이상치 상/하한 적용"""
-        for col in columns:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                df[col] = df[col].clip(lower=Q1 - 1.5 * IQR, upper=Q3 + 1.5 * IQR)
-        return df
+        return DataProcessor.cap_outliers(df, columns, 'iqr')
     
     @staticmethod
     def label_encode(df, columns):
@@ -92,7 +193,7 @@ class DataProcessor:
         """제곱 특성 생성"""
         for col in columns:
             if pd.api.types.is_numeric_dtype(df[col]):
-                df[f"{col}_squared"] = df[col] ** 2
+                df[f"{col}_squared"] = widen_integers(df[col]) ** 2
         return df
     
     @staticmethod
@@ -181,23 +282,425 @@ class DataProcessor:
         value : any
             비교값
         """
+        return df[DataProcessor.filter_mask(df, column, operator, value)]
+
+    @staticmethod
+    def filter_mask(df, column, operator, value):
+        """filter_data의 조건을 남길 행 마스크(bool Series)로 반환"""
         if operator == '==':
-            return df[df[column] == value]
+            return df[column] == value
         elif operator == '!=':
-            return df[df[column] != value]
+            return df[column] != value
         elif operator == '>':
-            return df[df[column] > value]
+            return df[column] > value
         elif operator == '<':
-            return df[df[column] < value]
+            return df[column] < value
         elif operator == '>=':
-            return df[df[column] >= value]
+            return df[column] >= value
         elif operator == '<=':
-            return df[df[column] <= value]
+            return df[column] <= value
         elif operator == 'contains':
-            return df[df[column].astype(str).str.contains(str(value), na=False)]
+            return df[column].astype(str).str.contains(str(value), na=False)
         elif operator == 'startswith':
-            return df[df[column].astype(str).str.startswith(str(value), na=False)]
+            return df[column].astype(str).str.startswith(str(value), na=False)
         elif operator == 'endswith':
-            return df[df[column].astype(str).str.endswith(str(value), na=False)]
+            return df[column].astype(str).str.endswith(str(value), na=False)
         else:
             raise ValueError(f"지원하지 않는 연산자: {operator}")
+
+    @staticmethod
+    def fill_missing(df, strategies):
+        """
+        여러 컬럼의 결측치를 한 번에 채우기
+
+        Parameters:
+        -----------
+        strategies : dict
+            {컬럼: 'mean' | 'median' | 'mode'} - 평균/중앙값은 숫자형 컬럼에만 적용
+
+        Returns:
+        --------
+        tuple : (DataFrame, 실제로 채운 컬럼 목록)
+        """
+        by_kind = {'mean': [], 'median': [], 'mode': []}
+        for col, kind in strategies.items():
+            if col in df.columns and (kind == 'mode' or pd.api.types.is_numeric_dtype(df[col])):
+                by_kind[kind].append(col)
+        values = {}
+        if by_kind['mean']:
+            values.update(df[by_kind['mean']].mean().to_dict())  # 여러 컬럼을 한 번에 집계
+        if by_kind['median']:
+            values.update(df[by_kind['median']].median().to_dict())
+        for col in by_kind['mode']:
+            mode = df[col].mode()
+            if len(mode):  # 전부 결측이면 채울 값이 없음
+                values[col] = mode.iloc[0]
+        values = {col: v for col, v in values.items() if pd.notna(v)}
+        if values:
+            df = df.fillna(values)
+        return df, list(values)
+
+    @staticmethod
+    def filter_rows(df, predicates):
+        """
+        여러 행 조건을 마스크 하나로 합쳐 한 번에 필터링
+
+        Parameters:
+        -----------
+        predicates : list of dict
+            {'type': 'notna', 'columns': [...] 또는 None(전체)} 또는
+            {'type': 'compare', 'column': .., 'operator': .., 'value': ..} (filter_data와 같은 연산자)
+
+        Returns:
+        --------
+        tuple : (DataFrame, 실제로 행을 줄인 조건 수) - 조건을 차례로 적용한 결과와 같음
+        """
+        keep = np.ones(len(df), dtype=bool)
+        applied = 0
+        for pred in predicates:
+            if pred['type'] == 'notna':
+                targets = pred.get('columns')
+                cols = [c for c in (df.columns if targets is None else targets) if c in df.columns]
+                if not cols:
+                    continue
+                mask = df[cols].notna().all(axis=1).to_numpy()
+            elif pred['column'] in df.columns:
+                mask = DataProcessor.filter_mask(df, pred['column'], pred['operator'], pred['value']) \
+                    .to_numpy(dtype=bool, na_value=False)
+            else:
+                continue
+            new_keep = keep & mask
+            applied += bool((new_keep != keep).any())
+            keep = new_keep
+        return (df[keep] if not keep.all() else df), applied
+
+
+FILL_ACTIONS = {'fill_mean': 'mean', 'fill_median': 'median', 'fill_mode': 'mode'}
+ALL_COLUMNS = 'DataFrame'  # AI 제안에서 전체 DataFrame 대상임을 나타내는 컬럼명
+
+
+def _numeric_columns(df, columns):
+    return [c for c in columns if c in df.columns and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def _present_columns(df, columns):
+    return [c for c in columns if c in df.columns]
+
+
+def _run_fill_missing(df, columns, params):
+    df, filled = DataProcessor.fill_missing(df, params['strategies'])
+    return df, len(filled)
+
+
+def _run_filter_rows(df, columns, params):
+    return DataProcessor.filter_rows(df, params['predicates'])
+
+
+def _run_drop_columns(df, columns, params):
+    cols = _present_columns(df, columns)
+    return df.drop(columns=cols), len(cols)
+
+
+def _run_drop_empty_columns(df, columns, params):
+    before = df.shape[1]
+    df = df.dropna(axis=1, how='all')
+    return df, int(df.shape[1] < before)
+
+
+def _run_drop_constant_columns(df, columns, params):
+    cols = [c for c in df.columns if df[c].nunique() <= 1]
+    return df.drop(columns=cols), len(cols)
+
+
+def _run_remove_outliers(df, columns, params):
+    cols = outlier_columns(df, columns)
+    return DataProcessor.remove_outliers(df, cols, params.get('method', 'iqr'), params.get('threshold')), len(cols)
+
+
+def _run_cap_outliers(df, columns, params):
+    cols = outlier_columns(df, columns)
+    return DataProcessor.cap_outliers(df, cols, params.get('method', 'iqr'), params.get('threshold')), len(cols)
+
+
+def _run_scale(df, columns, params):
+    cols = _numeric_columns(df, columns)
+    return DataProcessor.apply_scaling(df, cols, params.get('scaler', 'minmax')), len(cols)
+
+
+def _run_one_hot_encode(df, columns, params):
+    cols = _present_columns(df, columns)
+    return (DataProcessor.one_hot_encode(df, cols) if cols else df), len(cols)
+
+
+def _run_drop_duplicates(df, columns, params):
+    before = len(df)
+    df = DataProcessor.drop_duplicates(df, _present_columns(df, columns) if columns else None)
+    return df, int(len(df) < before)
+
+
+def _per_column(method, numeric_only=False):
+    """컬럼 목록을 받는 DataProcessor 메서드를 계획 실행 함수로 감쌈"""
+    def run(df, columns, params):
+        cols = _numeric_columns(df, columns) if numeric_only else _present_columns(df, columns)
+        return method(df, cols), len(cols)
+    return run
+
+
+# 계획 작업 코드 -> 실행 함수 (df, columns, params) -> (df, 적용된 작업 수)
+PLAN_EXECUTORS = {
+    'fill_missing': _run_fill_missing,
+    'filter_rows': _run_filter_rows,
+    'drop_columns': _run_drop_columns,
+    'drop_empty_columns': _run_drop_empty_columns,
+    'drop_constant_columns': _run_drop_constant_columns,
+    'remove_outliers': _run_remove_outliers,
+    'cap_outliers': _run_cap_outliers,
+    'scale': _run_scale,
+    'label_encode': _per_column(DataProcessor.label_encode),
+    'one_hot_encode': _run_one_hot_encode,
+    'convert_to_numeric': _per_column(DataProcessor.convert_to_numeric),
+    'strip_lower_text': _per_column(DataProcessor.clean_text),
+    'create_squared_feature': _per_column(DataProcessor.create_squared_features, numeric_only=True),
+    'extract_datetime_features': _per_column(DataProcessor.extract_datetime_features),
+    'drop_duplicates': _run_drop_duplicates,
+}
+
+# 사용자/AI가 쓰는 작업 코드 중 실행 전에 다른 형태로 바뀌는 것 (AI 제안 코드와 호환)
+ACTION_ALIASES = {
+    'drop_column_all_nan': 'drop_columns',
+    'drop_duplicates_all_cols': 'drop_duplicates',
+    'remove_outliers_iqr': 'remove_outliers',
+    'cap_outliers_iqr': 'cap_outliers',
+}
+
+
+def is_known_action(action):
+    """PreprocessPlan.add에 쓸 수 있는 작업 코드인지 여부"""
+    return action in PLAN_EXECUTORS or action in ACTION_ALIASES or action in FILL_ACTIONS \
+        or action in ('drop_rows_any_nan', 'filter')
+
+
+def _to_builtin(value):
+    """JSON으로 저장할 수 있도록 numpy 스칼라를 파이썬 값으로 변환"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class PreprocessPlan:
+    """
+    지연 실행 전처리 계획
+
+    add()는 작업을 기록만 하고, execute()에서 optimized()로 인접한 호환 작업을 합친 뒤 한 번에 실행합니다.
+    - 결측치 채우기(평균/중앙값/최빈값) 여러 개 -> 컬럼별 통계를 한 번에 구하고 fillna 1회
+    - 같은 스케일러의 스케일링 여러 개 -> fit_transform 1회
+    - 결측 행 제거/값 조건 필터 연속 -> 마스크 하나로 합쳐 행 선택 1회
+    - 서로 다른 컬럼의 (같은 방식) 이상치 상/하한, 원-핫 인코딩, 컬럼 삭제 연속 -> 한 작업으로
+    합치는 작업은 순서를 바꾸지 않고 인접한 것끼리만 묶으므로 하나씩 실행한 결과와 같습니다.
+    통계(평균, 분위수, 스케일러)는 실행할 때의 데이터로 다시 계산합니다.
+    """
+
+    VERSION = 1
+
+    def __init__(self, steps=None):
+        self.steps = [dict(step) for step in steps or []]
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, action, columns=None, reason=None, **params):
+        """
+        작업 추가 (실행하지 않음)
+
+        Parameters:
+        -----------
+        action : str
+            작업 코드 (fill_mean, drop_rows_any_nan, scale, filter, ... 또는 AI 제안 코드)
+        columns : str or list, optional
+            대상 컬럼. None 또는 'DataFrame'이면 전체
+        reason : str, optional
+            기록용 설명 (AI 추천 사유 등)
+        **params :
+            작업별 옵션 (scale: scaler, filter: operator/value)
+        """
+        if isinstance(columns, str):
+            columns = None if columns == ALL_COLUMNS else [columns]
+        step = {'action': action, 'columns': list(columns) if columns is not None else None,
+                'params': {k: _to_builtin(v) for k, v in params.items()}}
+        if reason:
+            step['reason'] = reason
+        self.steps.append(step)
+        return self
+
+    def extend(self, other):
+        self.steps.extend(dict(step) for step in other.steps)
+        return self
+
+    @classmethod
+    def from_ai_actions(cls, actions):
+        """AI 제안 목록 [{'column', 'action', 'reason'}, ...]으로 계획 생성"""
+        plan = cls()
+        for act in actions:
+            action = act.get('action', '').strip()
+            if not is_known_action(action):
+                logger.warning(f"Skipping unknown action '{action}'")
+                continue
+            plan.add(action, act.get('column', '').strip() or ALL_COLUMNS, reason=act.get('reason'))
+        return plan
+
+    # --- 계획 최적화 ---
+
+    @staticmethod
+    def _lower(step):
+        """작업 코드를 실행 가능한(합칠 수 있는) 형태로 변환"""
+        action = ACTION_ALIASES.get(step['action'], step['action'])
+        columns, params = step['columns'], dict(step.get('params', {}))
+        if action in FILL_ACTIONS:
+            return {'action': 'fill_missing', 'columns': None,
+                    'params': {'strategies': {col: FILL_ACTIONS[action] for col in columns or []}}}
+        if action == 'drop_rows_any_nan':
+            return {'action': 'filter_rows', 'columns': None,
+                    'params': {'predicates': [{'type': 'notna', 'columns': columns}]}}
+        if action == 'filter':
+            return {'action': 'filter_rows', 'columns': None,
+                    'params': {'predicates': [{'type': 'compare', 'column': col, **params} for col in columns or []]}}
+        if action == 'drop_columns' and columns is None:
+            action = 'drop_empty_columns'
+        if action not in PLAN_EXECUTORS:
+            raise ValueError(f"지원하지 않는 작업: {step['action']}")
+        return {'action': action, 'columns': columns, 'params': params}
+
+    @staticmethod
+    def _merge(last, step):
+        """인접한 두 작업을 하나로 합칠 수 있으면 합친 작업, 아니면 None"""
+        action = step['action']
+        if last['action'] != action:
+            return None
+        if action == 'fill_missing':
+            strategies = dict(last['params']['strategies'])
+            for col, kind in step['params']['strategies'].items():
+                # 먼저 채운 컬럼은 이후 채우기가 아무 효과 없음. 단, 평균/중앙값은 숫자형에만 적용되므로
+                # 뒤의 최빈값 채우기는 (타입을 모르는 여기서는) 효과가 있을 수 있어 합치지 않음
+                if strategies.get(col) in ('mean', 'median') and kind == 'mode':
+                    return None
+                strategies.setdefault(col, kind)
+            return {**last, 'params': {'strategies': strategies}}
+        if action == 'filter_rows':
+            return {**last, 'params': {'predicates': last['params']['predicates'] + step['params']['predicates']}}
+        if action in ('scale', 'drop_columns') and last['columns'] is not None and step['columns'] is not None \
+                and last['params'] == step['params']:
+            # 같은 스케일러를 다시 적용해도 값이 그대로이므로 겹치는 컬럼도 합칠 수 있음
+            return {**last, 'columns': list(dict.fromkeys(last['columns'] + step['columns']))}
+        if action in ('cap_outliers', 'one_hot_encode') and last['columns'] is not None \
+                and step['columns'] is not None and not set(last['columns']) & set(step['columns']) \
+                and last['params'] == step['params']:
+            return {**last, 'columns': last['columns'] + step['columns']}
+        return None
+
+    def optimized(self):
+        """인접한 호환 작업을 합친 실행 계획"""
+        fused = []
+        for step in self.steps:
+            lowered = self._lower(step)
+            merged = self._merge(fused[-1], lowered) if fused else None
+            if merged is not None:
+                fused[-1] = merged
+            else:
+                fused.append(lowered)
+        return PreprocessPlan(fused)
+
+    def explain(self):
+        """실행 계획 설명 (한 줄에 한 작업)"""
+        lines = []
+        for step in self.optimized().steps:
+            params = step['params']
+            if step['action'] == 'fill_missing':
+                target = ", ".join(f"{col}={kind}" for col, kind in params['strategies'].items())
+            elif step['action'] == 'filter_rows':
+                target = f"{len(params['predicates'])} condition(s)"
+            else:
+                target = ", ".join(map(str, step['columns'])) if step['columns'] else "all columns"
+                if params:
+                    target += f" {params}"
+            lines.append(f"{step['action']}: {target}")
+        return lines
+
+    # --- 실행 ---
+
+    def execute(self, df, optimize=True):
+        """
+        계획 실행 (원본 df는 바꾸지 않음)
+
+        Returns:
+        --------
+        tuple : (결과 DataFrame, 적용된 작업 수) - 대상 컬럼이 없거나 타입이 맞지 않는 작업은 건너뜀
+        """
+        plan = self.optimized() if optimize else PreprocessPlan(self._lower(step) for step in self.steps)
+        df = df.copy(deep=False)  # Copy-on-Write: 바뀌는 컬럼만 새로 할당
+        applied = 0
+        for step in plan.steps:
+            df, count = PLAN_EXECUTORS[step['action']](df, step['columns'] or [], step['params'])
+            applied += count
+        return df, applied
+
+    # --- 저장/불러오기 ---
+
+    def to_dict(self):
+        return {'version': self.VERSION, 'steps': self.steps}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version', cls.VERSION) > cls.VERSION:
+            raise ValueError(f"지원하지 않는 계획 버전: {data.get('version')}")
+        return cls(data.get('steps', []))
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(f.read())
+
+
+def replay_plan(plan_path, input_path, output_path=None):
+    """저장된 계획을 새 파일에 적용 (UI 없이). output_path 확장자에 따라 csv/parquet/xlsx로 저장"""
+    plan = PreprocessPlan.load(plan_path)
+    df, _ = load_data_file(input_path)
+    df, applied = plan.execute(df)
+    logger.info(f"Applied {applied} action(s) from {plan_path} to {input_path}: {df.shape}")
+    if output_path:
+        lower = output_path.lower()
+        if lower.endswith('.parquet'):
+            df.to_parquet(output_path, index=False)
+        elif lower.endswith('.xlsx'):
+            df.to_excel(output_path, index=False)
+        else:
+            df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    return df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="저장된 전처리 계획(JSON)을 데이터 파일에 적용")
+    parser.add_argument('plan', help="PreprocessPlan JSON 파일")
+    parser.add_argument('input', help="CSV / Excel / Parquet 파일")
+    parser.add_argument('-o', '--output', help="결과 파일 (.csv / .parquet / .xlsx)")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="메모리보다 큰 Parquet/CSV를 파티션 단위로 처리 (결과는 Parquet, -o 필요)")
+    parser.add_argument('--workers', type=int, help="--partitioned 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.partitioned:
+        if not args.output:
+            parser.error("--partitioned에는 -o 결과 파일이 필요합니다.")
+        from partitioned import execute_partitioned
+        print(execute_partitioned(args.plan, args.input, args.output, workers=args.workers))
+    else:
+        result = replay_plan(args.plan, args.input, args.output)
+        print(result.head().to_string())
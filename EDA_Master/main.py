@@ -2,6 +2,7 @@ import sys
 import os
 import json
 import logging
+import numpy as np
 import pandas as pd
 import seaborn as sns
 from io import StringIO
@@ -25,7 +26,11 @@ import google.generativeai as genai
 # --- [모듈 임포트] ---
 from common import Worker, PandasModel, MplCanvas
 from ui_pages import UIPages
-from data_processor import DataProcessor
+from data_processor import DataProcessor, PreprocessPlan
+from data_loader import load_data_file
+from partitioned import execute_partitioned
+from undo_history import UndoHistory, HistoryError
+from profiler import ProfileEngine, SYNC_PROFILE_CELLS
 from config_manager import ConfigManager
 import ai_engine
 import ml_engine
@@ -41,6 +46,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CORR_ANNOT_MAX_COLUMNS = 20  # 상관계수 히트맵에 숫자를 표시할 최대 컬럼 수
+
+# 수동 전처리 메뉴 -> PreprocessPlan 작업 코드와 옵션 (메뉴 문구에 키워드가 포함되는지 순서대로 확인)
+MANUAL_PLAN_ACTIONS = [
+    ("결측치 처리: 평균", 'fill_mean', {}),
+    ("결측치 처리: 중앙값", 'fill_median', {}),
+    ("결측치 처리: 최빈값", 'fill_mode', {}),
+    ("결측치 포함 행 제거", 'drop_rows_any_nan', {}),
+    ("결측치 포함 열 제거", 'drop_columns', {}),
+    ("IQR 방식으로 제거", 'remove_outliers_iqr', {}),
+    ("IQR 방식으로 상/하한", 'cap_outliers_iqr', {}),
+    ("Z-score 방식으로 제거", 'remove_outliers', {'method': 'zscore'}),
+    ("MAD 방식으로 제거", 'remove_outliers', {'method': 'mad'}),
+    ("Isolation Forest", 'remove_outliers', {'method': 'isolation_forest'}),
+    ("레이블 인코딩", 'label_encode', {}),
+    ("원-핫 인코딩", 'one_hot_encode', {}),
+    ("제곱", 'create_squared_feature', {}),
+    ("시계열", 'extract_datetime_features', {}),
+    ("스케일링", 'scale', {}),
+    ("숫자로", 'convert_to_numeric', {}),
+    ("텍스트", 'strip_lower_text', {}),
+    ("중복 데이터", 'drop_duplicates', {}),
+    ("낮은 분산", 'drop_constant_columns', {}),
+]
+# 컬럼을 선택하지 않으면 전체 컬럼에 적용하는 수동 작업 (나머지는 선택한 컬럼이 없으면 아무것도 하지 않음)
+MANUAL_ALL_COLUMN_ACTIONS = {'drop_rows_any_nan', 'drop_columns', 'drop_duplicates', 'drop_constant_columns'}
+
+# pandas 2.x: Copy-on-Write 활성화 (pandas 3은 기본값). Undo 스냅샷을 얕은 복사로 잡기 위해 필요
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # --- [API 키 설정 및 검증] ---
 basedir = os.path.dirname(os.path.abspath(__file__))
 env_path = os.path.join(basedir, '.env')
@@ -81,14 +117,26 @@ class DashboardApp(QMainWindow):
         # 설정 관리자 초기화
         self.config = ConfigManager()
         
-        # 히스토리 관리
-        self.history = []      
-        self.max_history = 10
+        # 히스토리 관리 (변경된 컬럼/삭제된 행만 저장하는 Undo 로그)
+        self.max_history = self.config.get('history.max_history', 10)
+        self.history = UndoHistory(
+            max_history=self.max_history,
+            checkpoint_interval=self.config.get('history.checkpoint_interval', 10),
+            spill_to_disk=self.config.get('history.spill_to_disk', False),
+            spill_threshold_mb=self.config.get('history.spill_threshold_mb', 256),
+        )
         self.last_ai_insight = "이전 AI 분석 결과가 없습니다."
         
         # 데이터 프로세서
         self.processor = DataProcessor()
 
+        # 이번 세션에 적용한 전처리 작업 기록 (JSON으로 저장해 새 파일에 재적용)
+        self.session_plan = PreprocessPlan()
+        self._plan_marks = []  # 히스토리 항목별 session_plan 시작 위치 (Undo 시 잘라냄)
+
+        # 컬럼 통계 캐시 (바뀐 컬럼만 다시 계산)
+        self.profiler = ProfileEngine(top_k=10)
+
         # 초기 샘플 데이터
         self.df = pd.DataFrame({
             'Age': [22, 38, 26, 35, 35, 54, 2, 27, 14, 4, None, 38, 22, 26, 35],
@@ -113,28 +161,66 @@ class DashboardApp(QMainWindow):
             self.resize(width, height) 
 
     def save_state(self, description="Action"):
+        """작업 직전 상태 기록 (작업 후 commit_state 호출)"""
+        if self.df is not None:
+            self.history.begin(self.df, description)
+            self.update_undo_button()
+
+    def commit_state(self, plan=None):
+        """작업 결과 확정 - 바뀐 컬럼/삭제된 행만 히스토리에 저장 (plan: 이 작업에 해당하는 전처리 단계)"""
         if self.df is not None:
-            if len(self.history) >= self.max_history:
-                self.history.pop(0)
-            self.history.append((self.df.copy(deep=True), description))
-            if hasattr(self, 'btn_undo'):
-                self.btn_undo.setEnabled(True)
-                self.btn_undo.setText(f"↩ Undo ({len(self.history)})")
+            if self.history.in_progress:
+                self._plan_marks.append(len(self.session_plan))
+                if plan is not None:
+                    self.session_plan.extend(plan)
+            self.history.commit(self.df)
+            self.profiler.set_data(self.df, self.history.last_touched, self.history.last_dropped_rows)
+            self.update_undo_button()
+
+    def rollback_state(self):
+        """진행 중인 작업 취소 (작업 전 데이터로 복원)"""
+        try:
+            self.df = self.history.rollback()
+        except HistoryError:  # 이미 확정된 작업이면 되돌리기로 처리
+            self.df, _, popped = self.history.undo(self.df)
+            self._drop_last_plan_steps(popped)
+        self.profiler.set_data(self.df, self.history.last_touched)
+        self.update_undo_button()
+
+    def _drop_last_plan_steps(self, count=1):
+        """되돌린 작업 count개의 전처리 단계를 session_plan에서 제거"""
+        count = min(count, len(self._plan_marks))
+        if count:
+            del self.session_plan.steps[self._plan_marks[-count]:]
+            del self._plan_marks[-count:]
+
+    def update_undo_button(self):
+        if not hasattr(self, 'btn_undo'):
+            return
+        count = len(self.history)
+        self.btn_undo.setEnabled(count > 0)
+        self.btn_undo.setText(f"↩ Undo ({count})" if count else "↩ Undo")
+        self.btn_undo.setToolTip(
+            f"Last: {self.history.last_description}\nHistory memory: {self.history.memory_usage_mb():.1f} MB"
+            if count else "")
 
     def undo_last_action(self):
-        if not self.history:
+        if not self.history.can_undo():
             QMessageBox.information(self, "Info", "No more actions to undo.")
             return
-        prev_df, desc = self.history.pop()
-        self.df = prev_df
+        try:
+            self.df, desc, popped = self.history.undo(self.df)
+        except HistoryError as e:
+            logger.error(f"Undo failed: {e}")
+            QMessageBox.warning(self, "Undo", str(e))
+            self.update_undo_button()
+            return
+        self._drop_last_plan_steps(popped)
+        self.profiler.set_data(self.df, self.history.last_touched)
         self.update_dashboard()
         self.update_data_tables()
         self.process_log.append(f"↩ Undone: Reverted before '{desc}'")
-        if hasattr(self, 'btn_undo'):
-            self.btn_undo.setText(f"↩ Undo ({len(self.history)})")
-            if not self.history:
-                self.btn_undo.setEnabled(False)
-                self.btn_undo.setText("↩ Undo")
+        self.update_undo_button()
 
     def highlight_checked_item(self, item):
         if item.checkState() == Qt.CheckState.Checked:
@@ -274,11 +360,14 @@ class DashboardApp(QMainWindow):
         else:
             self.col_combo.clearSelection()
 
-    def show_loading(self, message="Processing..."):
-        self.progress = QProgressDialog(message, None, 0, 0, self)
+    def show_loading(self, message="Processing...", maximum=0):
+        """maximum=0이면 진행률 없는 대기 표시, 0보다 크면 Worker.progress 값을 표시"""
+        self.progress = QProgressDialog(message, None, 0, maximum, self)
         self.progress.setWindowTitle("Please Wait")
         self.progress.setWindowModality(Qt.WindowModality.WindowModal) 
         self.progress.setCancelButton(None) 
+        self.progress.setAutoClose(False)
+        self.progress.setAutoReset(False)
         self.progress.show()
 
     def hide_loading(self):
@@ -289,20 +378,25 @@ class DashboardApp(QMainWindow):
         if hasattr(self, 'worker') and self.worker.isRunning():
             QMessageBox.warning(self, "Busy", "A task is already running.")
             return
-        file_name, _ = QFileDialog.getOpenFileName(self, "Open Data File", "", "Data Files (*.csv *.xlsx *.xls);;All (*)")
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open Data File", "", "Data Files (*.csv *.xlsx *.xls *.parquet);;All (*)")
         if not file_name: return
-        self.show_loading("Loading Data File...")
-        def load_task(fname):
-            if fname.lower().endswith('.csv'): return pd.read_csv(fname)
-            else: return pd.read_excel(fname)
-        self.worker = Worker(load_task, file_name)
-        self.worker.finished.connect(lambda df: self.on_load_finished(df, file_name))
+        self.show_loading("Loading Data File...", maximum=100)
+        # 청크 단위 로드 + 타입 압축 + Parquet 캐시 (data_loader.py)
+        self.worker = Worker(load_data_file, file_name,
+                             chunk_size=self.config.get('data.chunk_size', 200000),
+                             use_cache=self.config.get('data.use_parquet_cache', True),
+                             downcast_floats=self.config.get('data.downcast_floats', True))
+        self.worker.kwargs['progress_callback'] = self.worker.update_progress
+        self.worker.progress.connect(self.progress.setValue)
+        self.worker.finished.connect(lambda result: self.on_load_finished(result, file_name))
         self.worker.error.connect(self.on_worker_error)
         self.worker.start()
 
-    def on_load_finished(self, df, fname):
+    def on_load_finished(self, result, fname):
         self.hide_loading()
+        df, info = result
         self.df = df
+        self.profiler.set_data(df)
         self.header_label.setText(f"Data Overview - {fname.split('/')[-1]}")
         self.update_dashboard()
         self.update_col_list()
@@ -310,7 +404,13 @@ class DashboardApp(QMainWindow):
         self.ai_text_area.clear()
         self.ai_plots_tabs.clear()
         self.action_list_widget.clear()
-        self.process_log.append(f"Loaded: {fname}")
+        self.history.clear()  # 이전 데이터의 히스토리는 새 데이터에 적용할 수 없음
+        self.session_plan = PreprocessPlan()
+        self._plan_marks = []
+        self.update_undo_button()
+        source = "parquet cache" if info['from_cache'] else "file"
+        self.process_log.append(f"Loaded: {fname} ({info['memory_mb']:.1f} MB in memory, from {source})")
+        logger.info(f"Loaded {fname}: {df.shape}, {info['memory_mb']:.1f} MB, from {source}")
         QMessageBox.information(self, "Success", "Data Loaded Successfully!")
 
     def on_worker_error(self, err_msg):
@@ -359,6 +459,7 @@ class DashboardApp(QMainWindow):
             self.config.set('window.width', self.width())
             self.config.set('window.height', self.height())
         self.config.save()
+        self.history.close()
         logger.info("Application closed, settings saved")
         event.accept()
 
@@ -368,19 +469,33 @@ class DashboardApp(QMainWindow):
             self.col_combo.addItems(self.df.columns)
 
 
+    def start_profiling(self):
+        """미계산 컬럼 통계를 백그라운드에서 계산한 뒤 대시보드 갱신"""
+        if hasattr(self, 'profile_worker') and self.profile_worker.isRunning(): return
+        self.show_loading("Profiling Columns...")
+        self.profile_worker = Worker(self.profiler.compute_all)
+        self.profile_worker.finished.connect(lambda _: (self.hide_loading(), self.update_dashboard()))
+        self.profile_worker.error.connect(self.on_worker_error)
+        self.profile_worker.start()
+
     def update_dashboard(self):
         if self.df is None: return
-        self.card_rows.findChild(QLabel, "value_label").setText(f"{self.df.shape[0]:,}")
-        self.card_cols.findChild(QLabel, "value_label").setText(f"{self.df.shape[1]}")
-        total_missing = self.df.isnull().sum().sum()
-        self.card_missing.findChild(QLabel, "value_label").setText(f"{total_missing:,}")
-        self.card_dups.findChild(QLabel, "value_label").setText(f"{self.df.duplicated().sum():,}")
+        if self.profiler.df is not self.df:
+            self.profiler.set_data(self.df)  # 히스토리를 거치지 않고 바뀐 경우 전체 다시 계산
+        if self.profiler.stale_cells() > SYNC_PROFILE_CELLS:
+            self.start_profiling()
+            return
+        summary = self.profiler.summary()
+        self.card_rows.findChild(QLabel, "value_label").setText(f"{summary['rows']:,}")
+        self.card_cols.findChild(QLabel, "value_label").setText(f"{summary['columns']}")
+        self.card_missing.findChild(QLabel, "value_label").setText(f"{summary['missing']:,}")
+        self.card_dups.findChild(QLabel, "value_label").setText(f"{summary['duplicates']:,}")
 
         self.num_list_widget.clear(); self.cat_list_widget.clear()
         self.update_col_list() 
 
-        numeric_cols = self.df.select_dtypes(include=['number']).columns
-        cat_cols = self.df.select_dtypes(include=['object', 'category']).columns
+        numeric_cols = self.profiler.columns_of_kind('numeric')
+        cat_cols = self.profiler.columns_of_kind('categorical')
 
         if len(numeric_cols) > 0:
             for col in numeric_cols: self.num_list_widget.addItem(QListWidgetItem(col))
@@ -407,38 +522,48 @@ class DashboardApp(QMainWindow):
         self.model_raw = PandasModel(self.df)
         self.view_raw.setModel(self.model_raw)
         self.view_raw.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        if self.profiler.df is not self.df or self.profiler.stale_columns():
+            return  # 통계 계산이 끝나면 update_dashboard에서 다시 호출됨
         try:
-            stats_df = self.df.describe(include='all').T.fillna('')
+            stats_df = self.profiler.describe().fillna('')
             self.model_stats = PandasModel(stats_df)
             self.view_stats.setModel(self.model_stats)
             self.view_stats.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         except Exception:
             pass
 
-    def get_plot_data(self, data, threshold=10000):
-        if isinstance(data, pd.Series) or isinstance(data, pd.DataFrame):
-            if len(data) > threshold:
-                return data.sample(n=threshold, random_state=42), True
-        return data, False
-
     def on_numeric_col_selected(self, item):
         if not item: return
         col_name = item.text()
         if self.df is None or col_name not in self.df.columns or not pd.api.types.is_numeric_dtype(self.df[col_name]): return
 
-        plot_data, is_sampled = self.get_plot_data(self.df[col_name].dropna(), threshold=10000)
-        suffix = " (Sampled 10k)" if is_sampled else ""
-
-        self.canvas_hist.axes.clear()
-        sns.histplot(plot_data, kde=True, bins='auto', ax=self.canvas_hist.axes, color='#6c5ce7', edgecolor='white', linewidth=0.5)
-        self.canvas_hist.axes.set_title(f"Distribution: {col_name}{suffix}", fontsize=10, fontweight='bold')
-        self.canvas_hist.axes.grid(True, linestyle='--', alpha=0.5)
+        # 전체 행 기준으로 미리 계산된 배열만 그림 (컬럼별 캐시)
+        plot_data = self.profiler.plot_data(col_name)
+
+        ax = self.canvas_hist.axes
+        ax.clear()
+        if plot_data.count:
+            ax.bar(plot_data.edges[:-1], plot_data.counts, width=np.diff(plot_data.edges), align='edge',
+                   color='#6c5ce7', alpha=0.75, edgecolor='white', linewidth=0.5)
+            if plot_data.kde_y is not None:
+                ax.plot(plot_data.kde_x, plot_data.kde_y, color='#6c5ce7')
+            ax.set_xlabel(col_name); ax.set_ylabel("Count")
+        ax.set_title(f"Distribution: {col_name}", fontsize=10, fontweight='bold')
+        ax.grid(True, linestyle='--', alpha=0.5)
         self.canvas_hist.draw()
 
-        self.canvas_box.axes.clear()
-        sns.boxplot(x=plot_data, ax=self.canvas_box.axes, color='#fab1a0') 
-        self.canvas_box.axes.set_title(f"Boxplot: {col_name}{suffix}", fontsize=10, fontweight='bold')
-        self.canvas_box.axes.grid(True, axis='x', linestyle='--', alpha=0.5)
+        ax = self.canvas_box.axes
+        ax.clear()
+        if plot_data.box is not None:
+            style = dict(patch_artist=True, widths=0.6, boxprops=dict(facecolor='#fab1a0'),
+                         medianprops=dict(color='#2d3436'), flierprops=dict(marker='d', markersize=4))
+            try:
+                ax.bxp([plot_data.box], orientation='horizontal', **style)
+            except TypeError:  # matplotlib < 3.10
+                ax.bxp([plot_data.box], vert=False, **style)
+            ax.set_yticks([]); ax.set_xlabel(col_name)
+        ax.set_title(f"Boxplot: {col_name}", fontsize=10, fontweight='bold')
+        ax.grid(True, axis='x', linestyle='--', alpha=0.5)
         self.canvas_box.draw()
 
     def on_categorical_col_selected(self, item):
@@ -446,10 +571,18 @@ class DashboardApp(QMainWindow):
         col_name = item.text()
         if self.df is None or col_name not in self.df.columns: return
 
-        counts = self.df[col_name].value_counts().head(10)
+        profile = self.profiler.profile(col_name)
+        counts = profile.top_values
         self.canvas_bar.axes.clear()
         sns.barplot(x=counts.values, y=counts.index.astype(str), ax=self.canvas_bar.axes, palette="viridis")
-        self.canvas_bar.axes.set_title(f"Frequency: {col_name}", fontsize=10, fontweight='bold')
+        if profile.approximate and profile.top_errors is not None and profile.top_errors.max() > 0:
+            # SpaceSaving 근사: 실제 개수는 [막대 - 오차, 막대] 범위
+            self.canvas_bar.axes.errorbar(counts.values - profile.top_errors.values / 2, range(len(counts)),
+                                          xerr=profile.top_errors.values / 2, fmt='none', ecolor='black', capsize=3)
+            title = f"Frequency: {col_name} ({profile.accuracy_text()})"
+        else:
+            title = f"Frequency: {col_name}"
+        self.canvas_bar.axes.set_title(title, fontsize=10, fontweight='bold')
         self.canvas_bar.figure.tight_layout()
         self.canvas_bar.draw()
 
@@ -463,13 +596,13 @@ class DashboardApp(QMainWindow):
     def plot_correlation(self):
         self.canvas_corr.figure.clear()
         self.canvas_corr.figure.patch.set_facecolor('white')
-        numeric_df = self.df.select_dtypes(include=['number'])
-        
-        if numeric_df.shape[1] > 1:
+        corr = self.profiler.correlation.matrix()  # 전체 행 기준, 바뀐 컬럼/행만 갱신
+
+        if corr.shape[1] > 1:
             ax = self.canvas_corr.figure.add_subplot(111)
-            calc_df, is_sampled = self.get_plot_data(numeric_df, threshold=20000) 
-            corr = calc_df.corr()
-            sns.heatmap(corr, annot=True, fmt=".2f", cmap='coolwarm', ax=ax, cbar=False, square=False)
+            annot = corr.shape[1] <= CORR_ANNOT_MAX_COLUMNS  # 컬럼이 많으면 숫자 표시 생략
+            sns.heatmap(corr, annot=annot, fmt=".2f", cmap='coolwarm', ax=ax, cbar=not annot, square=False,
+                        vmin=-1, vmax=1, xticklabels='auto', yticklabels='auto')
             ax.set_title(f"Numeric Feature Correlation", fontweight='bold', fontsize=14)
             ax.tick_params(axis='x', labelrotation=45)
         self.canvas_corr.figure.tight_layout()
@@ -499,85 +632,84 @@ class DashboardApp(QMainWindow):
 
         self.save_state(f"Manual Preprocessing: {action_text}")
         self.process_log.append(f"\n>>> Running: '{action_text}'")
-        
-        df_original_state = self.df.copy(deep=True) 
 
         try:
-            if "결측치 처리: 평균" in action_text:
-                for col in target_cols:
-                    if pd.api.types.is_numeric_dtype(self.df[col]): self.df[col].fillna(self.df[col].mean(), inplace=True)
-            elif "결측치 처리: 중앙값" in action_text:
-                for col in target_cols:
-                    if pd.api.types.is_numeric_dtype(self.df[col]): self.df[col].fillna(self.df[col].median(), inplace=True)
-            elif "결측치 처리: 최빈값" in action_text:
-                for col in target_cols:
-                    if not self.df[col].empty: self.df[col].fillna(self.df[col].mode()[0], inplace=True)
-            elif "결측치 포함 행 제거" in action_text:
-                if target_cols: self.df.dropna(subset=target_cols, inplace=True)
-                else: self.df.dropna(inplace=True)
-            elif "결측치 포함 열 제거" in action_text:
-                if target_cols: self.df.drop(columns=target_cols, inplace=True)
-                else: self.df.dropna(axis=1, how='all', inplace=True)
-            elif "IQR 방식으로 제거" in action_text:
-                for col in target_cols:
-                    if pd.api.types.is_numeric_dtype(self.df[col]):
-                        Q1 = self.df[col].quantile(0.25); Q3 = self.df[col].quantile(0.75); IQR = Q3 - Q1
-                        self.df = self.df[~((self.df[col] < (Q1 - 1.5 * IQR)) | (self.df[col] > (Q3 + 1.5 * IQR)))]
-            elif "IQR 방식으로 상/하한" in action_text:
-                for col in target_cols:
-                    if pd.api.types.is_numeric_dtype(self.df[col]):
-                        Q1 = self.df[col].quantile(0.25); Q3 = self.df[col].quantile(0.75); IQR = Q3 - Q1
-                        self.df[col] = self.df[col].clip(lower=Q1 - 1.5 * IQR, upper=Q3 + 1.5 * IQR)
-            elif "레이블 인코딩" in action_text:
-                for col in target_cols:
-                    self.df[col] = LabelEncoder().fit_transform(self.df[col].astype(str))
-            elif "원-핫 인코딩" in action_text:
-                self.df = pd.get_dummies(self.df, columns=target_cols, prefix=target_cols, dtype=int)
-            elif "제곱" in action_text:
-                for col in target_cols:
-                     if pd.api.types.is_numeric_dtype(self.df[col]): self.df[f"{col}_squared"] = self.df[col] ** 2
-            elif "시계열" in action_text:
-                for col in target_cols:
-                    self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
-                    if pd.api.types.is_datetime64_any_dtype(self.df[col]):
-                        self.df[f"{col}_year"] = self.df[col].dt.year
-                        self.df[f"{col}_month"] = self.df[col].dt.month
-                        self.df[f"{col}_day"] = self.df[col].dt.day
-            elif "스케일링" in action_text:
-                scaler_type = self.scaler_combo.currentText()
-                scaler = None
-                if "MinMax" in scaler_type: scaler = MinMaxScaler()
-                elif "Standard" in scaler_type: scaler = StandardScaler()
-                elif "Robust" in scaler_type: scaler = RobustScaler()
-                elif "MaxAbs" in scaler_type: scaler = MaxAbsScaler()
-                num_cols = [c for c in target_cols if pd.api.types.is_numeric_dtype(self.df[c])]
-                if scaler and num_cols:
-                    self.df[num_cols] = scaler.fit_transform(self.df[num_cols].fillna(0))
-            elif "숫자로" in action_text:
-                for col in target_cols: self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-            elif "텍스트" in action_text:
-                for col in target_cols: self.df[col] = self.df[col].astype(str).str.strip().str.lower()
-            elif "중복 데이터" in action_text:
-                if target_cols: self.df.drop_duplicates(subset=target_cols, inplace=True)
-                else: self.df.drop_duplicates(inplace=True)
-            elif "낮은 분산" in action_text:
-                cols = [c for c in self.df.columns if self.df[c].nunique() <= 1]
-                self.df.drop(columns=cols, inplace=True)
-            elif "음수값" in action_text:
+            # 저장되는 계획과 같은 코드로 실행해야 Save Pipeline / 대용량 재적용 결과가 화면과 같음
+            plan = self.manual_plan(action_text, target_cols)
+            self.df, _ = plan.execute(self.df)
+            if "음수값" in action_text:
                 for col in target_cols:
                     if pd.api.types.is_numeric_dtype(self.df[col]):
                         cnt = (self.df[col] < 0).sum()
                         self.process_log.append(f"Column {col}: {cnt} negative values.")
 
+            self.commit_state(plan)
             self.update_dashboard()
             self.update_data_tables()
             self.process_log.append("Processing finished.")
 
         except Exception as e:
-            self.df = df_original_state
+            self.rollback_state()
             self.process_log.append(f"Error: {e}")
             QMessageBox.critical(self, "Error", f"Error during preprocessing: {e}")
 
+    def manual_plan(self, action_text, target_cols):
+        """수동 전처리 메뉴를 실행하고 session_plan에 기록할 계획으로 변환 (데이터를 바꾸지 않는 작업은 빈 계획)"""
+        plan = PreprocessPlan()
+        for keyword, action, options in MANUAL_PLAN_ACTIONS:
+            if keyword in action_text:
+                params = dict(options)
+                if action == 'scale':
+                    params['scaler'] = self.scaler_combo.currentText().split('Scaler')[0].lower()
+                if target_cols or action in MANUAL_ALL_COLUMN_ACTIONS:
+                    plan.add(action, target_cols or None, **params)
+                break
+        return plan
+
+    def save_pipeline(self):
+        """적용한 전처리 작업을 JSON 계획으로 저장 (data_processor.py로 새 파일에 그대로 재적용)"""
+        if not len(self.session_plan):
+            QMessageBox.information(self, "Info", "No preprocessing actions to save.")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save Pipeline", "preprocess_plan.json", "JSON Files (*.json)")
+        if file_name:
+            try:
+                self.session_plan.save(file_name)
+                self.process_log.append(f"Pipeline saved: {file_name} ({len(self.session_plan)} steps)")
+                logger.info(f"Pipeline saved to {file_name}")
+                QMessageBox.information(self, "Success", f"Pipeline saved:\n{file_name}")
+            except Exception as e:
+                logger.error(f"Failed to save pipeline: {e}")
+                QMessageBox.critical(self, "Error", f"Failed to save pipeline: {e}")
+
+    def apply_pipeline_to_file(self):
+        """적용한 전처리 작업을 메모리보다 큰 Parquet/CSV 파일에 파티션 단위로 적용 (partitioned.py)"""
+        if not len(self.session_plan):
+            QMessageBox.information(self, "Info", "No preprocessing actions to apply.")
+            return
+        if hasattr(self, 'worker') and self.worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A task is already running.")
+            return
+        in_file, _ = QFileDialog.getOpenFileName(self, "Select Large Data File", "", "Data Files (*.parquet *.csv);;All (*)")
+        if not in_file: return
+        out_file, _ = QFileDialog.getSaveFileName(self, "Save Result", "cleaned.parquet", "Parquet Files (*.parquet)")
+        if not out_file: return
+        self.show_loading("Applying Pipeline by Partition...", maximum=100)
+        self.worker = Worker(execute_partitioned, PreprocessPlan(self.session_plan.steps), in_file, out_file,
+                             workers=self.config.get('data.partition_workers', 0) or None)
+        self.worker.kwargs['progress_callback'] = self.worker.update_progress
+        self.worker.progress.connect(self.progress.setValue)
+        self.worker.finished.connect(self.on_partitioned_finished)
+        self.worker.error.connect(self.on_worker_error)
+        self.worker.start()
+
+    def on_partitioned_finished(self, summary):
+        self.hide_loading()
+        self.process_log.append(f"Pipeline applied: {summary['rows_in']:,} -> {summary['rows_out']:,} rows "
+                                f"({summary['partitions']} partitions, {summary['passes']} passes) -> {summary['output']}")
+        logger.info(f"Partitioned pipeline finished: {summary}")
+        QMessageBox.information(self, "Success", f"Result saved:\n{summary['output']}")
+
     def start_ai_preprocessing_scan(self):
         # API 키 확인
         if not API_CONFIGURED:
@@ -669,93 +801,23 @@ class DashboardApp(QMainWindow):
         # 3. 상태 저장 (Undo용)
         self.save_state("AI Automated Actions")
 
-        applied_count = 0
-        
         try:
-            for item in checked_items:
-                act = item.data(Qt.ItemDataRole.UserRole)
-                col_name = act.get('column', '').strip()
-                action_type = act.get('action', '').strip()
-
-                # 컬럼 존재 여부 확인 (DataFrame 전체 대상이 아닐 경우)
-                if col_name != 'DataFrame' and col_name not in self.df.columns:
-                    continue
-
-                # --- [실제 데이터 처리 로직] ---
-                if action_type == "drop_column_all_nan":
-                    self.df.drop(columns=[col_name], inplace=True)
-                    applied_count += 1
-                elif action_type == "drop_rows_any_nan":
-                    initial_rows = self.df.shape[0]
-                    if col_name == 'DataFrame':
-                        self.df.dropna(inplace=True)
-                    else:
-                        self.df.dropna(subset=[col_name], inplace=True)
-                    if self.df.shape[0] < initial_rows: applied_count += 1
-                elif action_type == "fill_mean":
-                    if pd.api.types.is_numeric_dtype(self.df[col_name]):
-                        self.df[col_name].fillna(self.df[col_name].mean(), inplace=True)
-                        applied_count += 1
-                elif action_type == "fill_median":
-                    if pd.api.types.is_numeric_dtype(self.df[col_name]):
-                        self.df[col_name].fillna(self.df[col_name].median(), inplace=True)
-                        applied_count += 1
-                elif action_type == "fill_mode":
-                    if not self.df[col_name].empty:
-                        self.df[col_name].fillna(self.df[col_name].mode()[0], inplace=True)
-                        applied_count += 1
-                elif action_type == "remove_outliers_iqr":
-                    if pd.api.types.is_numeric_dtype(self.df[col_name]):
-                        Q1 = self.df[col_name].quantile(0.25)
-                        Q3 = self.df[col_name].quantile(0.75)
-                        IQR = Q3 - Q1
-                        self.df = self.df[~((self.df[col_name] < (Q1 - 1.5 * IQR)) | (self.df[col_name] > (Q3 + 1.5 * IQR)))]
-                        applied_count += 1
-                elif action_type == "cap_outliers_iqr":
-                    if pd.api.types.is_numeric_dtype(self.df[col_name]):
-                        Q1 = self.df[col_name].quantile(0.25)
-                        Q3 = self.df[col_name].quantile(0.75)
-                        IQR = Q3 - Q1
-                        lower = Q1 - 1.5 * IQR
-                        upper = Q3 + 1.5 * IQR
-                        self.df[col_name] = self.df[col_name].clip(lower=lower, upper=upper)
-                        applied_count += 1
-                elif action_type == "label_encode":
-                    le = LabelEncoder()
-                    self.df[col_name] = le.fit_transform(self.df[col_name].astype(str))
-                    applied_count += 1
-                elif action_type == "one_hot_encode":
-                    self.df = pd.get_dummies(self.df, columns=[col_name], prefix=[col_name], dtype=int)
-                    applied_count += 1
-                elif action_type == "convert_to_numeric":
-                    self.df[col_name] = pd.to_numeric(self.df[col_name], errors='coerce')
-                    applied_count += 1
-                elif action_type == "strip_lower_text":
-                    self.df[col_name] = self.df[col_name].astype(str).str.strip().str.lower()
-                    applied_count += 1
-                elif action_type == "drop_duplicates_all_cols":
-                    initial_rows = self.df.shape[0]
-                    self.df.drop_duplicates(inplace=True)
-                    if self.df.shape[0] < initial_rows: applied_count += 1
-                elif action_type == "create_squared_feature":
-                    if pd.api.types.is_numeric_dtype(self.df[col_name]):
-                        self.df[f"{col_name}_squared"] = self.df[col_name] ** 2
-                        applied_count += 1
-                elif action_type == "extract_datetime_features":
-                    self.df[col_name] = pd.to_datetime(self.df[col_name], errors='coerce')
-                    if pd.api.types.is_datetime64_any_dtype(self.df[col_name]):
-                        self.df[f"{col_name}_year"] = self.df[col_name].dt.year
-                        self.df[f"{col_name}_month"] = self.df[col_name].dt.month
-                        self.df[f"{col_name}_day"] = self.df[col_name].dt.day
-                        applied_count += 1
+            # 선택한 작업을 계획으로 모아 인접한 호환 작업을 합친 뒤 한 번에 실행
+            plan = PreprocessPlan.from_ai_actions([item.data(Qt.ItemDataRole.UserRole) for item in checked_items])
+            for line in plan.explain():
+                logger.info(f"AI plan step: {line}")
+            self.df, applied_count = plan.execute(self.df)
 
             # 4. 결과 업데이트
+            self.commit_state(plan)
             self.update_dashboard()
             self.update_data_tables()
             QMessageBox.information(self, "완료", f"총 {applied_count}개의 작업이 적용되었습니다.")
 
         except Exception as e:
-            self.undo_last_action() # 에러 발생 시 원상복구
+            self.rollback_state() # 에러 발생 시 원상복구
+            self.update_dashboard()
+            self.update_data_tables()
             QMessageBox.critical(self, "오류", f"작업 적용 중 오류 발생:\n{str(e)}")
 
     def start_ai_analysis_thread(self):
@@ -795,22 +857,17 @@ class DashboardApp(QMainWindow):
         # 2. 심층 정보 생성 (상관관계 + 범주형 분포)
         extra_lines = []
         try:
-            num_df = self.df.select_dtypes(include='number')
-            if num_df.shape[1] > 1:
-                corr_matrix = num_df.corr().abs()
-                mask = pd.DataFrame(True, index=corr_matrix.index, columns=corr_matrix.columns)
-                for i in range(len(mask.columns)):
-                    for j in range(i + 1, len(mask.columns)):
-                        mask.iloc[i, j] = False
-                corr_unstacked = corr_matrix.where(~mask).stack().sort_values(ascending=False)
-                top_corr = corr_unstacked.head(5)
+            if self.profiler.df is not self.df:
+                self.profiler.set_data(self.df)
+            top_corr = self.profiler.correlation.top_pairs(5)
+            if top_corr:
                 extra_lines.append("\n[Top 5 Correlations]")
-                for idx, val in top_corr.items():
-                    extra_lines.append(f"{idx[0]} - {idx[1]}: {val:.2f}")
+                for col_a, col_b, val in top_corr:
+                    extra_lines.append(f"{col_a} - {col_b}: {abs(val):.2f}")
         except: pass
             
         try:
-            cat_cols = self.df.select_dtypes(include=['object', 'category']).columns
+            cat_cols = self.df.select_dtypes(include=['object', 'category', 'string']).columns
             if len(cat_cols) > 0:
                 extra_lines.append("\n[Categorical Distributions (Top 3)]")
                 for col in cat_cols[:5]: 
@@ -877,7 +934,7 @@ class DashboardApp(QMainWindow):
         task = self.ml_task_combo.currentText()
         is_cls = "Classification" in task
         if "Auto" in task:
-             if pd.api.types.is_object_dtype(y) or (pd.api.types.is_numeric_dtype(y) and y.nunique() < 20): is_cls = True
+             if not pd.api.types.is_numeric_dtype(y) or (pd.api.types.is_numeric_dtype(y) and y.nunique() < 20): is_cls = True
 
         params = {
             'n_estimators': int(self.hp_estimators.currentText()),
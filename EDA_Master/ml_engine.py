@@ -57,7 +57,7 @@ def run_ml_pipeline(X, y, is_cls, params, model_type='xgboost', use_cv=False, cv
     tuple : (model, results, feature_names)
     """
     numeric_features = X.select_dtypes(include=['number']).columns
-    categorical_features = X.select_dtypes(include=['object', 'category']).columns
+    categorical_features = X.select_dtypes(include=['object', 'category', 'string']).columns
 
     numeric_transformer = Pipeline(steps=[
         ('imputer', SimpleImputer(strategy='median')),
@@ -0,0 +1,651 @@
+# partitioned.py
+"""
+메모리보다 큰 데이터용 파티션 단위 전처리 (out-of-core)
+데이터를 Parquet row group 단위 파티션으로 나눠 프로세스 풀에서 처리합니다.
+PreprocessPlan의 각 작업은 두 단계로 실행됩니다.
+1) fit 패스: 파티션마다 부분 통계(Moments, TDigest, 빈도 등)를 계산해 병합 -> 전체 데이터 기준 통계
+   (평균, 최빈값, IQR 경계, 스케일러 값, 원-핫 범주, 중복 행 위치)
+2) apply 패스: 통계가 고정된 작업을 파티션마다 적용해 임시 파일로 쓰고, 스키마를 맞춰 Parquet 하나로 합침
+한 번에 메모리에 올라가는 것은 파티션 하나(워커 수만큼)뿐입니다.
+    python data_processor.py plan.json big.parquet -o cleaned.parquet --partitioned
+"""
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from data_processor import (DataProcessor, PreprocessPlan, PLAN_EXECUTORS, OUTLIER_THRESHOLDS,
+                            outlier_columns)
+from sketches import Moments, TDigest
+
+logger = logging.getLogger(__name__)
+
+PARTITION_ROWS = 1_000_000  # CSV를 Parquet으로 바꿀 때 row group(파티션) 크기
+DIGEST_COMPRESSION = 1000  # 분위수 위치 추정용 t-digest (클수록 정확값 계산 때 모으는 구간이 작아짐)
+ISOLATION_SAMPLE_ROWS = 100_000  # Isolation Forest 학습용 표본 행 수
+CSV_BLOCK_BYTES = 64 << 20  # CSV 타입 추론에 쓰는 첫 블록 크기
+
+
+# --- 파티션 읽기/쓰기 ---
+
+def parquet_files(path):
+    """Parquet 파일 하나 또는 디렉터리 안의 Parquet 파일 목록 (이름순)"""
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.parquet'))
+    return [path]
+
+
+def csv_to_parquet(csv_path, parquet_path, rows_per_group=PARTITION_ROWS):
+    """CSV를 메모리에 모두 올리지 않고 row group 단위 Parquet으로 변환 (타입은 첫 블록에서 추론)"""
+    from pyarrow import csv as pa_csv
+    reader = pa_csv.open_csv(csv_path, read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+                             convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))  # 빈 칸은 pandas와 같이 결측
+    with pq.ParquetWriter(parquet_path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=rows_per_group)
+    return parquet_path
+
+
+def _nullable_integer_columns(files):
+    """
+    어느 row group에든 결측이 있는 정수 컬럼
+
+    pandas는 결측이 있는 파티션의 정수 컬럼만 float64로 읽으므로, 파티션마다 타입이 달라지지 않도록
+    이 컬럼들은 모든 파티션에서 float64로 맞춥니다.
+    """
+    columns = set()
+    for path in files:
+        meta = pq.ParquetFile(path).metadata
+        schema = meta.schema.to_arrow_schema()
+        integer = {f.name for f in schema if pa.types.is_integer(f.type)}
+        for i in range(meta.num_row_groups):
+            group = meta.row_group(i)
+            for j in range(group.num_columns):
+                chunk = group.column(j)
+                stats = chunk.statistics
+                if chunk.path_in_schema in integer and \
+                        (stats is None or not stats.has_null_count or stats.null_count > 0):
+                    columns.add(chunk.path_in_schema)
+    return columns
+
+
+def _read_partition(path, row_group, float_columns):
+    df = pq.ParquetFile(path).read_row_group(row_group).to_pandas()
+    for col in float_columns:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype(np.float64)
+    return df
+
+
+def _unify_schema(schemas):
+    """파티션별 결과 스키마를 하나로 맞춤 (정수/실수 혼합은 float64, 문자열 혼합은 string)"""
+    names = list(dict.fromkeys(name for schema in schemas for name in schema.names))
+    fields = []
+    for name in names:
+        types = [s.field(name).type for s in schemas if name in s.names]
+        types = [t for t in types if not pa.types.is_null(t)] or types
+        first = types[0]
+        if all(t == first for t in types):
+            target = first
+        elif all(pa.types.is_dictionary(t) for t in types):
+            target = pa.dictionary(pa.int32(), first.value_type)
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t) for t in types):
+            target = pa.float64()
+        elif any(pa.types.is_string(t) or pa.types.is_large_string(t) for t in types):
+            target = pa.large_string()
+        else:
+            target = first
+        fields.append(pa.field(name, target))
+    return pa.schema(fields)
+
+
+def _conform(table, schema):
+    """스키마에 맞게 컬럼 순서/타입을 맞추고, 없는 컬럼은 결측으로 채움"""
+    columns = [table[f.name] if f.name in table.column_names else pa.nulls(len(table), f.type)
+               for f in schema]
+    return pa.Table.from_arrays(columns, names=schema.names).cast(schema)
+
+
+# --- 파티션 부분 통계 ---
+
+def _numeric_values(df, spec):
+    """spec 조건에 맞는 숫자형 컬럼의 결측 제외 float64 값 (대상이 아니면 None)"""
+    col = spec['column']
+    if col not in df.columns:
+        return None
+    if spec.get('require') == 'outlier':
+        if not outlier_columns(df, [col]):
+            return None
+    elif not pd.api.types.is_numeric_dtype(df[col]):
+        return None
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    if 'fill' in spec:
+        values = np.where(np.isnan(values), spec['fill'], values)
+    values = values[~np.isnan(values)]
+    if 'center' in spec:
+        values = np.abs(values - spec['center'])
+    return values
+
+
+def _partial_stat(df, spec, part):
+    kind = spec['kind']
+    if kind in ('moments', 'digest'):
+        values = _numeric_values(df, spec)
+        if values is None:
+            return None
+        stat = Moments() if kind == 'moments' else TDigest(DIGEST_COMPRESSION)
+        return stat.update(values)
+    if kind == 'counts':
+        col = spec['column']
+        if col not in df.columns:
+            return None
+        series = df[col].astype(str) if spec.get('as_str') else df[col]
+        counts = series.value_counts()
+        if isinstance(counts.index, pd.CategoricalIndex):  # 파티션마다 범주가 달라도 값 기준으로 병합
+            counts.index = counts.index.astype(counts.index.categories.dtype)
+        return counts[counts > 0]
+    if kind == 'window':
+        values = _numeric_values(df, spec)
+        if values is None:
+            return None
+        return [(int(np.count_nonzero(values < lo)), values[(values >= lo) & (values <= hi)])
+                for lo, hi in zip(spec['lo'], spec['hi'])]
+    if kind == 'nonnull':
+        return df.notna().sum()
+    if kind == 'distinct':
+        # 고유값이 2개 이상인지만 알면 되므로 컬럼당 최대 2개만 보관
+        return {col: list(df[col].dropna().unique()[:2]) for col in df.columns}
+    if kind == 'hashes':
+        cols = [c for c in spec.get('columns') or df.columns if c in df.columns]
+        return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    if kind == 'sample':
+        cols = outlier_columns(df, spec['columns'])
+        rng = np.random.default_rng([spec['seed'], part])
+        keep = rng.random(len(df)) < spec['fraction']
+        return df.loc[keep, cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    raise ValueError(f"알 수 없는 통계 종류: {kind}")
+
+
+def _merge_stat(kind, total, partial):
+    """부분 통계를 누적값에 병합 (파티션 순서대로 호출됨)"""
+    if partial is None:
+        return total
+    if total is None:
+        return [partial] if kind in ('hashes', 'sample') else partial
+    if kind in ('moments', 'digest'):
+        return total.merge(partial)
+    if kind in ('counts', 'nonnull'):
+        return total.add(partial, fill_value=0)
+    if kind == 'window':
+        return [(below + b, values + [v] if isinstance(values, list) else [values, v])
+                for (below, values), (b, v) in zip(total, partial)]
+    if kind == 'distinct':
+        for col, values in partial.items():
+            seen = total.setdefault(col, [])
+            for value in values:
+                if len(seen) < 2 and value not in seen:
+                    seen.append(value)
+        return total
+    total.append(partial)  # hashes / sample: 파티션 순서 유지
+    return total
+
+
+# --- 파티션 작업 (프로세스 풀에서 실행) ---
+
+def _apply_steps(df, steps):
+    """통계가 고정된 작업들을 파티션에 차례로 적용"""
+    for step in steps:
+        action, params = step['action'], step['params']
+        if action in FITTED_EXECUTORS:
+            df = FITTED_EXECUTORS[action](df, step['columns'] or [], params)
+        else:
+            df, _ = PLAN_EXECUTORS[action](df, step['columns'] or [], params)
+    return df
+
+
+def _run_partition(task):
+    """
+    파티션 하나를 읽어 이미 고정된 작업을 적용한 뒤
+    - 'stats': 요청한 부분 통계 {이름: 통계} 반환
+    - 'write': 결과를 임시 Parquet 파일로 쓰고 (입력 행 수, 출력 행 수, 스키마) 반환
+    """
+    path, row_group, part, float_columns, steps, mode, payload = task
+    df = _read_partition(path, row_group, float_columns)
+    rows = len(df)
+    df = _apply_steps(df.copy(deep=False), steps)
+    if mode == 'stats':
+        return {name: _partial_stat(df, spec, part) for name, spec in payload.items()}
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, payload)
+    return rows, len(df), table.schema
+
+
+# --- 통계가 고정된 작업 (fit 결과) ---
+
+def _fill_values(df, columns, params):
+    values = {col: v for col, v in params['values'].items() if col in df.columns}
+    return df.fillna(values) if values else df
+
+
+def _remove_outside(df, columns, params):
+    cols = [c for c in columns if c in df.columns]
+    if not cols:
+        return df
+    mask = DataProcessor.outside_mask(df, cols, [params['lower'][c] for c in cols], [params['upper'][c] for c in cols])
+    return df[~mask] if mask.any() else df
+
+
+def _clip(df, columns, params):
+    cols = [c for c in columns if c in df.columns]
+    if cols:
+        df[cols] = df[cols].clip(lower=pd.Series(params['lower'])[cols], upper=pd.Series(params['upper'])[cols],
+                                 axis=1)
+    return df
+
+
+def _remove_isolation(df, columns, params):
+    cols = [c for c in columns if c in df.columns]
+    if not cols or not len(df):
+        return df
+    values = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    values = np.where(np.isnan(values), params['medians'], values)
+    mask = params['model'].predict(values) == -1
+    return df[~mask] if mask.any() else df
+
+
+def _affine(df, columns, params):
+    """(x - center) / scale - 스케일러와 같이 결측은 0으로 채운 뒤 변환"""
+    cols = [c for c in columns if c in df.columns]
+    if cols:
+        center, scale = pd.Series(params['center'])[cols], pd.Series(params['scale'])[cols]
+        df[cols] = (df[cols].fillna(0).astype(np.float64) - center) / scale
+    return df
+
+
+def _label_codes(df, columns, params):
+    for col, classes in params['classes'].items():
+        if col in df.columns:
+            values = df[col].astype(str)  # 문자열 타입 컬럼은 결측이 그대로 남음
+            codes = pd.Categorical(values, categories=classes).codes.astype(np.int64)
+            codes[values.isna().to_numpy()] = len(classes)  # LabelEncoder와 같이 결측은 마지막 번호
+            df[col] = codes
+    return df
+
+
+def _one_hot(df, columns, params):
+    cols = [c for c in columns if c in df.columns]
+    if not cols:
+        return df
+    for col in cols:  # 전체 데이터의 범주로 고정해 모든 파티션의 더미 컬럼을 같게 만듦
+        df[col] = pd.Categorical(df[col], categories=params['categories'][col])
+    return DataProcessor.one_hot_encode(df, cols)
+
+
+def _keep_rows(df, columns, params):
+    keep = params['keep']
+    return df if keep.all() else df[keep]
+
+
+FITTED_EXECUTORS = {
+    'fill_values': _fill_values,
+    'remove_outside': _remove_outside,
+    'clip': _clip,
+    'remove_isolation': _remove_isolation,
+    'affine': _affine,
+    'label_codes': _label_codes,
+    'one_hot': _one_hot,
+    'keep_rows': _keep_rows,
+}
+
+
+# --- fit: 작업별 전체 통계 계산 ---
+# 각 fit 함수는 제너레이터로, {이름: 통계 요청}을 yield하면 전체 파티션에서 병합한 결과를 받고,
+# 마지막에 통계가 고정된 작업을 return 합니다. yield 한 번이 데이터 전체 읽기 1회입니다.
+
+def _mode(counts):
+    """pandas mode()와 같이 빈도가 같으면 가장 작은 값"""
+    top = counts[counts == counts.max()].index
+    try:
+        return top.sort_values()[0]
+    except TypeError:
+        return top[0]
+
+
+def _quantiles(specs, qs, extra=None):
+    """
+    컬럼별 분위수 (numpy/pandas 기본 'linear' 보간과 같은 정확한 값) - 데이터 전체 읽기 2회
+
+    1회차 t-digest로 위치를 추정하고, 2회차에 추정 오차 범위 안의 값만 모아 정확한 순위의 값을 찾습니다.
+    값이 범위를 벗어나면(추정 오차가 예상보다 크면) t-digest 추정값을 씁니다.
+    extra의 통계 요청은 1회차에 함께 계산해 돌려줍니다.
+
+    Returns:
+    --------
+    tuple : (extra 통계, {이름: [qs 순서의 분위수]}) - 값이 없는 컬럼은 빠짐
+    """
+    first = {name: {**spec, 'kind': 'digest'} for name, spec in specs.items()}
+    stats = yield {**first, **(extra or {})}
+    digests = {name: stats[name] for name in specs if stats[name] is not None and stats[name].count}
+    windows = {}
+    for name, digest in digests.items():
+        margin = 4 * float(np.max(digest.rank_error(np.asarray(qs)))) + 2 / digest.count
+        windows[name] = {**specs[name], 'kind': 'window',
+                         'lo': digest.quantile(np.clip(np.asarray(qs) - margin, 0, 1)).tolist(),
+                         'hi': digest.quantile(np.clip(np.asarray(qs) + margin, 0, 1)).tolist()}
+    found = (yield windows) if windows else {}
+    result = {}
+    for name, digest in digests.items():
+        n = int(round(digest.count))
+        result[name] = []
+        for q, (below, values) in zip(qs, found[name]):
+            window = np.sort(np.concatenate(values) if isinstance(values, list) else values)
+            h = (n - 1) * q
+            pos = int(np.floor(h)) - below
+            frac = h - np.floor(h)
+            if 0 <= pos and pos + (frac > 0) < len(window):
+                value = window[pos] + (window[pos + 1] - window[pos]) * frac if frac > 0 else window[pos]
+            else:
+                value = digest.quantile(q)
+            result[name].append(float(value))
+    return {name: stats[name] for name in extra or {}}, result
+
+
+def _fit_fill_missing(step, context):
+    strategies = step['params']['strategies']
+    medians = {col: {'column': col, 'require': 'numeric'} for col, kind in strategies.items() if kind == 'median'}
+    others = {col: {'kind': 'moments' if kind == 'mean' else 'counts', 'column': col, 'require': 'numeric'}
+              for col, kind in strategies.items() if kind != 'median'}
+    stats, quantiles = yield from _quantiles(medians, [0.5], others)
+    values = {}
+    for col, kind in strategies.items():
+        if kind == 'median':
+            if col in quantiles:
+                values[col] = quantiles[col][0]
+        elif stats[col] is not None and (stats[col].n if kind == 'mean' else len(stats[col])):
+            values[col] = stats[col].mean if kind == 'mean' else _mode(stats[col])
+    return {'action': 'fill_values', 'columns': None, 'params': {'values': values}}
+
+
+def _fit_drop_empty_columns(step, context):
+    stats = yield {'nonnull': {'kind': 'nonnull'}}
+    nonnull = stats['nonnull']
+    columns = [] if nonnull is None else nonnull.index[nonnull == 0].tolist()
+    return {'action': 'drop_columns', 'columns': columns, 'params': {}}
+
+
+def _fit_drop_constant_columns(step, context):
+    stats = yield {'distinct': {'kind': 'distinct'}}
+    distinct = stats['distinct'] or {}
+    return {'action': 'drop_columns', 'columns': [c for c, values in distinct.items() if len(values) <= 1],
+            'params': {}}
+
+
+def _outlier_bounds(step, context):
+    """remove/cap 공통: 컬럼별 (하한, 상한) 또는 Isolation Forest 작업"""
+    method = step['params'].get('method', 'iqr')
+    threshold = step['params'].get('threshold')
+    k = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
+    cols = step['columns'] or []
+    if method == 'isolation_forest':
+        fraction = min(1.0, ISOLATION_SAMPLE_ROWS / max(context['rows'], 1))
+        specs = {col: {'kind': 'digest', 'column': col, 'require': 'outlier'} for col in cols}
+        specs['_sample'] = {'kind': 'sample', 'columns': cols, 'fraction': fraction, 'seed': 42}
+        stats = yield specs
+        cols = [c for c in cols if stats[c] is not None]
+        if not cols or not stats['_sample']:
+            return None
+        from sklearn.ensemble import IsolationForest
+        medians = np.nan_to_num(np.array([stats[c].quantile(0.5) for c in cols]))
+        sample = np.vstack(stats['_sample'])
+        sample = np.where(np.isnan(sample), medians, sample)
+        if not len(sample):
+            return None
+        model = IsolationForest(contamination=k, random_state=42).fit(sample)
+        return {'action': 'remove_isolation', 'columns': cols, 'params': {'medians': medians, 'model': model}}
+
+    specs = {col: {'column': col, 'require': 'outlier'} for col in cols}
+    if method == 'iqr':
+        _, quartiles = yield from _quantiles(specs, [0.25, 0.75])
+        cols = [c for c in cols if c in quartiles]
+        iqr = {c: quartiles[c][1] - quartiles[c][0] for c in cols}
+        return (cols, {c: quartiles[c][0] - k * iqr[c] for c in cols},
+                {c: quartiles[c][1] + k * iqr[c] for c in cols})
+    if method == 'zscore':
+        stats = yield {col: {**specs[col], 'kind': 'moments'} for col in cols}
+        cols = [c for c in cols if stats[c] is not None and stats[c].n]
+        center = {c: stats[c].mean for c in cols}
+        spread = {c: np.sqrt(stats[c].m2 / (stats[c].n - 1)) if stats[c].n > 1 else np.nan for c in cols}
+    else:  # mad: 중앙값을 구한 뒤 |x - 중앙값|의 중앙값을 다시 계산
+        _, medians = yield from _quantiles(specs, [0.5])
+        cols = [c for c in cols if c in medians]
+        center = {c: medians[c][0] for c in cols}
+        _, deviations = yield from _quantiles({c: {**specs[c], 'center': center[c]} for c in cols}, [0.5])
+        spread = {c: 1.4826 * deviations[c][0] for c in cols}
+    spread = {c: s if s > 0 else np.inf for c, s in spread.items()}  # 퍼짐이 0이면 경계 없음
+    return cols, {c: center[c] - k * spread[c] for c in cols}, {c: center[c] + k * spread[c] for c in cols}
+
+
+def _fit_remove_outliers(step, context):
+    fitted = yield from _outlier_bounds(step, context)
+    if fitted is None:  # 대상 컬럼/행이 없음
+        return {'action': 'remove_outside', 'columns': [], 'params': {'lower': {}, 'upper': {}}}
+    if isinstance(fitted, dict):  # Isolation Forest
+        return fitted
+    cols, lower, upper = fitted
+    return {'action': 'remove_outside', 'columns': cols, 'params': {'lower': lower, 'upper': upper}}
+
+
+def _fit_cap_outliers(step, context):
+    if step['params'].get('method') == 'isolation_forest':
+        raise ValueError("Isolation Forest는 상/하한 적용을 지원하지 않습니다.")
+    cols, lower, upper = yield from _outlier_bounds(step, context)
+    return {'action': 'clip', 'columns': cols, 'params': {'lower': lower, 'upper': upper}}
+
+
+def _fit_scale(step, context):
+    scaler = step['params'].get('scaler', 'minmax').lower()
+    cols = step['columns'] or []
+    specs = {col: {'column': col, 'require': 'numeric', 'fill': 0.0} for col in cols}  # apply_scaling과 같이 결측은 0
+    center, scale = {}, {}
+    if scaler == 'robust':
+        _, quantiles = yield from _quantiles(specs, [0.25, 0.5, 0.75])
+        cols = [c for c in cols if c in quantiles]
+        for c in cols:
+            q1, center[c], q3 = quantiles[c]
+            scale[c] = q3 - q1
+    else:
+        stats = yield {col: {**specs[col], 'kind': 'moments'} for col in cols}
+        cols = [c for c in cols if stats[c] is not None and stats[c].n]
+        for c in cols:
+            stat = stats[c]
+            if scaler == 'standard':
+                center[c], scale[c] = stat.mean, np.sqrt(stat.m2 / stat.n)
+            elif scaler == 'maxabs':
+                center[c], scale[c] = 0.0, max(abs(stat.min), abs(stat.max))
+            else:  # minmax (알 수 없는 이름도 DataProcessor.apply_scaling과 같이 minmax)
+                center[c], scale[c] = stat.min, stat.max - stat.min
+    scale = {c: v or 1.0 for c, v in scale.items()}  # scikit-learn과 같이 범위가 0이면 나누지 않음
+    return {'action': 'affine', 'columns': cols, 'params': {'center': center, 'scale': scale}}
+
+
+def _fit_label_encode(step, context):
+    cols = step['columns'] or []
+    stats = yield {col: {'kind': 'counts', 'column': col, 'as_str': True} for col in cols}
+    # LabelEncoder와 같이 문자열로 바꾼 값을 정렬한 순서로 번호 부여
+    return {'action': 'label_codes', 'columns': None,
+            'params': {'classes': {c: sorted(stats[c].index) for c in cols if stats[c] is not None}}}
+
+
+def _fit_one_hot_encode(step, context):
+    cols = step['columns'] or []
+    stats = yield {col: {'kind': 'counts', 'column': col} for col in cols}
+    cols = [c for c in cols if stats[c] is not None]
+    return {'action': 'one_hot', 'columns': cols,
+            'params': {'categories': {c: pd.Index(stats[c].index).sort_values() for c in cols}}}
+
+
+def _fit_drop_duplicates(step, context):
+    stats = yield {'hashes': {'kind': 'hashes', 'columns': step['columns']}}
+    parts = stats['hashes'] or []
+    # 64비트 행 해시로 전체 데이터에서 처음 나온 행만 남김 (해시 충돌 확률은 무시할 수준)
+    keep = ~pd.Series(np.concatenate(parts) if parts else np.empty(0, np.uint64)).duplicated().to_numpy()
+    bounds = np.cumsum([0] + [len(p) for p in parts])
+    return {'action': 'keep_rows', 'columns': None,
+            'params': {'keep': [keep[bounds[i]:bounds[i + 1]] for i in range(len(parts))]}}
+
+
+FITTERS = {
+    'fill_missing': _fit_fill_missing,
+    'drop_empty_columns': _fit_drop_empty_columns,
+    'drop_constant_columns': _fit_drop_constant_columns,
+    'remove_outliers': _fit_remove_outliers,
+    'cap_outliers': _fit_cap_outliers,
+    'scale': _fit_scale,
+    'label_encode': _fit_label_encode,
+    'one_hot_encode': _fit_one_hot_encode,
+    'drop_duplicates': _fit_drop_duplicates,
+}
+
+
+class PartitionedExecutor:
+    """
+    Parquet row group 단위로 PreprocessPlan을 실행
+
+    통계가 필요한 작업마다 fit 패스(전체 읽기)를 거친 뒤(분위수는 2회, MAD는 4회),
+    마지막 apply 패스에서 모든 작업을 적용합니다. 파티션 처리는 workers개 프로세스에서 병렬로 합니다.
+    통계는 메모리 내 실행과 같은 값이며, 예외는 Isolation Forest(표본 학습)와 중복 제거(64비트 행 해시)입니다.
+    """
+
+    def __init__(self, source, workers=None):
+        if not HAS_PYARROW:
+            raise ImportError("파티션 단위 처리에는 pyarrow가 필요합니다. (pip install pyarrow)")
+        self.files = parquet_files(source)
+        self.partitions = [(path, i) for path in self.files
+                           for i in range(pq.ParquetFile(path).metadata.num_row_groups)]
+        self.rows = sum(pq.ParquetFile(path).metadata.num_rows for path in self.files)
+        self.float_columns = _nullable_integer_columns(self.files)
+        self.workers = workers or os.cpu_count() or 1
+
+    def _map(self, tasks):
+        """파티션 작업을 순서대로 실행 (워커가 2개 이상이면 프로세스 풀)"""
+        if self.workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield _run_partition(task)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+            yield from pool.map(_run_partition, tasks)
+
+    def _tasks(self, steps, mode, payload):
+        tasks = []
+        for part, (path, row_group) in enumerate(self.partitions):
+            part_steps = [_for_partition(step, part) for step in steps]
+            tasks.append((path, row_group, part, self.float_columns, part_steps, mode,
+                          payload(part) if callable(payload) else payload))
+        return tasks
+
+    def _collect(self, steps, specs):
+        """fit 패스: 모든 파티션의 부분 통계를 파티션 순서대로 병합"""
+        totals = dict.fromkeys(specs)
+        for partials in self._map(self._tasks(steps, 'stats', specs)):
+            for name, partial in partials.items():
+                totals[name] = _merge_stat(specs[name]['kind'], totals[name], partial)
+        return totals
+
+    def fit(self, plan, progress_callback=None):
+        """계획의 작업마다 전체 통계를 계산해 파티션에 그대로 적용할 수 있는 작업 목록으로 변환"""
+        steps = plan.optimized().steps
+        context = {'rows': self.rows}
+        fitted, passes = [], 0
+        for index, step in enumerate(steps):
+            fitter = FITTERS.get(step['action'])
+            if fitter is None:  # 행 단위 작업 (필터, 타입 변환, 파생 변수 등)은 통계가 필요 없음
+                fitted.append(step)
+                continue
+            gen = fitter(step, context)
+            specs = next(gen)
+            while True:
+                stats = self._collect(fitted, specs) if specs else {}
+                passes += bool(specs)
+                try:
+                    specs = gen.send(stats)
+                except StopIteration as stop:
+                    fitted.append(stop.value)
+                    break
+            logger.info(f"Fitted {step['action']} ({passes} pass(es) so far)")
+            if progress_callback:
+                progress_callback(int(90 * (index + 1) / len(steps)))
+        return fitted, passes
+
+    def execute(self, plan, output_path, progress_callback=None):
+        """
+        계획을 실행해 결과를 Parquet 파일 하나로 저장
+
+        Returns:
+        --------
+        dict : partitions, passes(데이터 전체 읽기 횟수), rows_in, rows_out, columns, output
+        """
+        fitted, passes = self.fit(plan, progress_callback)
+        temp_dir = tempfile.mkdtemp(prefix='eda_partitions_', dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            tasks = self._tasks(fitted, 'write', lambda part: os.path.join(temp_dir, f'part-{part:05d}.parquet'))
+            results = list(self._map(tasks))
+            schema = _unify_schema([r[2] for r in results])
+            with pq.ParquetWriter(output_path, schema) as writer:
+                for task in tasks:  # 파티션 순서대로 하나씩 읽어 붙임 (메모리는 파티션 하나분)
+                    writer.write_table(_conform(pq.read_table(task[-1]), schema))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        if progress_callback:
+            progress_callback(100)
+        summary = {'partitions': len(self.partitions), 'passes': passes + 1,
+                   'rows_in': sum(r[0] for r in results), 'rows_out': sum(r[1] for r in results),
+                   'columns': len(schema), 'output': output_path}
+        logger.info(f"Partitioned run finished: {summary}")
+        return summary
+
+
+def _for_partition(step, part):
+    """파티션마다 값이 다른 작업(중복 제거 마스크)에서 해당 파티션 몫만 남김"""
+    if step['action'] == 'keep_rows':
+        return {**step, 'params': {'keep': step['params']['keep'][part]}}
+    return step
+
+
+def execute_partitioned(plan, input_path, output_path, workers=None, rows_per_group=PARTITION_ROWS,
+                        progress_callback=None):
+    """
+    PreprocessPlan(또는 JSON 경로)을 큰 파일에 파티션 단위로 적용
+
+    Parameters:
+    -----------
+    plan : PreprocessPlan or str
+    input_path : str
+        Parquet 파일/디렉터리 또는 CSV (CSV는 먼저 rows_per_group행 단위 Parquet으로 변환)
+    output_path : str
+        결과 Parquet 파일
+    workers : int, optional
+        프로세스 수 (None이면 CPU 수)
+    """
+    if isinstance(plan, str):
+        plan = PreprocessPlan.load(plan)
+    if input_path.lower().endswith('.csv'):
+        if not HAS_PYARROW:
+            raise ImportError("파티션 단위 처리에는 pyarrow가 필요합니다. (pip install pyarrow)")
+        temp_dir = tempfile.mkdtemp(prefix='eda_csv_', dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            source = csv_to_parquet(input_path, os.path.join(temp_dir, 'input.parquet'), rows_per_group)
+            return PartitionedExecutor(source, workers).execute(plan, output_path, progress_callback)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return PartitionedExecutor(input_path, workers).execute(plan, output_path, progress_callback)
@@ -0,0 +1,135 @@
+# plot_data.py
+"""
+대시보드 분포 그래프용 데이터
+샘플링 없이 전체 컬럼을 대상으로 히스토그램(균등 구간 한 번 집계), KDE(격자 구간화 + FFT 컨볼루션),
+박스플롯 통계를 미리 계산합니다. 그래프는 계산된 배열만 그리면 되고,
+결과는 ProfileEngine이 컬럼/타입 단위로 캐시합니다.
+"""
+import numpy as np
+import pandas as pd
+
+MAX_BINS = 200  # 'auto' 규칙이 구간을 너무 잘게 나누지 않도록 제한
+KDE_GRID = 1024  # KDE 격자 점 수
+KDE_CUT = 3  # seaborn 기본값과 같이 양 끝에서 대역폭의 3배까지 그림
+MAX_FLIERS = 2000  # 박스플롯 이상치 마커 최대 개수
+
+
+class NumericPlotData:
+    """숫자형 컬럼 하나의 그래프 데이터"""
+
+    def __init__(self, count):
+        self.count = count  # 결측이 아닌 값 수
+        self.edges = None  # 히스토그램 구간 경계 (len = bins + 1)
+        self.counts = None  # 구간별 개수
+        self.kde_x = self.kde_y = None  # 히스토그램 개수 단위로 맞춘 KDE 곡선 (정수마다 한 구간이면 생략)
+        self.box = None  # Axes.bxp에 바로 넘길 통계 dict
+
+
+def histogram_edges(lo, hi, n, iqr=None, integer=False, max_bins=MAX_BINS):
+    """
+    numpy bins='auto' (Sturges와 Freedman-Diaconis 중 좁은 폭) 규칙의 균등 구간 경계
+
+    정수 컬럼은 값 범위가 max_bins 이하이면 정수마다 한 구간을 사용해 계단 무늬(aliasing)를 막습니다.
+    """
+    if integer and hi - lo + 1 <= max_bins:
+        return np.arange(lo - 0.5, hi + 1.5)
+    if hi == lo:
+        return np.array([lo - 0.5, hi + 0.5])
+    width = (hi - lo) / (np.log2(n) + 1)
+    if iqr:
+        width = min(width, 2.0 * iqr * n ** (-1 / 3))
+    bins = int(min(max(np.ceil((hi - lo) / width), 1), max_bins))
+    return np.linspace(lo, hi, bins + 1)
+
+
+def linear_binning(values, lo, delta, size):
+    """각 값을 양옆 격자점에 거리 비율로 나눠 더함 (합계 = 값 개수)"""
+    pos = (values - lo) / delta
+    left = np.clip(np.floor(pos).astype(np.intp), 0, size - 2)
+    frac = pos - left
+    return (np.bincount(left, weights=1 - frac, minlength=size)
+            + np.bincount(left + 1, weights=frac, minlength=size))
+
+
+def binned_kde(values, std, lo, hi, grid_size=KDE_GRID, cut=KDE_CUT):
+    """
+    가우시안 KDE (Scott 대역폭, seaborn/scipy 기본값과 동일)
+
+    값을 격자에 구간화한 뒤 커널과 FFT로 컨볼루션하므로 비용은 O(n + grid log grid)입니다.
+
+    Returns:
+    --------
+    tuple : (격자 x, 밀도 y) - 분산이 0이거나 값이 2개 미만이면 (None, None)
+    """
+    n = len(values)
+    if n < 2 or not std:
+        return None, None
+    bandwidth = std * n ** (-1 / 5)
+    x = np.linspace(lo - cut * bandwidth, hi + cut * bandwidth, grid_size)
+    delta = x[1] - x[0]
+    weights = linear_binning(values, x[0], delta, grid_size)
+    offsets = np.arange(-(grid_size - 1), grid_size) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    size = 1 << int(np.ceil(np.log2(3 * grid_size - 2)))
+    conv = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)
+    density = conv[grid_size - 1:2 * grid_size - 1] / n
+    return x, np.maximum(density, 0)  # FFT 반올림 오차로 생기는 아주 작은 음수 제거
+
+
+def box_stats(values, q1, median, q3, max_fliers=MAX_FLIERS):
+    """
+    Axes.bxp용 박스플롯 통계 (수염은 1.5 IQR 안쪽의 실제 최소/최대값)
+
+    이상치는 같은 값이 겹쳐 그려지므로 고유값만 남기고, 그래도 max_fliers를 넘으면
+    정렬된 고유값에서 양 끝을 포함해 고르게 골라 그립니다.
+    """
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = (values >= lower) & (values <= upper)
+    fliers = np.unique(values[~inside])
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).round().astype(np.intp)]
+    return {
+        'q1': q1, 'med': median, 'q3': q3,
+        'whislo': values[inside].min() if inside.any() else q1,
+        'whishi': values[inside].max() if inside.any() else q3,
+        'fliers': fliers,
+    }
+
+
+def numeric_plot_data(series, profile=None):
+    """
+    숫자형 컬럼의 히스토그램/KDE/박스플롯 데이터
+
+    Parameters:
+    -----------
+    series : Series
+        숫자형 컬럼 전체
+    profile : ColumnProfile, optional
+        이미 계산된 통계 (최소/최대/표준편차/사분위수를 재사용). None이면 직접 계산
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[np.isfinite(values)]
+    data = NumericPlotData(len(values))
+    if not len(values):
+        return data
+
+    if profile is not None and profile.quantiles and profile.count == len(values):
+        lo, hi, std = profile.min, profile.max, profile.std
+        q1, median, q3 = (profile.quantiles[q] for q in (0.25, 0.5, 0.75))
+    else:
+        lo, hi = values.min(), values.max()
+        std = values.std(ddof=1) if len(values) > 1 else None
+        q1, median, q3 = np.quantile(values, (0.25, 0.5, 0.75))
+
+    integer = pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype)
+    data.edges = histogram_edges(lo, hi, len(values), q3 - q1, integer)
+    data.counts, _ = np.histogram(values, bins=len(data.edges) - 1, range=(data.edges[0], data.edges[-1]))
+    data.box = box_stats(values, q1, median, q3)
+
+    # 정수마다 한 구간인 이산 값에 KDE를 그리면 값마다 뾰족한 봉우리가 생기므로 히스토그램만 사용
+    if not (integer and hi - lo + 1 <= MAX_BINS):
+        data.kde_x, density = binned_kde(values, std, lo, hi)
+        if density is not None:
+            data.kde_y = density * len(values) * (data.edges[1] - data.edges[0])  # 히스토그램 개수 축에 맞춤
+    return data
@@ -0,0 +1,335 @@
+# profiler.py
+"""
+대시보드 통계 엔진
+컬럼마다 한 번 훑어서 개수/결측/최소·최대/적률(평균, 표준편차, 왜도, 첨도)/사분위수/상위 빈도/고유값 수를
+함께 계산하고, 결과를 컬럼 단위로 캐시합니다. 전처리 작업이 바꾼 컬럼만 무효화하므로
+나머지 컬럼의 통계는 다시 계산하지 않습니다.
+
+행 수가 SKETCH_MIN_ROWS 이상인 컬럼은 청크 단위 스케치(sketches.py)로 계산하며,
+근사값에는 오차 범위(bounds)가 함께 기록됩니다.
+"""
+import numpy as np
+import pandas as pd
+
+from correlation import CorrelationEngine
+from plot_data import numeric_plot_data
+from sketches import Moments, TDigest, HyperLogLog, SpaceSaving
+
+SYNC_PROFILE_CELLS = 5_000_000  # 미계산 셀 수가 이보다 많으면 백그라운드에서 계산
+SKETCH_MIN_ROWS = 10_000_000  # 이 행 수 이상이면 정확 계산 대신 스케치 사용 (정확 집계 메모리가 커지는 규모)
+SKETCH_CHUNK_ROWS = 1_000_000
+QUARTILES = (0.25, 0.5, 0.75)
+DESCRIBE_COLUMNS = ['count', 'missing', 'unique', 'top', 'freq', 'mean', 'std', 'skew', 'kurtosis',
+                    'min', '25%', '50%', '75%', 'max', 'accuracy']
+
+
+def column_kind(series):
+    """대시보드 분류: 'numeric' / 'categorical' / 'boolean' / 'datetime' / 'other'"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'boolean'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) \
+            or pd.api.types.is_string_dtype(dtype):
+        return 'categorical'
+    return 'other'
+
+
+class ColumnProfile:
+    """컬럼 하나의 통계 (값이 없는 항목은 None)"""
+
+    def __init__(self, name, kind, count, missing):
+        self.name = name
+        self.kind = kind
+        self.count = count
+        self.missing = missing
+        self.unique = None
+        self.top_values = None  # 상위 빈도 Series (값 -> 개수, 내림차순)
+        self.mean = self.std = self.skew = self.kurtosis = None
+        self.min = self.max = None
+        self.quantiles = None  # {0.25: .., 0.5: .., 0.75: ..}
+        self.top_errors = None  # 근사일 때 상위 빈도 개수의 오차 상한 (top_values와 같은 순서)
+        self.approximate = False
+        self.bounds = {}  # 'quantile_rank_error'(비율), 'unique_rel_error'(비율), 'top_count_error'(개수)
+
+    @property
+    def top(self):
+        return self.top_values.index[0] if self.top_values is not None and len(self.top_values) else None
+
+    @property
+    def freq(self):
+        return int(self.top_values.iloc[0]) if self.top_values is not None and len(self.top_values) else None
+
+    @property
+    def iqr(self):
+        if not self.quantiles:
+            return None
+        return self.quantiles[0.75] - self.quantiles[0.25]
+
+    def accuracy_text(self):
+        """근사 통계의 오차 범위 설명 (정확값이면 빈 문자열)"""
+        if not self.approximate:
+            return ''
+        parts = []
+        if self.bounds.get('quantile_rank_error'):
+            parts.append(f"quantiles ±{self.bounds['quantile_rank_error']:.2%} rank")
+        if self.bounds.get('unique_rel_error'):
+            parts.append(f"unique ±{self.bounds['unique_rel_error']:.1%}")
+        if self.bounds.get('top_count_error'):
+            parts.append(f"top-k counts -{self.bounds['top_count_error']:,}")
+        return "≈ " + ", ".join(parts) if parts else "≈ exact"
+
+    def as_row(self):
+        """describe(include='all').T 형식의 한 행"""
+        q = self.quantiles or {}
+        row = {
+            'count': self.count, 'missing': self.missing, 'unique': self.unique,
+            'top': self.top if self.kind != 'numeric' else None,
+            'freq': self.freq if self.kind != 'numeric' else None,
+            'mean': self.mean, 'std': self.std, 'skew': self.skew, 'kurtosis': self.kurtosis,
+            'min': self.min, '25%': q.get(0.25), '50%': q.get(0.5), '75%': q.get(0.75), 'max': self.max,
+            'accuracy': self.accuracy_text(),
+        }
+        return [row[key] for key in DESCRIBE_COLUMNS]
+
+
+def _set_moments(profile, moments):
+    """평균/표본 표준편차/왜도/첨도 (pandas skew/kurt와 같은 편향 보정식)"""
+    n, s2 = moments.n, moments.m2
+    profile.mean = moments.mean
+    profile.min, profile.max = moments.min, moments.max
+    profile.std = float(np.sqrt(s2 / (n - 1))) if n > 1 else None
+    if n > 2 and s2 > 0:
+        profile.skew = float(np.sqrt(n * (n - 1)) / (n - 2) * moments.m3 / n / (s2 / n) ** 1.5)
+    if n > 3 and s2 > 0:
+        profile.kurtosis = float((n + 1) * n * (n - 1) / ((n - 2) * (n - 3)) * moments.m4 / s2 ** 2
+                                 - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+
+
+class ColumnSketch:
+    """
+    컬럼 하나의 병합 가능한 스케치 묶음
+    청크마다 update()하거나, 다른 파티션에서 만든 ColumnSketch를 merge()한 뒤 to_profile()로 변환합니다.
+    """
+
+    def __init__(self, kind, top_capacity=1000):
+        self.kind = kind
+        self.rows = 0
+        self.count = 0  # 결측이 아닌 값 수
+        self.moments = Moments() if kind == 'numeric' else None
+        self.digest = TDigest() if kind == 'numeric' else None
+        self.hll = HyperLogLog()
+        self.top = SpaceSaving(top_capacity)
+        self.min = self.max = None  # 날짜 컬럼용
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        if self.kind == 'numeric':
+            values = chunk.to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = values[~np.isnan(values)]
+            self.moments.update(valid)
+            self.digest.update(valid)
+            chunk = pd.Series(valid, copy=False)
+        else:
+            chunk = chunk.dropna()
+            if self.kind == 'datetime' and len(chunk):
+                lo, hi = chunk.min(), chunk.max()
+                self.min = lo if self.min is None else min(self.min, lo)
+                self.max = hi if self.max is None else max(self.max, hi)
+        self.count += len(chunk)
+        counts = chunk.value_counts(sort=False)  # 청크 안에서 한 번 세어 HLL(고유값만 해시)과 top-k에 공유
+        self.hll.update(counts.index)
+        self.top.update_counts(counts)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.count += other.count
+        if self.kind == 'numeric':
+            self.moments.merge(other.moments)
+            self.digest.merge(other.digest)
+        elif other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.hll.merge(other.hll)
+        self.top.merge(other.top)
+        return self
+
+    def to_profile(self, name, top_k=10):
+        profile = ColumnProfile(name, self.kind, self.count, self.rows - self.count)
+        profile.approximate = True
+        if self.kind == 'numeric' and self.count:
+            _set_moments(profile, self.moments)
+            profile.quantiles = dict(zip(QUARTILES, self.digest.quantile(QUARTILES).tolist()))
+            profile.bounds['quantile_rank_error'] = float(np.max(self.digest.rank_error(np.array(QUARTILES))))
+        elif self.kind == 'datetime':
+            profile.min, profile.max = self.min, self.max
+        profile.top_values, profile.top_errors = self.top.top(top_k)
+        if self.top.exact:  # 추적 용량을 넘지 않았으면 빈도/고유값 수는 정확함
+            profile.unique = len(self.top.counts)
+        else:
+            profile.unique = int(round(self.hll.estimate()))
+            profile.bounds['unique_rel_error'] = self.hll.relative_error
+            profile.bounds['top_count_error'] = int(profile.top_errors.max()) if len(profile.top_errors) else 0
+        return profile
+
+
+def sketch_column(series, kind=None, chunk_rows=SKETCH_CHUNK_ROWS):
+    """컬럼을 청크 단위로 훑어 ColumnSketch 생성"""
+    sketch = ColumnSketch(kind or column_kind(series))
+    for start in range(0, len(series), chunk_rows):
+        sketch.update(series.iloc[start:start + chunk_rows])
+    return sketch
+
+
+def profile_column(series, top_k=10, sketch_min_rows=SKETCH_MIN_ROWS):
+    """컬럼 하나를 프로파일링 (큰 컬럼은 스케치 근사, 범주형 dtype은 코드 집계가 빠르므로 항상 정확 계산)"""
+    kind = column_kind(series)
+    n = len(series)
+    if n >= sketch_min_rows and kind in ('numeric', 'categorical', 'datetime') \
+            and not isinstance(series.dtype, pd.CategoricalDtype):
+        return sketch_column(series, kind).to_profile(series.name, top_k)
+    if kind == 'numeric':
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = values[~np.isnan(values)]
+        profile = ColumnProfile(series.name, kind, len(valid), n - len(valid))
+        if len(valid):
+            _set_moments(profile, Moments().update(valid))
+            profile.quantiles = dict(zip(QUARTILES, np.quantile(valid, QUARTILES).tolist()))
+        counts = pd.Series(valid).value_counts()
+    else:
+        counts = series.value_counts(dropna=True)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            counts = counts[counts > 0]  # 사용되지 않는 범주 제외
+        count = int(counts.sum())
+        profile = ColumnProfile(series.name, kind, count, n - count)
+        if kind == 'datetime' and count:
+            profile.min, profile.max = series.min(), series.max()
+    profile.unique = len(counts)
+    profile.top_values = counts.head(top_k)
+    return profile
+
+
+def count_duplicate_rows(df):
+    """
+    중복 행 개수 (DataFrame.duplicated().sum()과 같은 값)
+    컬럼별 64비트 해시를 결합해 행 해시 하나로 비교하므로 전체 행을 직접 비교하지 않습니다.
+    """
+    if df.shape[1] == 0 or len(df) == 0:
+        return 0
+    row_hash = np.zeros(len(df), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for col in df.columns:
+            col_hash = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+            row_hash = row_hash * np.uint64(0x100000001B3) ^ col_hash
+    return int(pd.Series(row_hash).duplicated().sum())
+
+
+class ProfileEngine:
+    """
+    컬럼 통계 캐시
+
+    set_data(df, touched, dropped_rows)로 새 데이터를 알려주면 touched 컬럼(None이면 전체)만 무효화하고,
+    profile(col) / profiles() / summary() 호출 시 필요한 컬럼만 계산합니다.
+    상관계수 행렬은 correlation(CorrelationEngine)이 같은 변경 정보로 부분 갱신합니다.
+    """
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.df = None
+        self._profiles = {}
+        self._plots = {}  # 컬럼 -> (dtype, NumericPlotData)
+        self._duplicates = None
+        self.correlation = CorrelationEngine()
+
+    def set_data(self, df, touched=None, dropped_rows=None):
+        """
+        Parameters:
+        -----------
+        df : DataFrame
+            현재 데이터
+        touched : list, optional
+            직전 작업이 값을 바꾸거나 추가한 컬럼. None이면 전체 무효화 (새 파일 등)
+        dropped_rows : DataFrame, optional
+            직전 작업이 삭제한 행 (UndoHistory.last_dropped_rows). 있으면 컬럼 통계는 전체 무효화
+        """
+        self.correlation.set_data(df, touched, dropped_rows)
+        if dropped_rows is not None:
+            touched = None
+        if touched is None or self.df is None:
+            self._profiles.clear()
+            self._plots.clear()
+        else:
+            for cache in (self._profiles, self._plots):
+                for col in touched:
+                    cache.pop(col, None)
+                for col in [c for c in cache if c not in df.columns]:
+                    del cache[col]
+        if touched is None or touched:
+            self._duplicates = None
+        self.df = df
+
+    def stale_columns(self):
+        """아직 계산되지 않은 컬럼 목록"""
+        if self.df is None:
+            return []
+        return [col for col in self.df.columns if col not in self._profiles]
+
+    def stale_cells(self):
+        """남은 계산량 (미계산 컬럼 셀 수 + 상관계수 갱신량)"""
+        stale = len(self.stale_columns())
+        return (stale * len(self.df) if stale else 0) + self.correlation.stale_cells()
+
+    def profile(self, col):
+        cached = self._profiles.get(col)
+        if cached is None:
+            cached = profile_column(self.df[col], self.top_k)
+            self._profiles[col] = cached
+        return cached
+
+    def plot_data(self, col):
+        """숫자형 컬럼의 히스토그램/KDE/박스플롯 데이터 (전체 행 기준, 컬럼/타입별 캐시)"""
+        series = self.df[col]
+        cached = self._plots.get(col)
+        if cached is None or cached[0] != series.dtype:
+            cached = (series.dtype, numeric_plot_data(series, self.profile(col)))
+            self._plots[col] = cached
+        return cached[1]
+
+    def profiles(self):
+        """전체 컬럼 통계 (컬럼 순서 유지)"""
+        return {col: self.profile(col) for col in self.df.columns}
+
+    def compute_all(self):
+        """미계산 컬럼, 중복 행 수, 상관계수 행렬을 모두 계산 (백그라운드 Worker에서 호출)"""
+        self.profiles()
+        self.duplicate_rows()
+        self.correlation.matrix()
+        return self
+
+    def duplicate_rows(self):
+        if self._duplicates is None:
+            self._duplicates = count_duplicate_rows(self.df)
+        return self._duplicates
+
+    def columns_of_kind(self, *kinds):
+        return [col for col, p in self.profiles().items() if p.kind in kinds]
+
+    def summary(self):
+        """대시보드 카드용 요약: 행/열 수, 전체 결측, 중복 행"""
+        profiles = self.profiles()
+        return {
+            'rows': len(self.df),
+            'columns': self.df.shape[1],
+            'missing': int(sum(p.missing for p in profiles.values())),
+            'duplicates': self.duplicate_rows(),
+        }
+
+    def describe(self):
+        """컬럼별 통계표 (describe(include='all').T 대체)"""
+        profiles = self.profiles()
+        return pd.DataFrame([p.as_row() for p in profiles.values()], index=list(profiles),
+                            columns=DESCRIBE_COLUMNS, dtype=object)
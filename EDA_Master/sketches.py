@@ -0,0 +1,220 @@
+# sketches.py
+"""
+스트리밍 근사 통계 (청크 단위로 갱신하고 서로 병합 가능)
+- Moments: 개수/평균/2~4차 중심적률 (정확값, Pébay 병합식)
+- TDigest: 분위수 (꼬리로 갈수록 정밀한 merging t-digest)
+- HyperLogLog: 고유값 개수 (상대오차 약 1.04/sqrt(2^p))
+- SpaceSaving: 상위 빈도 항목 (각 항목 개수의 오차 상한 제공)
+모든 클래스는 NumPy/pandas 배열 연산만 사용하며 pickle 가능하므로 프로세스 간 전달/병합할 수 있습니다.
+"""
+import numpy as np
+import pandas as pd
+
+
+class Moments:
+    """개수, 최소/최대, 평균과 2~4차 중심적률 합 (청크 병합해도 정확값)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = self.m3 = self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """values: 결측값이 없는 1차원 float 배열"""
+        if len(values) == 0:
+            return self
+        chunk = Moments()
+        chunk.n = len(values)
+        chunk.mean = float(values.mean())
+        d = values - chunk.mean
+        d2 = d * d
+        chunk.m2 = float(d2.sum())
+        chunk.m3 = float((d2 * d).sum())
+        chunk.m4 = float((d2 * d2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta ** 2 * na * nb / n
+        m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4 + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta ** 2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        self.mean += delta * nb / n
+        self.n, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+
+class TDigest:
+    """
+    분위수 근사 (merging t-digest, k1 스케일 함수)
+    centroid 수는 약 compression/2개로 고정되며, 중앙보다 꼬리(0%, 100% 부근)가 더 정밀합니다.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """values: 결측값이 없는 1차원 float 배열"""
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other):
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        group = np.floor(k - k[0]).astype(np.int64)  # k 공간에서 폭 1 이하로 묶음
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """q (스칼라 또는 배열, 0~1) 분위수"""
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        total = self.count
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return np.interp(np.asarray(q) * total, np.r_[0.0, centers, total],
+                         np.r_[self.min, self.means, self.max])
+
+    def rank_error(self, q):
+        """q 분위수 추정의 순위 오차 상한 (전체 대비 비율) - 해당 centroid 가중치의 절반"""
+        if not len(self.means):
+            return 0.0
+        cum = np.cumsum(self.weights)
+        i = np.minimum(np.searchsorted(cum, np.asarray(q) * cum[-1]), len(cum) - 1)
+        return self.weights[i] / (2 * cum[-1])
+
+
+class HyperLogLog:
+    """고유값 개수 근사 (64비트 해시, 레지스터 2^p개)"""
+
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        """추정치의 표준 상대오차"""
+        return 1.04 / np.sqrt(self.m)
+
+    def update(self, values):
+        """values: 결측값을 제외한 Series 또는 Index (중복이 많으면 고유값만 넘겨도 결과가 같음)"""
+        if len(values):
+            self.update_hashes(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        return self
+
+    def update_hashes(self, hashes):
+        p = np.uint64(self.p)
+        idx = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        rest = hashes << p
+        # 남은 비트의 선행 0 개수 + 1 (32비트씩 나눠 float64로 정확한 비트 길이 계산)
+        hi = (rest >> np.uint64(32)).astype(np.float64)
+        lo = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+        rho = np.minimum(65 - bit_length, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rho)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # 작은 범위 보정 (linear counting)
+        return float(estimate)
+
+
+class SpaceSaving:
+    """
+    상위 빈도 항목 요약 (최대 capacity개 추적)
+    각 항목의 추정 개수 c와 오차 e에 대해 실제 개수는 [c - e, c] 범위이며,
+    추적되지 않는 항목의 실제 개수는 floor 이하입니다. floor가 0이면 모든 값이 정확합니다.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.float64)
+        self.errors = pd.Series(dtype=np.float64)
+        self.floor = 0.0
+
+    @property
+    def exact(self):
+        return self.floor == 0
+
+    def update(self, series):
+        """series: 결측값을 제외한 청크"""
+        return self.update_counts(series.value_counts(sort=False))
+
+    def update_counts(self, counts):
+        """청크에서 정확히 센 빈도(값 -> 개수)를 요약에 합침. 청크도 capacity개로 먼저 줄여 병합 비용을 제한"""
+        counts = counts[counts > 0].astype(np.float64)
+        chunk_floor = 0.0
+        if len(counts) > self.capacity:
+            keep = counts.nlargest(self.capacity, keep='first').index
+            chunk_floor = float(counts.drop(keep).max())
+            counts = counts[keep]
+        return self._combine(counts, pd.Series(0.0, index=counts.index), chunk_floor)
+
+    def merge(self, other):
+        return self._combine(other.counts, other.errors, other.floor)
+
+    def _combine(self, counts, errors, other_floor):
+        index = self.counts.index.union(counts.index)
+        # 한쪽 요약에만 있는 항목은 다른 쪽에서 최대 floor번 나왔을 수 있음
+        estimate = self.counts.reindex(index).fillna(self.floor) + counts.reindex(index).fillna(other_floor)
+        error = self.errors.reindex(index).fillna(self.floor) + errors.reindex(index).fillna(other_floor)
+        floor = self.floor + other_floor
+        if len(estimate) > self.capacity:
+            keep = estimate.nlargest(self.capacity, keep='first').index
+            floor = max(floor, float(estimate.drop(keep).max()))
+            estimate, error = estimate[keep], error[keep]
+        self.counts, self.errors, self.floor = estimate, error, floor
+        return self
+
+    def top(self, k=10):
+        """(상위 k개 추정 개수 Series, 같은 순서의 오차 Series)"""
+        counts = self.counts.sort_values(ascending=False, kind='stable').head(k)
+        return counts.astype(np.int64), self.errors[counts.index].astype(np.int64)
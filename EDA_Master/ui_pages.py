@@ -111,6 +111,9 @@ class UIPages:
         raw_layout = QVBoxLayout(app.tab_raw)
         app.view_raw = QTableView()
         app.view_raw.setAlternatingRowColors(True)
+        # 헤더 클릭 정렬 (PandasModel이 백그라운드에서 정렬 순열만 계산)
+        app.view_raw.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        app.view_raw.setSortingEnabled(True)
         raw_layout.addWidget(app.view_raw)
         app.tabs.addTab(app.tab_raw, "Raw Data")
         app.tab_stats = QWidget()
@@ -213,10 +216,13 @@ class UIPages:
             "결측치 포함 열 제거 (Drop Columns with NaNs)",
             "이상치 처리: IQR 방식으로 제거 (Remove Outliers - IQR)",
             "이상치 처리: IQR 방식으로 상/하한 적용 (Cap Outliers - IQR)",
+            "이상치 처리: Z-score 방식으로 제거 (|z| > 3)",
+            "이상치 처리: MAD 방식으로 제거 (Robust Z > 3.5)",
+            "이상치 처리: Isolation Forest로 제거 (다변량, 상위 1%)",
             "인코딩: 레이블 인코딩 (Label Encoding)",
             "인코딩: 원-핫 인코딩 (One-Hot Encoding)",
             "특성 공학: 파생 변수 생성 (제곱 - Squared Feature)",
-            "특성 공학: 시계열 특성 추출 (년/월/일)",
+            "특성 공학: 시계열 특성 추출 (년/월/일/요일)",
             "스케일링 적용 (Apply Scaler)",
             "데이터 타입 변환: 숫자로 (Convert to Numeric)",
             "텍스트 데이터 전처리 (공백 제거/소문자)",
@@ -248,6 +254,24 @@ class UIPages:
         """)
         app.btn_run_process.clicked.connect(app.execute_preprocessing_task)
         control_layout.addWidget(app.btn_run_process, 6, 0, 1, 2)
+
+        app.btn_save_plan = QPushButton("💾 Save Pipeline (JSON)")
+        app.btn_save_plan.setCursor(Qt.CursorShape.PointingHandCursor)
+        app.btn_save_plan.setStyleSheet("""
+            QPushButton { background-color: white; color: #6c5ce7; font-weight: bold; padding: 10px; border-radius: 5px; border: 1px solid #6c5ce7; }
+            QPushButton:hover { background-color: #f1efff; }
+        """)
+        app.btn_save_plan.clicked.connect(app.save_pipeline)
+        control_layout.addWidget(app.btn_save_plan, 7, 0, 1, 2)
+
+        app.btn_apply_plan_file = QPushButton("🗂 Apply Pipeline to Large File")
+        app.btn_apply_plan_file.setCursor(Qt.CursorShape.PointingHandCursor)
+        app.btn_apply_plan_file.setStyleSheet("""
+            QPushButton { background-color: white; color: #6c5ce7; font-weight: bold; padding: 10px; border-radius: 5px; border: 1px solid #6c5ce7; }
+            QPushButton:hover { background-color: #f1efff; }
+        """)
+        app.btn_apply_plan_file.clicked.connect(app.apply_pipeline_to_file)
+        control_layout.addWidget(app.btn_apply_plan_file, 8, 0, 1, 2)
         
         layout.addStretch()
         layout.addWidget(QLabel("<b>Processing Log:</b>"))
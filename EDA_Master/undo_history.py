@@ -0,0 +1,307 @@
+# undo_history.py
+"""
+메모리 효율적인 Undo 히스토리
+작업마다 DataFrame 전체를 복사하는 대신, 작업 전/후를 비교해 '되돌리기에 필요한 것'만 저장합니다.
+- 값이 바뀌었거나 삭제된 컬럼: 작업 전 컬럼만 보관
+- 새로 생긴 컬럼: 이름만 보관 (되돌릴 때 삭제)
+- 삭제된 행: 남은 행 마스크 + 삭제된 행의 나머지 컬럼 값만 보관
+전체 스냅샷은 주기적인 체크포인트(또는 차이가 너무 커서 diff가 의미 없을 때)에만 저장하며,
+큰 항목은 선택적으로 디스크(pickle)로 내보냅니다.
+"""
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_RATIO = 0.5  # diff 크기가 프레임의 이 비율 이상이면 전체 스냅샷으로 저장
+
+
+class HistoryError(Exception):
+    """현재 데이터에 적용할 수 없는 히스토리"""
+
+
+def copy_on_write_enabled():
+    """pandas Copy-on-Write 사용 여부 (pandas 3은 항상 사용)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        return False
+
+
+def _nbytes(obj):
+    if obj is None:
+        return 0
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True, index=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(_nbytes(v) for v in obj.values())
+    return 0
+
+
+def compute_diff(before, after):
+    """
+    after에서 before를 복원하는 역방향 diff
+
+    Returns:
+    --------
+    dict or None : 행 추가/순서 변경, 중복 인덱스/컬럼처럼 diff로 표현할 수 없으면 None
+    """
+    if not (before.index.is_unique and after.index.is_unique
+            and before.columns.is_unique and after.columns.is_unique):
+        return None
+    positions = before.index.get_indexer(after.index)
+    if (positions < 0).any() or (np.diff(positions) <= 0).any():
+        return None
+    rows_dropped = len(positions) < len(before)
+    kept = None
+    if rows_dropped:
+        kept = np.zeros(len(before), dtype=bool)
+        kept[positions] = True
+
+    changed, unchanged = {}, []
+    for col in before.columns:
+        if col in after.columns:
+            old = before[col].iloc[positions] if rows_dropped else before[col]
+            new = after[col]
+            if old.dtype == new.dtype and old.equals(new):
+                unchanged.append(col)
+                continue
+        changed[col] = before[col].copy()  # 블록 전체가 아닌 해당 컬럼 메모리만 보관
+
+    return {
+        'columns': list(before.columns),
+        'changed': changed,
+        'added': [col for col in after.columns if col not in before.columns],
+        'kept': kept,
+        'index': before.index if rows_dropped else None,
+        'dropped_rows': before.loc[~kept, unchanged].copy() if rows_dropped else None,
+    }
+
+
+def apply_diff(after, diff):
+    """compute_diff 결과로 작업 전 DataFrame 복원"""
+    unchanged = [col for col in diff['columns'] if col not in diff['changed']]
+    restored = after[unchanged]
+    if diff['kept'] is not None:
+        order = np.concatenate([np.flatnonzero(diff['kept']), np.flatnonzero(~diff['kept'])])
+        restored = pd.concat([restored, diff['dropped_rows']]).iloc[np.argsort(order, kind='stable')]
+        restored.index = diff['index']
+    else:
+        restored = restored.copy(deep=False)
+    for col, values in diff['changed'].items():
+        restored[col] = values
+    return restored[diff['columns']]
+
+
+class _Spilled:
+    """디스크로 내보낸 항목 (필요할 때만 다시 읽음)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        return pd.read_pickle(self.path)
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class _Entry:
+    def __init__(self, description, kind, payload, signature, nbytes, touched=None):
+        self.description = description
+        self.kind = kind  # 'diff' 또는 'checkpoint'
+        self.payload = payload
+        self.signature = signature  # 작업 후 (컬럼, 행 수) - 적용 대상 검증용
+        self.nbytes = nbytes
+        self.touched = touched  # 작업이 바꾼 컬럼 (None이면 전체)
+
+    @property
+    def spilled(self):
+        return isinstance(self.payload, _Spilled)
+
+    def load(self):
+        return self.payload.load() if self.spilled else self.payload
+
+    def discard(self):
+        if self.spilled:
+            self.payload.discard()
+
+
+def touched_columns(diff):
+    """diff에서 값이 바뀌거나 추가된 컬럼 목록 (diff가 없으면 None = 전체). 삭제된 행은 diff['dropped_rows']"""
+    if diff is None:
+        return None
+    return list(diff['changed']) + diff['added']
+
+
+def _signature(df):
+    return tuple(df.columns), len(df)
+
+
+class UndoHistory:
+    """
+    작업 로그 기반 Undo 스택
+
+    사용 순서: begin(df, 설명) -> (df 변경) -> commit(df). 실패 시 rollback()으로 작업 전 상태를 돌려받습니다.
+    commit을 호출하지 않아도 다음 begin/undo 시점에 자동으로 확정됩니다.
+    작업 전 상태는 Copy-on-Write가 켜져 있으면 얕은 복사로 잡아 두므로 변경된 부분만 메모리를 사용합니다.
+    """
+
+    def __init__(self, max_history=10, checkpoint_interval=10, spill_to_disk=False, spill_threshold_mb=256,
+                 spill_dir=None):
+        self.max_history = max_history
+        self.checkpoint_interval = checkpoint_interval
+        self.spill_to_disk = spill_to_disk
+        self.spill_threshold = spill_threshold_mb * 1024 ** 2
+        self._spill_dir = spill_dir
+        self._own_spill_dir = False
+        self._entries = []
+        self._pending = None  # (작업 전 스냅샷, 설명)
+        self._recorded = 0
+        self.last_touched = None  # 마지막 commit/undo/rollback으로 바뀐 컬럼 (None이면 전체)
+        self.last_dropped_rows = None  # 마지막 commit에서 삭제된 행 (값이 그대로인 컬럼만, 없으면 None)
+
+    def __len__(self):
+        return len(self._entries) + (self._pending is not None)
+
+    def can_undo(self):
+        return len(self) > 0
+
+    @property
+    def in_progress(self):
+        """begin 후 아직 commit/rollback 하지 않은 작업이 있는지"""
+        return self._pending is not None
+
+    @property
+    def last_description(self):
+        if self._pending is not None:
+            return self._pending[1]
+        return self._entries[-1].description if self._entries else None
+
+    def memory_usage_mb(self):
+        """메모리에 남아 있는 히스토리 크기 (디스크로 내보낸 항목 제외)"""
+        return sum(e.nbytes for e in self._entries if not e.spilled) / 1024 ** 2
+
+    def begin(self, df, description="Action"):
+        """작업 직전 상태 기록"""
+        if self._pending is not None:
+            self.commit(df)
+        snapshot = df.copy(deep=False) if copy_on_write_enabled() else df.copy(deep=True)
+        self._pending = (snapshot, description)
+
+    def commit(self, df):
+        """begin 이후 변경된 결과로 diff를 계산해 히스토리에 추가"""
+        if self._pending is None:
+            self.last_touched = self.last_dropped_rows = None  # 기록 없이 바뀌었을 수 있으므로 전체
+            return
+        before, description = self._pending
+        self._pending = None
+        self._recorded += 1
+
+        diff = compute_diff(before, df)
+        self.last_touched = touched_columns(diff)
+        self.last_dropped_rows = diff['dropped_rows'] if diff is not None else None
+        undo_touched = self.last_touched if self.last_dropped_rows is None else None  # 되돌리면 행이 다시 생김
+        periodic = self.checkpoint_interval and self._recorded % self.checkpoint_interval == 0
+        full_size = _nbytes(before)
+        diff_size = _nbytes(diff['changed']) + _nbytes(diff['dropped_rows']) + _nbytes(diff['kept']) \
+            if diff is not None else full_size
+        if periodic or diff is None or diff_size >= full_size * CHECKPOINT_RATIO:
+            entry = _Entry(description, 'checkpoint', before, _signature(df), full_size,
+                           undo_touched)  # 이미 복사된 스냅샷
+        else:
+            entry = _Entry(description, 'diff', diff, _signature(df), diff_size, undo_touched)
+        self._maybe_spill(entry)
+        self._entries.append(entry)
+        while len(self._entries) > self.max_history:
+            self._entries.pop(0).discard()
+
+    def rollback(self):
+        """진행 중인 작업을 취소하고 작업 전 상태 반환"""
+        if self._pending is None:
+            raise HistoryError("진행 중인 작업이 없습니다.")
+        before, _ = self._pending
+        self._pending = None
+        self.last_touched = self.last_dropped_rows = None
+        return before
+
+    def undo(self, df):
+        """
+        마지막 작업 되돌리기
+
+        Returns:
+        --------
+        tuple : (복원된 DataFrame, 작업 설명, 되돌린 히스토리 항목 수)
+            기록이 현재 데이터와 맞지 않아 이전 체크포인트로 복원하면 항목 수가 1보다 큼
+        """
+        if self._pending is not None:
+            self.commit(df)
+        if not self._entries:
+            raise HistoryError("되돌릴 작업이 없습니다.")
+        entry = self._entries.pop()
+        matches = entry.signature == _signature(df)
+        self.last_touched = entry.touched if matches else None
+        self.last_dropped_rows = None
+        try:
+            if entry.kind == 'checkpoint':
+                return entry.load(), entry.description, 1
+            if not matches:
+                return self._undo_to_checkpoint(entry)
+            return apply_diff(df, entry.load()), entry.description, 1
+        finally:
+            entry.discard()
+
+    def _undo_to_checkpoint(self, entry):
+        """현재 데이터가 기록과 맞지 않으면 가장 가까운 이전 체크포인트로 복원"""
+        logger.warning(f"Undo history does not match current data at '{entry.description}', "
+                       f"falling back to the previous checkpoint")
+        popped = 1
+        while self._entries:
+            older = self._entries.pop()
+            popped += 1
+            try:
+                if older.kind == 'checkpoint':
+                    return older.load(), older.description, popped
+            finally:
+                older.discard()
+        raise HistoryError("현재 데이터와 일치하는 히스토리가 없습니다.")
+
+    def clear(self):
+        for entry in self._entries:
+            entry.discard()
+        self._entries.clear()
+        self._pending = None
+
+    def close(self):
+        """디스크 임시 파일 정리 (앱 종료 시)"""
+        self.clear()
+        if self._own_spill_dir and self._spill_dir:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _maybe_spill(self, entry):
+        if not self.spill_to_disk or entry.nbytes < self.spill_threshold:
+            return
+        try:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix='eda_undo_')
+                self._own_spill_dir = True
+            path = os.path.join(self._spill_dir, f"undo_{self._recorded}.pkl")
+            pd.to_pickle(entry.payload, path)
+            entry.payload = _Spilled(path)
+        except Exception as e:
+            logger.warning(f"Failed to spill undo entry to disk, keeping it in memory: {e}")
@@ -0,0 +1,100 @@
+"""
+분석 데이터 백그라운드 계산 서비스
+
+빈도/미출현 기간/번호쌍 분석을 QThreadPool 작업으로 실행하고 결과를 캐시합니다.
+결과는 result_ready(kind, params, result) 시그널로 전달되며, 캐시 갱신과 시그널 발생은 항상 GUI 스레드에서 이루어집니다.
+"""
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+PAIR_CACHE_TOP_N = 50 # 번호쌍은 위젯 최대 표시 개수만큼 한 번 계산해 두고 잘라서 사용
+
+
+class _TaskSignals(QObject):
+    done = pyqtSignal(object, object) # (캐시 키, 결과)
+    failed = pyqtSignal(object, str) # (캐시 키, 오류 메시지)
+
+
+class _AnalysisTask(QRunnable):
+    def __init__(self, key, func):
+        super().__init__()
+        self.key = key
+        self.func = func
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.func()
+        except Exception as e:
+            self._emit('failed', str(e))
+        else:
+            self._emit('done', result)
+
+    def _emit(self, name, payload):
+        try:
+            getattr(self.signals, name).emit(self.key, payload)
+        except RuntimeError: # 앱 종료 중 서비스가 먼저 해제된 경우 결과를 버림
+            pass
+
+
+class AnalysisService(QObject):
+    """
+    kind별 분석 요청을 받아 백그라운드에서 계산합니다.
+    kind: 'frequency' (params: get_window_frequency 구간 인자), 'gaps', 'pairs' (params: pair_size)
+    같은 요청이 이미 계산 중이면 다시 제출하지 않고, 캐시된 결과는 즉시 시그널로 전달합니다.
+    """
+    result_ready = pyqtSignal(str, object, object) # (kind, params, result)
+    error = pyqtSignal(str, str) # (kind, 오류 메시지)
+
+    def __init__(self, data_manager, pool=None, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.pool = pool or QThreadPool.globalInstance()
+        self._cache = {}
+        self._pending = {}
+
+    def _compute(self, kind, params):
+        if kind == 'frequency':
+            return lambda: self.data_manager.get_window_frequency(**params)
+        if kind == 'gaps':
+            return self.data_manager.get_gap_analysis
+        if kind == 'pairs':
+            return lambda: self.data_manager.get_pair_frequencies(params['pair_size'], top_n=PAIR_CACHE_TOP_N)
+        raise ValueError(f"지원하지 않는 분석 종류: {kind}")
+
+    def request(self, kind, **params):
+        key = (kind, tuple(sorted(params.items())))
+        if key in self._cache:
+            self.result_ready.emit(kind, params, self._cache[key])
+            return
+        if key in self._pending:
+            return
+
+        task = _AnalysisTask(key, self._compute(kind, params))
+        task.signals.done.connect(self._on_done)
+        task.signals.failed.connect(self._on_failed)
+        self._pending[key] = task # 시그널 객체가 작업 완료 전에 해제되지 않도록 보관
+        self.pool.start(task)
+
+    def cached(self, kind, **params):
+        """캐시된 결과 (없으면 None)"""
+        return self._cache.get((kind, tuple(sorted(params.items()))))
+
+    def clear_cache(self):
+        """데이터가 바뀌었을 때 호출"""
+        self._cache.clear()
+
+    def wait_for_done(self, msecs=-1):
+        """대기 중인 모든 작업이 끝날 때까지 대기 (종료 시 사용)"""
+        return self.pool.waitForDone(msecs)
+
+    @pyqtSlot(object, object)
+    def _on_done(self, key, result):
+        self._pending.pop(key, None)
+        self._cache[key] = result
+        kind, params = key
+        self.result_ready.emit(kind, dict(params), result)
+
+    @pyqtSlot(object, str)
+    def _on_failed(self, key, message):
+        self._pending.pop(key, None)
+        self.error.emit(key[0], message)
@@ -0,0 +1,158 @@
+"""
+예측 전략 백테스트
+
+과거 회차를 한 회차씩 재생하면서, 각 회차 직전까지의 데이터만으로 전략별 티켓 K장을 생성하고
+해당 회차 결과로 채점하여 등수별 적중률과 부트스트랩 신뢰구간을 계산합니다.
+전략들은 프로세스 풀에서 병렬로 실행됩니다.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from features import build_feature_matrix
+from markov import MarkovModel
+from sampling import gumbel_top_k
+from scoring import tickets_to_onehot, prize_ranks, PRIZE_PROBABILITIES, RANK_LABELS
+
+STRATEGIES = {
+    'random': "독립 시행 (순수 랜덤)",
+    'statistical': "통계 기반 예측",
+    'xgboost': "머신러닝 예측 (XGBoost)",
+    'markov': "마르코프 전이 예측",
+}
+
+
+def _strategy_weights(strategy, main_incidence, bonus_incidence, window_size, retrain_every, backend):
+    """
+    회차별(오래된 순 인덱스 t) 번호 가중치를 계산하는 함수를 반환합니다.
+    반환된 함수 weights_for(t)는 0 ~ t-1 회차 데이터만 사용합니다.
+    """
+    if strategy == 'random':
+        return lambda t: np.ones(45)
+
+    if strategy == 'statistical':
+        # 누적합으로 t 직전까지의 빈도(보너스 포함)를 O(45)에 계산
+        cum = np.zeros((len(main_incidence) + 1, 45), dtype=np.int64)
+        np.cumsum(main_incidence.astype(np.int64) + bonus_incidence, axis=0, out=cum[1:])
+        return lambda t: np.maximum(cum[t], 1).astype(float)
+
+    if strategy == 'xgboost':
+        from predictor import LottoPredictor
+
+        predictor = LottoPredictor(None, window_size=window_size, backend=backend)
+        # features[i]는 (window_size - 1 + i)회차까지의 상태 -> (window_size + i)회차 예측
+        features = build_feature_matrix(main_incidence, window_size)
+        state = {'model': None, 'trained_at': None}
+
+        def weights_for(t):
+            # retrain_every 회차마다 t 직전까지의 데이터로만 재학습 (walk-forward)
+            if state['model'] is None or t - state['trained_at'] >= retrain_every:
+                model = predictor._build_model()
+                predictor._fit(model, features[:t - window_size], main_incidence[window_size:t])
+                state['model'], state['trained_at'] = model, t
+            probs = predictor._positive_proba(state['model'], features[t - window_size:t - window_size + 1])[0]
+            return np.maximum(probs, 0.0001)
+
+        return weights_for
+
+    if strategy == 'markov':
+        # 전이 횟수를 회차마다 직전 두 회차의 외적만큼 증분 갱신 (t 직전까지의 전이만 사용)
+        x = main_incidence.astype(np.float64)
+        state = {'counts': np.zeros((45, 45)), 'upto': 1}
+
+        def weights_for(t):
+            while state['upto'] < t:
+                state['counts'] += np.outer(x[state['upto'] - 1], x[state['upto']])
+                state['upto'] += 1
+            return MarkovModel().fit_counts(state['counts']).score(np.flatnonzero(x[t - 1]) + 1)
+
+        return weights_for
+
+    raise ValueError(f"지원하지 않는 전략: {strategy}")
+
+
+def run_strategy(strategy, main_incidence, bonus_incidence, start, tickets=10, seed=42,
+                 window_size=5, retrain_every=50, backend='native'):
+    """
+    단일 전략 백테스트 (프로세스 풀 작업 단위).
+    반환: 회차별 등수 적중 장수 행렬 (n_draws, 5) - 열 순서 1등 ~ 5등
+    """
+    rng = np.random.default_rng(seed)
+    weights_for = _strategy_weights(strategy, main_incidence, bonus_incidence, window_size, retrain_every, backend)
+
+    n = len(main_incidence)
+    hits = np.zeros((n - start, 5), dtype=np.int32)
+    for row, t in enumerate(range(start, n)):
+        tickets_t = gumbel_top_k(weights_for(t), tickets, rng=rng)
+        _, _, ranks = prize_ranks(tickets_to_onehot(tickets_t), main_incidence[t:t + 1], bonus_incidence[t:t + 1])
+        hits[row] = np.bincount(ranks.ravel(), minlength=6)[1:]
+    return hits
+
+
+def bootstrap_ci(hits, tickets, n_boot=1000, alpha=0.05, seed=0):
+    """
+    회차 단위 부트스트랩으로 등수별 적중률(티켓당)의 신뢰구간을 계산합니다.
+    반환: (rate, lower, upper) 각각 shape (5,)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(hits)
+    rate = hits.sum(axis=0) / (n * tickets)
+    idx = rng.integers(0, n, size=(n_boot, n))
+    boot_rates = hits[idx].sum(axis=1) / (n * tickets) # (n_boot, 5)
+    lower, upper = np.percentile(boot_rates, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    return rate, lower, upper
+
+
+def run_backtest(data_manager, strategies=tuple(STRATEGIES), tickets=10, start=None, window_size=5,
+                 retrain_every=50, backend='native', n_boot=1000, max_workers=None, seed=42):
+    """
+    전체 회차 백테스트.
+    start: 채점을 시작할 회차 인덱스 (오래된 순). 기본값은 전체의 1/3 지점 (그 전은 학습용 이력)
+    반환: {strategy: {'draws', 'tickets', 'tiers': [{'rank', 'label', 'hits', 'rate', 'lower', 'upper', 'expected'}]}}
+    """
+    main_incidence = data_manager.main_incidence
+    bonus_incidence = data_manager.bonus_incidence
+    n = len(main_incidence)
+    if start is None:
+        start = n // 3
+    start = max(start, window_size + 1)
+    if start >= n:
+        return {}
+
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(strategies), os.cpu_count() or 1)) as pool:
+        futures = {
+            strategy: pool.submit(run_strategy, strategy, main_incidence, bonus_incidence, start, tickets,
+                                  seed + i, window_size, retrain_every, backend)
+            for i, strategy in enumerate(strategies)
+        }
+        all_hits = {strategy: future.result() for strategy, future in futures.items()}
+
+    results = {}
+    for strategy, hits in all_hits.items():
+        rate, lower, upper = bootstrap_ci(hits, tickets, n_boot)
+        results[strategy] = {
+            'draws': len(hits),
+            'tickets': tickets,
+            'tiers': [
+                {'rank': rank, 'label': RANK_LABELS[rank], 'hits': int(hits[:, rank - 1].sum()),
+                 'rate': float(rate[rank - 1]), 'lower': float(lower[rank - 1]), 'upper': float(upper[rank - 1]),
+                 'expected': PRIZE_PROBABILITIES[rank]}
+                for rank in range(1, 6)
+            ],
+        }
+    return results
+
+
+if __name__ == '__main__':
+    # 사용법: python backtest.py [티켓 수]
+    import sys
+    from lotto_core import LottoCore
+
+    csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '로또.csv')
+    n_tickets = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for strategy, result in run_backtest(LottoCore(csv_path), tickets=n_tickets).items():
+        print(f"[{STRATEGIES[strategy]}] {result['draws']}회 x {result['tickets']}장")
+        for tier in result['tiers']:
+            print(f"  {tier['label']}: {tier['hits']:6d}회  적중률 {tier['rate']:.6f} "
+                  f"(95% CI {tier['lower']:.6f} ~ {tier['upper']:.6f}, 무작위 기대값 {tier['expected']:.6f})")
@@ -0,0 +1,218 @@
+"""
+로또 분석/예측 성능 벤치마크 (asv 스타일)
+
+합성 당첨 이력(기본 1천 / 1만 / 10만 회차)을 CSV로 만들어 Qt 비의존 LottoCore로 불러오므로
+디스플레이나 QMessageBox 없이 실행됩니다. 스위트 클래스의 setup(n_draws) 후 time_* 메서드를 반복 측정합니다.
+
+사용법:
+    python benchmarks.py                                  # 전체 실행
+    python benchmarks.py --sizes 1000 10000 -k gap        # 크기/이름 필터
+    python benchmarks.py --save base.json                 # 결과 저장
+    python benchmarks.py --compare base.json              # 저장된 결과 대비 느려진 항목이 있으면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from lotto_core import LottoCore
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# XGBoost 학습은 회차 수에 비례해 오래 걸리므로 기본값은 1만 회차까지만 측정
+MAX_PREDICTOR_DRAWS = 10_000
+
+
+def make_synthetic_csv(path, n_draws, seed=0):
+    """
+    실제 로또.csv와 같은 형식(회차, 날짜, 1~6, 보너스)의 합성 이력을 생성합니다.
+    번호는 Gumbel-top-k로 회차마다 서로 다른 7개를 한 번에 뽑고, 날짜는 하루 간격으로 배치합니다
+    (10만 회차도 pandas Timestamp 범위 안에 들어가도록).
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.argpartition(rng.gumbel(size=(n_draws, 45)), 7, axis=1)[:, :7] + 1
+    main = np.sort(numbers[:, :6], axis=1)
+    dates = pd.date_range(end='2025-12-27', periods=n_draws, freq='D')
+    df = pd.DataFrame({
+        '회차': np.arange(n_draws, 0, -1),
+        '날짜': dates[::-1].strftime('%Y-%m-%d'),
+        **{str(i + 1): main[::-1, i] for i in range(6)},
+        '보너스': numbers[::-1, 6],
+    })
+    df.to_csv(path, index=False)
+    return path
+
+
+class HeadlessHistory:
+    """
+    벤치마크용 헤드리스 데이터 준비 (fixture).
+    합성 CSV를 임시 폴더에 만들고 LottoCore로 불러옵니다. 오류는 메시지 창 대신 예외로 전달됩니다.
+    """
+
+    def __init__(self, n_draws, seed=0):
+        self.tmp_dir = tempfile.mkdtemp(prefix='lotto_bench_')
+        self.csv_path = make_synthetic_csv(os.path.join(self.tmp_dir, 'lotto.csv'), n_draws, seed)
+        self.core = LottoCore(self.csv_path)
+
+    def close(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+# --- 벤치마크 스위트 ---
+class DataManagerSuite:
+    """CSV 로드 / 빈도 / 미출현 기간 / 번호쌍 / 당첨 확인"""
+    max_draws = None
+
+    def setup(self, n_draws):
+        self.history = HeadlessHistory(n_draws)
+        self.core = self.history.core
+        rng = np.random.default_rng(1)
+        self.tickets = (np.argpartition(rng.random((100, 45)), 6, axis=1)[:, :6] + 1).tolist()
+
+    def teardown(self):
+        self.history.close()
+
+    def time_csv_load(self):
+        LottoCore(self.history.csv_path)
+
+    def time_frequency(self):
+        self.core.get_number_frequency()
+
+    def time_window_frequency(self):
+        self.core.get_window_frequency(last_n=100)
+
+    def time_gap_analysis(self):
+        self.core.get_gap_analysis()
+
+    def time_pair_frequencies(self):
+        self.core.get_pair_frequencies(pair_size=2)
+
+    def time_triple_frequencies(self):
+        self.core.get_pair_frequencies(pair_size=3)
+
+    def time_check_winnings(self):
+        self.core.check_winnings(self.tickets[0])
+
+    def time_check_winnings_batch_100(self):
+        self.core.check_winnings_batch(self.tickets)
+
+    def time_generate_batch_1000(self):
+        self.core.generate_batch(1000, 'statistical')
+
+
+class PredictorTrainSuite:
+    """XGBoost 전체 학습 - 앱 기본 backend (모델 캐시는 임시 폴더 사용, 디스크 저장은 별도 측정)"""
+    max_draws = MAX_PREDICTOR_DRAWS
+    repeat = 1 # 학습은 한 번만 측정
+
+    def setup(self, n_draws):
+        from predictor import LottoPredictor
+
+        self.history = HeadlessHistory(n_draws)
+        self.predictor = LottoPredictor(self.history.core, cache_dir=os.path.join(self.history.tmp_dir, 'models'))
+
+    def teardown(self):
+        self.history.close()
+
+    def time_train(self):
+        # train()과 같은 학습 과정에서 save_model(joblib 저장)만 제외
+        X, y = self.predictor.prepare_data()
+        self.predictor._fit(self.predictor._build_model(), X, y)
+
+
+class PredictorPredictSuite(PredictorTrainSuite):
+    """학습된 모델로 번호 생성 / 모델 캐시 저장 (학습은 setup에서 수행되어 측정에서 제외)"""
+    repeat = None # 기본 반복 횟수 사용
+
+    def setup(self, n_draws):
+        super().setup(n_draws)
+        self.predictor.train()
+
+    time_train = None
+
+    def time_predict_batch_1000(self):
+        self.predictor.predict_batch(1000)
+
+    def time_save_model(self):
+        self.predictor.save_model()
+
+
+SUITES = (DataManagerSuite, PredictorTrainSuite, PredictorPredictSuite)
+
+
+# --- 실행기 ---
+def run(sizes=DEFAULT_SIZES, repeat=5, name_filter=None, max_predictor_draws=MAX_PREDICTOR_DRAWS):
+    """
+    반환: {"스위트.메서드[n]": {'min', 'median', 'repeat'}} (초 단위)
+    """
+    results = {}
+    for suite_cls in SUITES:
+        methods = [name for name in dir(suite_cls) if name.startswith('time_') and getattr(suite_cls, name)]
+        if name_filter:
+            methods = [name for name in methods if name_filter in f"{suite_cls.__name__}.{name}"]
+        if not methods:
+            continue
+        limit = max_predictor_draws if suite_cls.max_draws is not None else None
+        for n_draws in sizes:
+            if limit is not None and n_draws > limit:
+                continue
+            suite = suite_cls()
+            suite.setup(n_draws)
+            try:
+                for name in methods:
+                    times = []
+                    for _ in range(getattr(suite_cls, 'repeat', None) or repeat):
+                        start = time.perf_counter()
+                        getattr(suite, name)()
+                        times.append(time.perf_counter() - start)
+                    key = f"{suite_cls.__name__}.{name}[{n_draws}]"
+                    results[key] = {'min': min(times), 'median': float(np.median(times)), 'repeat': len(times)}
+                    print(f"{key:<58} min {min(times) * 1000:10.2f}ms   median {np.median(times) * 1000:10.2f}ms",
+                          flush=True)
+            finally:
+                suite.teardown()
+    return results
+
+
+def compare(results, baseline, threshold=1.2):
+    """기준 결과 대비 min 시간이 threshold배 넘게 느려진 항목 목록 [(이름, 기준, 현재)]"""
+    regressions = []
+    for key, stats in results.items():
+        if key in baseline and stats['min'] > baseline[key]['min'] * threshold:
+            regressions.append((key, baseline[key]['min'], stats['min']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로또 분석/예측 성능 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="합성 이력 회차 수")
+    parser.add_argument('--repeat', type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument('-k', dest='name_filter', help="이름에 포함된 문자열로 벤치마크 선택")
+    parser.add_argument('--max-predictor-draws', type=int, default=MAX_PREDICTOR_DRAWS,
+                        help="예측기 벤치마크를 실행할 최대 회차 수")
+    parser.add_argument('--save', help="결과를 저장할 JSON 경로")
+    parser.add_argument('--compare', help="비교할 기준 결과 JSON 경로")
+    parser.add_argument('--threshold', type=float, default=1.2, help="회귀로 판단할 배수 (기본 1.2배)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.name_filter, args.max_predictor_draws)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for key, before, after in regressions:
+            print(f"[회귀] {key}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms ({after / before:.2f}배)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+C(45, 6) = 8,145,060개 전체 조합 인덱스
+
+조합은 사전순으로 정렬되어 있으며, 행 번호가 곧 조합의 순위(rank)입니다.
+번호 배열 / 45비트 마스크 / 필터용 파생 컬럼(합계, 홀수 개수, 최장 연속 길이, 저번호 개수)을
+.npy 파일로 한 번 만들어 두고 메모리 맵으로 열기 때문에, 파이썬 객체로 올리지 않고 벡터 연산만으로 필터링합니다.
+"""
+import os
+from math import comb
+
+import numpy as np
+
+from probability import combinations_array
+
+INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'combo_index')
+TOTAL = comb(45, 6)
+LOW_MAX = 22 # 저번호 기준 (1~22 저, 23~45 고)
+
+# 파생 컬럼 이름 -> dtype
+_COLUMNS = {
+    'numbers': np.uint8, # (N, 6) 1-based 번호
+    'masks': np.uint64, # 번호 n -> 비트 (n - 1)
+    'sums': np.uint16,
+    'odd': np.uint8,
+    'max_run': np.uint8,
+    'low': np.uint8,
+}
+
+# 사전순 순위 계산용 이항계수 표 _BINOM[n, k] = C(n, k)
+_BINOM = np.array([[comb(n, k) for k in range(7)] for n in range(46)], dtype=np.int64)
+
+
+def numbers_to_masks(numbers):
+    """(M, 6) 1-based 번호 배열 -> 45비트 마스크 (M,)"""
+    numbers = np.asarray(numbers, dtype=np.uint64).reshape(-1, 6)
+    return np.bitwise_or.reduce(np.uint64(1) << (numbers - np.uint64(1)), axis=1)
+
+
+def rank_of(numbers):
+    """
+    조합의 사전순 순위 (0 ~ TOTAL-1). numbers: (M, 6) 또는 (6,) 1-based 번호
+    lex 순위 = TOTAL - 1 - sum(C(44 - c_i, 6 - i))  (c_i: 정렬된 0-based 번호)
+    """
+    c = np.sort(np.asarray(numbers, dtype=np.int64).reshape(-1, 6), axis=1) - 1
+    return TOTAL - 1 - _BINOM[44 - c, 6 - np.arange(6)].sum(axis=1)
+
+
+def _build(index_dir):
+    """인덱스 파일 생성 (최초 1회, 수 초 소요)"""
+    os.makedirs(index_dir, exist_ok=True)
+    numbers = combinations_array(45, 6).astype(np.uint8) + 1
+    columns = {
+        'numbers': numbers,
+        'masks': numbers_to_masks(numbers),
+        'sums': numbers.sum(axis=1, dtype=np.uint16),
+        'odd': (numbers % 2).sum(axis=1, dtype=np.uint8),
+        'low': (numbers <= LOW_MAX).sum(axis=1, dtype=np.uint8),
+    }
+    # 최장 연속 번호 길이: 인접 차이가 1인 구간의 최대 길이 + 1
+    consecutive = np.diff(numbers.astype(np.int8), axis=1) == 1
+    run = np.zeros(len(numbers), dtype=np.uint8)
+    max_run = np.zeros(len(numbers), dtype=np.uint8)
+    for j in range(5):
+        run = np.where(consecutive[:, j], run + 1, 0).astype(np.uint8)
+        np.maximum(max_run, run, out=max_run)
+    columns['max_run'] = max_run + 1
+
+    for name, values in columns.items():
+        np.save(os.path.join(index_dir, f'{name}.npy'), values.astype(_COLUMNS[name], copy=False))
+
+
+class ComboIndex:
+    """전체 조합 인덱스. 컬럼은 필요할 때 메모리 맵으로 열립니다."""
+
+    def __init__(self, index_dir=INDEX_DIR, data_manager=None):
+        self.index_dir = index_dir
+        self._columns = {}
+        self._won = None
+        if not all(os.path.exists(self._path(name)) for name in _COLUMNS):
+            _build(index_dir)
+        if data_manager is not None:
+            self.set_history(data_manager)
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, f'{name}.npy')
+
+    def column(self, name):
+        if name not in self._columns:
+            values = np.load(self._path(name), mmap_mode='r')
+            if len(values) != TOTAL: # 손상된 파일이면 다시 생성
+                _build(self.index_dir)
+                values = np.load(self._path(name), mmap_mode='r')
+            self._columns[name] = values
+        return self._columns[name]
+
+    def __len__(self):
+        return TOTAL
+
+    # --- 당첨 이력 ---
+    def set_history(self, data_manager):
+        """역대 1등 조합 표시 (rank 기준 bool 배열)"""
+        draws = data_manager.df[[f'num{i}' for i in range(1, 7)]].dropna().to_numpy(dtype=int)
+        self._won = np.zeros(TOTAL, dtype=bool)
+        self._won[rank_of(draws)] = True
+
+    def ever_won(self, numbers):
+        """해당 조합이 1등 당첨 번호로 나온 적이 있는지"""
+        if self._won is None:
+            raise ValueError("당첨 이력이 설정되지 않았습니다. set_history()를 먼저 호출하세요.")
+        return bool(self._won[rank_of(numbers)].any())
+
+    # --- 필터 ---
+    def filter_mask(self, sum_range=None, odd_count=None, low_count=None, max_consecutive=None,
+                    exclude_numbers=None, include_numbers=None, exclude_past_winners=False):
+        """
+        조건을 모두 만족하는 조합의 bool 마스크 (길이 TOTAL)
+        sum_range: (최소, 최대) 합계 (양 끝 포함)
+        odd_count / low_count: 정수 또는 허용 개수 목록 (예: [2, 3, 4])
+        max_consecutive: 허용할 최장 연속 번호 길이 (예: 2 -> 3연속 이상 제외)
+        """
+        mask = np.ones(TOTAL, dtype=bool)
+        if sum_range is not None:
+            sums = self.column('sums')
+            mask &= (sums >= sum_range[0]) & (sums <= sum_range[1])
+        if odd_count is not None:
+            mask &= np.isin(self.column('odd'), np.atleast_1d(odd_count))
+        if low_count is not None:
+            mask &= np.isin(self.column('low'), np.atleast_1d(low_count))
+        if max_consecutive is not None:
+            mask &= self.column('max_run') <= max_consecutive
+        if exclude_numbers:
+            exclude_mask = np.uint64(sum(1 << (n - 1) for n in set(exclude_numbers)))
+            mask &= (self.column('masks') & exclude_mask) == 0
+        if include_numbers:
+            include_mask = np.uint64(sum(1 << (n - 1) for n in set(include_numbers)))
+            mask &= (self.column('masks') & include_mask) == include_mask
+        if exclude_past_winners and self._won is not None:
+            mask &= ~self._won
+        return mask
+
+    def filter(self, **conditions):
+        """조건을 만족하는 조합의 rank 배열"""
+        return np.flatnonzero(self.filter_mask(**conditions))
+
+    def count(self, **conditions):
+        return int(np.count_nonzero(self.filter_mask(**conditions)))
+
+    def numbers(self, ranks):
+        """rank 배열 -> (M, 6) 번호 배열"""
+        return np.asarray(self.column('numbers')[np.asarray(ranks)])
+
+    def sample(self, n, rng=None, **conditions):
+        """조건을 만족하는 조합 중 n개를 균등 비복원 추출 -> (n, 6) 번호 배열"""
+        rng = rng or np.random.default_rng()
+        ranks = self.filter(**conditions)
+        if len(ranks) == 0:
+            return np.zeros((0, 6), dtype=np.uint8)
+        chosen = rng.choice(ranks, size=min(n, len(ranks)), replace=False)
+        return self.numbers(np.sort(chosen))
@@ -0,0 +1,150 @@
+"""
+회차 조회 인덱스
+
+- 회차 번호 -> 배열 위치 (직접 주소 배열, O(1))
+- 정렬된 날짜 배열 + searchsorted (O(log n))
+- 번호별 출현 회차 목록(posting list, 정렬된 위치 배열)
+
+조회 결과는 DrawQuery로 표현되며 &(AND), |(OR)로 조합할 수 있습니다.
+연속 구간(날짜/회차 범위)은 [lo, hi) 범위 그대로 유지하다가 목록과 만날 때 searchsorted로 잘라내므로
+각 조회 비용은 O(log n + 결과 수)입니다. 위치는 모두 오래된 순(chrono) 인덱스입니다.
+"""
+import numpy as np
+
+from scoring import prize_ranks, tickets_to_onehot
+
+
+class DrawQuery:
+    """조회 결과 집합. rows가 None이면 [lo, hi) 연속 구간, 아니면 정렬된 위치 배열"""
+
+    def __init__(self, index, lo=0, hi=0, rows=None):
+        self.index = index
+        self.lo, self.hi = lo, hi
+        self.rows = rows
+
+    def positions(self):
+        """결과 위치 배열 (오래된 순)"""
+        if self.rows is None:
+            return np.arange(self.lo, self.hi)
+        return self.rows
+
+    def __len__(self):
+        return self.hi - self.lo if self.rows is None else len(self.rows)
+
+    def __and__(self, other):
+        if self.rows is None and other.rows is None:
+            lo, hi = max(self.lo, other.lo), min(self.hi, other.hi)
+            return DrawQuery(self.index, lo, max(lo, hi))
+        if self.rows is None or other.rows is None:
+            span, listed = (self, other) if self.rows is None else (other, self)
+            rows = listed.rows
+            return DrawQuery(self.index, rows=rows[np.searchsorted(rows, span.lo):np.searchsorted(rows, span.hi)])
+        return DrawQuery(self.index, rows=np.intersect1d(self.rows, other.rows, assume_unique=True))
+
+    def __or__(self, other):
+        if self.rows is None and other.rows is None and self.lo <= other.hi and other.lo <= self.hi:
+            return DrawQuery(self.index, min(self.lo, other.lo), max(self.hi, other.hi))
+        return DrawQuery(self.index, rows=np.union1d(self.positions(), other.positions()))
+
+    def records(self):
+        """결과 회차 목록 (최신 회차부터, get_draw_by_no와 같은 dict 형식)"""
+        return self.index.records(self.positions())
+
+
+class DrawIndex:
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.n = len(data_manager.chrono_draw_nos)
+
+        draw_nos = data_manager.chrono_draw_nos.astype(np.int64)
+        self.draw_offset = np.full(int(draw_nos.max(initial=0)) + 1, -1, dtype=np.int64)
+        self.draw_offset[draw_nos] = np.arange(self.n)
+
+        # 번호별 출현 위치 목록 (본번호 / 보너스)
+        self.main_postings = [np.flatnonzero(data_manager.main_incidence[:, j]) for j in range(45)]
+        self.bonus_postings = [np.flatnonzero(data_manager.bonus_incidence[:, j]) for j in range(45)]
+
+    # --- 기본 조회 ---
+    def all(self):
+        return DrawQuery(self, 0, self.n)
+
+    def none(self):
+        return DrawQuery(self, 0, 0)
+
+    def draw_no(self, draw_no):
+        if not 0 <= draw_no < len(self.draw_offset) or self.draw_offset[draw_no] < 0:
+            return self.none()
+        pos = int(self.draw_offset[draw_no])
+        return DrawQuery(self, pos, pos + 1)
+
+    def draw_range(self, first, last):
+        """회차 번호 범위 (양 끝 포함). 회차 번호는 오래된 순으로 증가하므로 searchsorted로 경계를 찾음"""
+        draw_nos = self.data_manager.chrono_draw_nos
+        lo = int(np.searchsorted(draw_nos, first, side='left'))
+        hi = int(np.searchsorted(draw_nos, last, side='right'))
+        return DrawQuery(self, lo, max(lo, hi))
+
+    def date_range(self, start_date=None, end_date=None):
+        """날짜 범위 (양 끝 포함, QDate/문자열/datetime)"""
+        lo, hi = self.data_manager.get_window_bounds(start_date=start_date, end_date=end_date)
+        return DrawQuery(self, lo, hi)
+
+    def number(self, num, include_bonus=False):
+        """번호 num이 나온 회차 (num이 1~45 밖이면 ValueError)"""
+        if isinstance(num, bool) or not isinstance(num, (int, np.integer)) or not 1 <= num <= len(self.main_postings):
+            raise ValueError(f"조회할 번호는 1~{len(self.main_postings)} 사이의 정수여야 합니다: {num!r}")
+        rows = self.main_postings[num - 1]
+        if include_bonus:
+            rows = np.union1d(rows, self.bonus_postings[num - 1])
+        return DrawQuery(self, rows=rows)
+
+    # --- 조합 조회 ---
+    def numbers_all(self, numbers, include_bonus=False):
+        """모든 번호가 포함된 회차 (짧은 목록부터 교집합)"""
+        queries = sorted((self.number(num, include_bonus) for num in set(numbers)), key=len)
+        if not queries:
+            return self.all()
+        result = queries[0]
+        for query in queries[1:]:
+            if not len(result):
+                break
+            result = result & query
+        return result
+
+    def numbers_any(self, numbers, include_bonus=False):
+        """하나라도 포함된 회차"""
+        postings = [self.number(num, include_bonus).rows for num in set(numbers)]
+        if not postings:
+            return self.none()
+        return DrawQuery(self, rows=np.unique(np.concatenate(postings)))
+
+    def min_matches(self, numbers, k, include_bonus=False):
+        """번호 중 k개 이상 포함된 회차 (목록 길이 합에 비례)"""
+        postings = [self.number(num, include_bonus).rows for num in set(numbers)]
+        if not postings:
+            return self.none()
+        rows, counts = np.unique(np.concatenate(postings), return_counts=True)
+        return DrawQuery(self, rows=rows[counts >= k])
+
+    def rank_pattern(self, ticket, ranks=(1, 2, 3, 4, 5)):
+        """
+        티켓(6개 번호)이 지정한 등수 중 하나로 당첨됐을 회차.
+        3개 이상 일치한 후보 회차만 골라 채점하므로 전체 회차를 훑지 않습니다.
+        """
+        candidates = self.min_matches(ticket, 3).rows
+        if not len(candidates):
+            return self.none()
+        _, _, result = prize_ranks(
+            tickets_to_onehot([ticket]),
+            self.data_manager.main_incidence[candidates],
+            self.data_manager.bonus_incidence[candidates],
+        )
+        return DrawQuery(self, rows=candidates[np.isin(result[0], list(ranks))])
+
+    # --- 결과 변환 ---
+    def records(self, positions):
+        """오래된 순 위치 배열 -> 최신 회차부터 정렬된 dict 목록 (df는 최신순이므로 위치를 뒤집어 접근)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return []
+        return self.data_manager.df.iloc[self.n - 1 - positions[::-1]].to_dict('records')
@@ -0,0 +1,70 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 이동 빈도 계산에 사용할 기본 구간 (최근 N회)
+DEFAULT_FREQ_WINDOWS = (10, 30, 100)
+
+
+def compute_gaps(incidence):
+    """
+    각 회차 시점에서 번호별로 마지막 출현 이후 경과한 회차 수를 계산합니다.
+    incidence: (n, 45) 오래된 순 출현 행렬
+    반환: (n, 45) 배열. 해당 회차에 나온 번호는 0, 한 번도 안 나온 번호는 (회차 인덱스 + 1)
+    """
+    n = incidence.shape[0]
+    idx = np.arange(n)[:, None]
+    last_seen = np.where(incidence > 0, idx, -1)
+    np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+    return idx - last_seen
+
+
+def build_feature_matrix(incidence, window_size=5, freq_windows=DEFAULT_FREQ_WINDOWS):
+    """
+    회차별 '상태' 특성 행렬을 반복문 없이 생성합니다.
+    i번째 행은 0 ~ (window_size - 1 + i)회차(오래된 순 인덱스)까지의 정보만으로 만든 특성이며,
+    바로 다음 회차를 예측하는 데 사용됩니다.
+
+    특성 구성 (모두 float32):
+      - 최근 window_size 회차의 원-핫 출현 이력 (window_size * 45)
+      - 번호별 미출현 기간 (45)
+      - 번호별 최근 N회 이동 출현율 (len(freq_windows) * 45)
+
+    반환: shape (n - window_size + 1, F) 배열. 데이터가 부족하면 None
+    """
+    n = incidence.shape[0]
+    if n < window_size:
+        return None
+
+    inc = incidence.astype(np.float32, copy=False)
+
+    # (n - w + 1, 45, w) -> (n - w + 1, w, 45) -> 평탄화 (오래된 회차가 앞쪽)
+    history = sliding_window_view(inc, window_size, axis=0).transpose(0, 2, 1).reshape(n - window_size + 1, -1)
+
+    gaps = compute_gaps(incidence)[window_size - 1:].astype(np.float32)
+
+    # 누적합 차이로 이동 출현율 계산 (구간 시작 전 회차는 0으로 취급)
+    cum = np.zeros((n + 1, 45), dtype=np.float32)
+    np.cumsum(inc, axis=0, out=cum[1:])
+    ends = np.arange(window_size, n + 1)
+    rolling = [(cum[ends] - cum[np.maximum(ends - r, 0)]) / r for r in freq_windows]
+
+    return np.hstack([history, gaps] + rolling)
+
+
+def build_training_set(incidence, window_size=5, freq_windows=DEFAULT_FREQ_WINDOWS):
+    """
+    학습용 (X, y)와 최신 상태 특성(다음 회차 예측 입력)을 함께 반환합니다.
+    반환: (X, y, latest) 또는 데이터가 부족하면 (None, None, None)
+    """
+    if incidence.shape[0] < window_size + 1:
+        return None, None, None
+    features = build_feature_matrix(incidence, window_size, freq_windows)
+    X = features[:-1]
+    y = incidence[window_size:].astype(np.int8)
+    return X, y, features[-1:]
+
+
+def per_number_log_loss(y_true, probs, eps=1e-7):
+    """번호별(열별) 이진 log-loss. 반환: shape (45,)"""
+    p = np.clip(probs, eps, 1 - eps)
+    return -(y_true * np.log(p) + (1 - y_true) * np.log(1 - p)).mean(axis=0)
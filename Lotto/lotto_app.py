@@ -6,6 +6,7 @@ from PyQt6.QtCore import Qt
 
 # 모듈 임포트
 from data_manager import LottoDataManager
+from analysis_service import AnalysisService
 from styles import apply_styles
 from widgets.prediction import PredictionWidget
 from widgets.lookup import LookupWidget
@@ -22,6 +23,8 @@ class MainWindow(QMainWindow):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         csv_path = os.path.join(script_dir, '로또.csv')
         self.data_manager = LottoDataManager(csv_path)
+        # 분석 결과 캐시는 위젯 간에 공유
+        self.analysis_service = AnalysisService(self.data_manager, parent=self)
         self.init_ui()
         self.status_bar.showMessage("로또 데이터 로드 완료.")
 
@@ -42,7 +45,7 @@ class MainWindow(QMainWindow):
         # 각 위젯 인스턴스 생성
         self.prediction_widget = PredictionWidget(self.data_manager)
         self.lookup_widget = LookupWidget(self.data_manager)
-        self.analysis_widget = AnalysisWidget(self.data_manager)
+        self.analysis_widget = AnalysisWidget(self.data_manager, self.analysis_service)
         # MyNumbersWidget에 PredictionWidget의 시그널 전달
         self.my_numbers_widget = MyNumbersWidget(self.data_manager, self.prediction_widget.load_numbers_to_prediction)
 
@@ -55,6 +58,11 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
 
+    def closeEvent(self, event):
+        # 실행 중인 분석 작업이 끝난 뒤 종료 (해제된 위젯으로 결과가 전달되지 않도록)
+        self.analysis_service.wait_for_done()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
     # 한글 인코딩 문제 해결 (Windows 환경에서 console 출력시)
     # Qt.HighDpiScaleFactorRoundingPolicy.PassThrough is often good for ensuring crisp text on High DPI
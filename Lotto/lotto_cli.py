@@ -0,0 +1,238 @@
+"""
+로또 분석/생성 CLI 및 로컬 HTTP JSON 서비스 (디스플레이 불필요)
+
+사용법:
+    python lotto_cli.py frequencies [--last-n 50 | --year 2024 | --start 2024-01-01 --end 2024-06-30] [--no-bonus]
+    python lotto_cli.py gaps
+    python lotto_cli.py check 1,2,3,4,5,6 7,8,9,10,11,12
+    python lotto_cli.py generate --sets 5 --method statistical --last-n 100 --exclude 44,45
+    python lotto_cli.py serve --port 8765
+
+HTTP 엔드포인트 (serve):
+    GET  /frequencies?last_n=50&year=&start_date=&end_date=&include_bonus=1
+    GET  /gaps
+    POST /check-winnings-batch   {"tickets": [[1, 2, 3, 4, 5, 6], ...]}
+    POST /generate-batch         {"num_sets": 5, "method": "statistical", "window": {"last_n": 100},
+                                  "exclude_numbers": [], "include_numbers": [], "constraints": {...}, "markov_steps": 1}
+데이터는 프로세스 시작 시 한 번만 로드하며, 요청은 스레드별로 동시에 처리됩니다.
+"""
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from lotto_core import LottoCore, LottoDataError
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '로또.csv')
+WINDOW_KEYS = ('last_n', 'start_date', 'end_date', 'year')
+GENERATION_METHODS = ('random', 'statistical', 'markov')
+
+
+def _to_json(value):
+    """NumPy/pandas 값을 JSON 직렬화 가능한 값으로 변환"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"JSON으로 변환할 수 없는 값: {value!r}")
+
+
+def dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, default=_to_json)
+
+
+def _parse_numbers(text):
+    return [int(n) for n in text.split(',') if n.strip()] if text else []
+
+
+# --- 요청 처리 (CLI / HTTP 공통) ---
+def frequencies(core, window=None, include_bonus=True):
+    return core.get_window_frequency(include_bonus=include_bonus, **(window or {}))
+
+
+def gaps(core):
+    return core.get_gap_analysis()
+
+
+def check_winnings_batch(core, tickets):
+    return core.check_winnings_batch(tickets)
+
+
+def generate_batch(core, num_sets=5, method='random', window=None, exclude_numbers=None, include_numbers=None,
+                   constraints=None, markov_steps=1):
+    if method not in GENERATION_METHODS:
+        raise ValueError(f"지원하지 않는 생성 방식: {method}")
+    if constraints and not isinstance(constraints, dict):
+        raise ValueError(f"constraints는 JSON 객체여야 합니다: {constraints!r}")
+    if constraints:
+        # JSON 배열 -> 튜플 (범위 조건)
+        constraints = {key: tuple(value) if isinstance(value, list) else value for key, value in constraints.items()}
+    return core.generate_batch(num_sets, method, exclude_numbers=exclude_numbers, include_numbers=include_numbers,
+                               window=window, constraints=constraints, markov_steps=int(markov_steps))
+
+
+# --- HTTP 서비스 ---
+def _window_from_query(query):
+    """쿼리 문자열의 기간 조건 (last_n, year는 정수, 변환 실패 시 ValueError)"""
+    window = {key: query[key] for key in WINDOW_KEYS if query.get(key)}
+    for key in ('last_n', 'year'):
+        if key in window:
+            try:
+                window[key] = int(window[key])
+            except ValueError:
+                raise ValueError(f"{key}는 정수여야 합니다: {window[key]!r}") from None
+    return window
+
+
+class LottoRequestHandler(BaseHTTPRequestHandler):
+    core = None # serve()에서 설정
+
+    def _send(self, status, payload):
+        body = dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, func):
+        try:
+            self._send(200, func())
+        except (ValueError, TypeError, KeyError) as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': str(e)})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == '/frequencies':
+            include_bonus = query.get('include_bonus', '1') not in ('0', 'false')
+            self._handle(lambda: frequencies(self.core, _window_from_query(query), include_bonus))
+        elif url.path == '/gaps':
+            self._handle(lambda: gaps(self.core))
+        else:
+            self._send(404, {'error': f"알 수 없는 경로: {url.path}"})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {'error': f"잘못된 JSON 요청: {e}"})
+            return
+
+        if path == '/check-winnings-batch':
+            self._handle(lambda: check_winnings_batch(self.core, body['tickets']))
+        elif path == '/generate-batch':
+            params = {key: body[key] for key in ('num_sets', 'method', 'window', 'exclude_numbers',
+                                                 'include_numbers', 'constraints', 'markov_steps') if key in body}
+            self._handle(lambda: generate_batch(self.core, **params))
+        else:
+            self._send(404, {'error': f"알 수 없는 경로: {path}"})
+
+    def log_message(self, format, *args):
+        pass # 높은 요청 빈도에서 stderr 로그 비용을 줄이기 위해 생략
+
+
+def serve(core, host='127.0.0.1', port=8765):
+    handler = type('BoundLottoRequestHandler', (LottoRequestHandler,), {'core': core})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Lotto JSON service listening on http://{host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# --- CLI ---
+def _window_from_args(args):
+    window = {
+        'last_n': args.last_n,
+        'year': args.year,
+        'start_date': args.start,
+        'end_date': args.end,
+    }
+    return {key: value for key, value in window.items() if value is not None}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="로또 분석/생성 CLI (JSON 출력)")
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="로또 데이터 CSV 경로")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_window_args(p):
+        p.add_argument('--last-n', type=int, help="최근 N회")
+        p.add_argument('--year', type=int, help="특정 연도")
+        p.add_argument('--start', help="시작 날짜 (YYYY-MM-DD)")
+        p.add_argument('--end', help="종료 날짜 (YYYY-MM-DD)")
+
+    p = sub.add_parser('frequencies', help="번호별 출현 빈도")
+    add_window_args(p)
+    p.add_argument('--no-bonus', action='store_true', help="보너스 번호 제외")
+
+    sub.add_parser('gaps', help="번호별 미출현 기간")
+
+    p = sub.add_parser('check', help="티켓 일괄 당첨 확인")
+    p.add_argument('tickets', nargs='+', help="쉼표로 구분된 6개 번호 (여러 장 가능)")
+
+    p = sub.add_parser('generate', help="번호 일괄 생성")
+    p.add_argument('--sets', type=int, default=5, help="생성할 세트 수")
+    p.add_argument('--method', choices=GENERATION_METHODS, default='random')
+    p.add_argument('--steps', type=int, default=1, help="markov 방식의 전이 단계 수")
+    p.add_argument('--exclude', help="제외할 번호 (쉼표로 구분)")
+    p.add_argument('--include', help="포함할 번호 (쉼표로 구분)")
+    p.add_argument('--constraints', help="패턴 필터 조건 JSON (예: '{\"sum_range\": [100, 170]}')")
+    add_window_args(p)
+
+    p = sub.add_parser('serve', help="로컬 HTTP JSON 서비스 실행")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        core = LottoCore(args.csv)
+    except (FileNotFoundError, LottoDataError) as e:
+        print(dumps({'error': str(e)}), file=sys.stderr)
+        return 1
+
+    try:
+        if args.command == 'frequencies':
+            result = frequencies(core, _window_from_args(args), include_bonus=not args.no_bonus)
+        elif args.command == 'gaps':
+            result = gaps(core)
+        elif args.command == 'check':
+            result = check_winnings_batch(core, [_parse_numbers(ticket) for ticket in args.tickets])
+        elif args.command == 'generate':
+            result = generate_batch(
+                core, args.sets, args.method, _window_from_args(args) or None,
+                _parse_numbers(args.exclude), _parse_numbers(args.include),
+                json.loads(args.constraints) if args.constraints else None, args.steps,
+            )
+        else: # serve
+            serve(core, args.host, args.port)
+            return 0
+    except (ValueError, TypeError, KeyError) as e: # HTTP 400과 같은 입력 오류 (JSONDecodeError 포함)
+        print(dumps({'error': str(e)}), file=sys.stderr)
+        return 2
+
+    print(dumps(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""
+로또 데이터 분석/생성 핵심 모듈 (Qt 비의존)
+
+GUI(LottoDataManager), CLI, HTTP 서비스(lotto_cli.py)가 공통으로 사용합니다.
+오류는 메시지 창 대신 예외로 전달합니다: 데이터 로드 실패는 FileNotFoundError / LottoDataError,
+번호 생성 설정 오류는 ValueError.
+"""
+import numpy as np
+import pandas as pd
+
+from sampling import gumbel_top_k
+from pattern_filter import generate_constrained, historical_distributions
+from scoring import tickets_to_onehot, prize_ranks, RANK_LABELS
+from draw_index import DrawIndex
+from markov import MarkovModel
+
+class LottoDataError(Exception):
+    """로또 데이터 파일 형식 오류"""
+
+
+class LottoCore:
+    def __init__(self, csv_path='로또.csv'):
+        self.csv_path = csv_path
+        self.df = None
+        self.all_numbers_flat = [] # 1~45, 보너스 포함 모든 당첨 번호 (빈도 분석용)
+        self.max_draw_no = 0
+        self._pattern_distributions = None
+        self._markov_models = {}
+        self._load_data()
+
+    def _load_data(self):
+        try:
+            # CSV 파일 로드
+            # '회차', '날짜', '1', '2', '3', '4', '5', '6', '보너스'
+            self.df = pd.read_csv(self.csv_path)
+
+            # 컬럼명 정리 및 타입 변환
+            self.df.columns = ['draw_no', 'draw_date', 'num1', 'num2', 'num3', 'num4', 'num5', 'num6', 'bonus_num']
+            self.df['draw_date'] = pd.to_datetime(self.df['draw_date'])
+            self.df['draw_no'] = self.df['draw_no'].astype(int)
+
+            # 최신 회차 번호 (내림차순 정렬되어 있다고 가정하지만, 혹시 몰라 최대값 추출)
+            self.df = self.df.sort_values(by='draw_no', ascending=False).reset_index(drop=True)
+            self.max_draw_no = self.df['draw_no'].max()
+
+            # 모든 당첨 번호(보너스 포함) 리스트 생성 (빈도 분석용)
+            self.all_numbers_flat = self.df[[f'num{i}' for i in range(1, 7)] + ['bonus_num']].values.flatten()
+            self.all_numbers_flat = self.all_numbers_flat[~pd.isna(self.all_numbers_flat)].astype(int) # NaN 제거
+
+            # 구간별 빈도 분석용 출현 행렬 및 누적합 배열
+            self._build_incidence()
+            # 회차/날짜/번호 조회 인덱스
+            self.draw_index = DrawIndex(self)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise LottoDataError(f"로또 데이터를 로드하는 중 오류가 발생했습니다: {e}") from e
+
+    def _build_incidence(self):
+        """
+        회차별 번호 출현 행렬(오래된 순, shape (n, 45))과 그 누적합 배열(shape (n+1, 45))을 생성합니다.
+        누적합의 두 행을 빼면 임의 구간의 번호별 출현 횟수를 O(45)에 구할 수 있습니다.
+        """
+        chrono = self.df.iloc[::-1] # 오래된 순
+        n = len(chrono)
+        rows = np.arange(n)
+
+        main = chrono[[f'num{i}' for i in range(1, 7)]].to_numpy(dtype=float)
+        main_valid = ~np.isnan(main)
+        self.main_incidence = np.zeros((n, 45), dtype=np.uint8)
+        self.main_incidence[np.broadcast_to(rows[:, None], main.shape)[main_valid], main[main_valid].astype(int) - 1] = 1
+
+        bonus = chrono['bonus_num'].to_numpy(dtype=float)
+        bonus_valid = ~np.isnan(bonus)
+        self.bonus_incidence = np.zeros((n, 45), dtype=np.uint8)
+        self.bonus_incidence[rows[bonus_valid], bonus[bonus_valid].astype(int) - 1] = 1
+
+        self.cum_main = np.zeros((n + 1, 45), dtype=np.int32)
+        np.cumsum(self.main_incidence, axis=0, out=self.cum_main[1:])
+        self.cum_bonus = np.zeros((n + 1, 45), dtype=np.int32)
+        np.cumsum(self.bonus_incidence, axis=0, out=self.cum_bonus[1:])
+
+        # 구간 경계 탐색용 (오래된 순으로 정렬된 날짜/회차)
+        self.chrono_dates = chrono['draw_date'].to_numpy()
+        self.chrono_draw_nos = chrono['draw_no'].to_numpy()
+
+    @staticmethod
+    def _to_timestamp(date):
+        """QDate, 문자열, datetime 등을 pandas Timestamp로 변환"""
+        if hasattr(date, 'toString'): # QDate (Qt를 import하지 않고 형식 문자열로 변환)
+            return pd.Timestamp(date.toString('yyyy-MM-dd'))
+        return pd.Timestamp(date)
+
+    def get_window_bounds(self, last_n=None, start_date=None, end_date=None, year=None):
+        """
+        분석 구간을 오래된 순 배열의 [lo, hi) 인덱스로 변환합니다.
+        last_n: 최근 N회차 / start_date, end_date: 날짜 범위 (양 끝 포함) / year: 특정 연도
+        아무 조건도 없으면 전체 구간을 반환합니다.
+        """
+        n = len(self.chrono_dates)
+        lo, hi = 0, n
+        if year is not None:
+            start_date = pd.Timestamp(year=int(year), month=1, day=1)
+            end_date = pd.Timestamp(year=int(year), month=12, day=31)
+        if start_date is not None:
+            lo = int(np.searchsorted(self.chrono_dates, self._to_timestamp(start_date).to_datetime64(), side='left'))
+        if end_date is not None:
+            hi = int(np.searchsorted(self.chrono_dates, self._to_timestamp(end_date).to_datetime64(), side='right'))
+        if last_n is not None:
+            lo = max(lo, hi - int(last_n))
+        return lo, max(lo, hi)
+
+    def get_window_counts(self, last_n=None, start_date=None, end_date=None, year=None, include_bonus=True):
+        """구간 내 번호별 출현 횟수 배열 (shape (45,), index 0 = 번호 1)"""
+        lo, hi = self.get_window_bounds(last_n, start_date, end_date, year)
+        counts = self.cum_main[hi] - self.cum_main[lo]
+        if include_bonus:
+            counts = counts + (self.cum_bonus[hi] - self.cum_bonus[lo])
+        return counts
+
+    def get_window_presets(self):
+        """분석/예측 화면에서 선택할 수 있는 구간 목록 [(표시 이름, 구간 인자 dict), ...]"""
+        presets = [("전체 회차", {})]
+        for n in (10, 30, 50, 100, 300):
+            if n < len(self.df):
+                presets.append((f"최근 {n}회", {'last_n': n}))
+        years = sorted(self.df['draw_date'].dt.year.unique(), reverse=True)
+        presets.extend((f"{year}년", {'year': int(year)}) for year in years)
+        return presets
+
+    # --- 데이터 조회 기능 ---
+    def get_draw_by_no(self, draw_no):
+        result = self.draw_index.draw_no(draw_no).records()
+        return result[0] if result else None
+
+    def get_draws_by_date_range(self, start_date, end_date):
+        return self.draw_index.date_range(start_date, end_date).records()
+
+    def get_draws_by_numbers(self, search_numbers, match_all=True, include_bonus=True):
+        if match_all: # 모든 번호 포함
+            return self.draw_index.numbers_all(search_numbers, include_bonus).records()
+        return self.draw_index.numbers_any(search_numbers, include_bonus).records() # 하나라도 포함
+
+    # --- 데이터 분석 기능 ---
+    def get_number_frequency(self, include_bonus=True):
+        return self.get_window_frequency(include_bonus=include_bonus)
+
+    def get_window_frequency(self, last_n=None, start_date=None, end_date=None, year=None, include_bonus=True):
+        """
+        구간별 번호 빈도 분석. 누적합 배열의 차이로 계산하므로 구간 크기와 무관하게 즉시 계산됩니다.
+        구간 내에서 한 번도 나오지 않은 번호도 0회로 포함됩니다.
+        """
+        counts = self.get_window_counts(last_n, start_date, end_date, year, include_bonus)
+        total_counts = counts.sum()
+        freq_df = pd.DataFrame({'number': np.arange(1, 46), 'count': counts})
+        freq_df['percentage'] = (freq_df['count'] / total_counts * 100).round(2) if total_counts else 0.0
+        freq_df = freq_df.sort_values(by='count', ascending=False, kind='stable').reset_index(drop=True)
+        return freq_df.to_dict('records')
+
+    def get_yearly_frequencies(self, include_bonus=True):
+        """
+        연도별 번호 출현 횟수 행렬을 반환합니다.
+        반환: (years 리스트, shape (len(years), 45) 배열)
+        """
+        years = pd.DatetimeIndex(self.chrono_dates).year.to_numpy()
+        unique_years = np.unique(years)
+        if len(unique_years) == 0:
+            return [], np.zeros((0, 45), dtype=np.int32)
+        # 연도 경계 인덱스 (오래된 순 정렬이므로 연도도 오름차순)
+        bounds = np.searchsorted(years, np.append(unique_years, unique_years[-1] + 1))
+        cum = self.cum_main + self.cum_bonus if include_bonus else self.cum_main
+        matrix = cum[bounds[1:]] - cum[bounds[:-1]]
+        return unique_years.tolist(), matrix
+
+    def get_frequency_trend(self, last_n=50, include_bonus=True):
+        """
+        최근 N회 출현율과 전체 출현율을 비교한 추세 분석.
+        ratio > 1 이면 최근 들어 자주 나오는 번호(핫), < 1 이면 뜸한 번호(콜드)입니다.
+        """
+        lo, hi = self.get_window_bounds(last_n=last_n)
+        recent = self.get_window_counts(last_n=last_n, include_bonus=include_bonus)
+        overall = self.get_window_counts(include_bonus=include_bonus)
+        recent_rate = recent / max(hi - lo, 1)
+        overall_rate = overall / max(len(self.chrono_dates), 1)
+        ratio = np.divide(recent_rate, overall_rate, out=np.zeros(45), where=overall_rate > 0)
+        result = [
+            {'number': num, 'recent_count': int(recent[num - 1]), 'total_count': int(overall[num - 1]),
+             'ratio': round(float(ratio[num - 1]), 2)}
+            for num in range(1, 46)
+        ]
+        return sorted(result, key=lambda x: x['ratio'], reverse=True)
+
+    def get_gap_analysis(self):
+        """
+        번호별 마지막 출현 회차(보너스 포함)와 현재까지의 미출현 기간.
+        출현 행렬을 뒤에서부터 argmax하여 45개 번호를 한 번에 계산합니다.
+        """
+        seen = (self.main_incidence | self.bonus_incidence).astype(bool)
+        n = len(seen)
+        ever_seen = seen.any(axis=0)
+        last_pos = n - 1 - np.argmax(seen[::-1], axis=0) if n else np.zeros(45, dtype=int)
+        last_draw_nos = np.where(ever_seen, self.chrono_draw_nos[last_pos] if n else 0, 0)
+
+        result_list = []
+        for num in range(1, 46):
+            last_seen_draw_no = int(last_draw_nos[num - 1])
+            result_list.append({
+                'number': num,
+                # 한 번도 나오지 않은 번호는 전체 회차가 미출현 기간
+                'last_seen_draw': str(last_seen_draw_no) if last_seen_draw_no > 0 else "N/A",
+                'gap': int(self.max_draw_no - last_seen_draw_no),
+            })
+        return sorted(result_list, key=lambda x: x['gap'], reverse=True) # 가장 오래 안 나온 번호부터 정렬
+
+    def get_top_n_frequencies(self, n, include_bonus=True, ascending=False, window=None):
+        freq_df = pd.DataFrame(self.get_window_frequency(include_bonus=include_bonus, **(window or {})))
+        if ascending: # 적게 나온 번호
+            return freq_df.sort_values(by='count', ascending=True).head(n).to_dict('records')
+        else: # 많이 나온 번호
+            return freq_df.sort_values(by='count', ascending=False).head(n).to_dict('records')
+
+    def get_pair_frequencies(self, pair_size=2, top_n=10):
+        if pair_size not in [2, 3]:
+            return []
+
+        from itertools import combinations
+        pair_counts = {}
+
+        for _, row in self.df.iterrows():
+            main_numbers = sorted(row[[f'num{i}' for i in range(1, 7)]].tolist())
+            for combo in combinations(main_numbers, pair_size):
+                key = tuple(sorted(combo)) # 튜플로 변환하여 정렬된 키 사용
+                pair_counts[key] = pair_counts.get(key, 0) + 1
+
+        sorted_pairs = sorted(pair_counts.items(), key=lambda item: item[1], reverse=True)
+        
+        results = []
+        for pair, count in sorted_pairs[:top_n]:
+            results.append({'pair': ', '.join(map(str, pair)), 'count': count})
+        return results
+
+    # --- 예측 기능 ---
+    def get_markov_model(self, window=None):
+        """구간 내 연속 회차 전이 통계로 학습한 MarkovModel (구간별 캐시)"""
+        lo, hi = self.get_window_bounds(**(window or {}))
+        if (lo, hi) not in self._markov_models:
+            self._markov_models[(lo, hi)] = MarkovModel().fit(self.main_incidence[lo:hi])
+        return self._markov_models[(lo, hi)]
+
+    def get_number_weights(self, method='random', window=None, markov_steps=1):
+        """
+        번호 생성 가중치 벡터 (길이 45, index 0 = 번호 1)
+        method: 'random' (균등) / 'statistical' (구간 출현 빈도, 보너스 포함) / 'markov' (최근 회차에서의 k단계 전이 확률)
+        window: get_window_frequency 구간 인자 dict (예: {'last_n': 50}, {'year': 2024}). None이면 전체 회차.
+        markov_steps: 'markov' 방식에서 최근 회차로부터 몇 회차 뒤를 예측할지 (전이 행렬 거듭제곱 차수)
+        """
+        if method == 'markov':
+            return self.get_markov_model(window).score(self.get_latest_numbers(), markov_steps)
+        if method == 'statistical':
+            weights = self.get_window_counts(include_bonus=True, **(window or {})).astype(float)
+            if window:
+                # 짧은 구간에서는 0회 번호가 많으므로 라플라스 스무딩으로 최소 가중치 보장
+                weights += 1
+            if weights.sum() > 0:
+                return weights
+        return np.ones(45)
+
+    def get_latest_numbers(self):
+        """가장 최근 회차의 본번호 6개 (직전 회차 중복 필터용)"""
+        if len(self.main_incidence) == 0:
+            return []
+        return (np.flatnonzero(self.main_incidence[-1]) + 1).tolist()
+
+    def get_pattern_distributions(self):
+        """과거 당첨 번호의 패턴별 분포 (pattern_filter.historical_distributions, 캐시)"""
+        if self._pattern_distributions is None:
+            self._pattern_distributions = historical_distributions(self)
+        return self._pattern_distributions
+
+    def generate_batch(self, num_sets, method='random', count=6, exclude_numbers=None, include_numbers=None, window=None,
+                       constraints=None, markov_steps=1):
+        """
+        여러 세트를 한 번에 생성합니다.
+        가중치 벡터는 한 번만 계산하고, num_sets x 45 Gumbel 노이즈 행렬로 모든 세트를 동시에 비복원 추출합니다.
+        제외/포함 번호는 마스크로 적용되므로 재시도 반복이 없습니다.
+        constraints: 패턴 필터 조건 dict (pattern_filter 참고). 지정하면 조건을 만족하는 세트만 반환
+        반환: 정렬된 번호 리스트의 리스트
+        예외: 세트 수가 음수이거나 번호가 1~45 밖이거나, 포함 번호가 count개를 넘거나
+              제외/포함/필터 조건으로 조합을 만들 수 없으면 ValueError
+        """
+        if isinstance(num_sets, bool) or not isinstance(num_sets, (int, np.integer)) or num_sets < 0:
+            raise ValueError(f"세트 수는 0 이상의 정수여야 합니다: {num_sets!r}")
+        if num_sets == 0:
+            return []
+        include_numbers = sorted(set(include_numbers or []))
+        weights = self.get_number_weights(method, window, markov_steps)
+        if constraints:
+            return generate_constrained(num_sets, constraints, weights, exclude_numbers, include_numbers,
+                                        recent_numbers=self.get_latest_numbers())
+        return gumbel_top_k(weights, num_sets, count, exclude_numbers, include_numbers).tolist()
+
+    def generate_random_numbers(self, count=6, exclude_numbers=None, include_numbers=None):
+        result = self.generate_batch(1, 'random', count, exclude_numbers, include_numbers)
+        return result[0] if result else []
+
+    def generate_statistical_numbers(self, count=6, exclude_numbers=None, include_numbers=None, window=None):
+        """
+        window: get_window_frequency 구간 인자 dict (예: {'last_n': 50}, {'year': 2024}). None이면 전체 회차.
+        """
+        result = self.generate_batch(1, 'statistical', count, exclude_numbers, include_numbers, window)
+        return result[0] if result else []
+    
+    # --- 내 번호 당첨 확인 ---
+    def check_winnings(self, my_numbers):
+        if len(my_numbers) != 6:
+            return [] # 6개가 아닌 번호는 확인하지 않음
+
+        # 전체 회차를 행렬곱 한 번으로 채점 (오래된 순)
+        matched_main, matched_bonus, ranks = prize_ranks(
+            tickets_to_onehot([my_numbers]), self.main_incidence, self.bonus_incidence
+        )
+        matched_main, matched_bonus, ranks = matched_main[0], matched_bonus[0], ranks[0]
+
+        winning_results = []
+        n = len(ranks)
+        for idx in np.flatnonzero(ranks)[::-1]: # 최신 회차부터
+            row = self.df.iloc[n - 1 - idx]
+            main_winning_nums = sorted(row[[f'num{i}' for i in range(1, 7)]].tolist())
+            winning_results.append({
+                '회차': row['draw_no'],
+                '날짜': row['draw_date'].strftime('%Y-%m-%d'),
+                '내 번호': ', '.join(map(str, my_numbers)),
+                '당첨 번호': ', '.join(map(str, main_winning_nums)) + f" (보너스:{row['bonus_num']})",
+                '일치 개수 (본)': int(matched_main[idx]),
+                '일치 개수 (보)': int(matched_bonus[idx]),
+                '등수': RANK_LABELS[int(ranks[idx])]
+            })
+        return winning_results
+
+    def check_winnings_batch(self, tickets):
+        """
+        여러 티켓을 전체 회차에 대해 한 번에 채점합니다 (K x 회차 행렬곱 1회).
+        반환: 티켓별 {'ticket', 'rank_counts': {1~5등: 횟수}, 'wins': [{'draw_no', 'rank', 'matched_main', 'matched_bonus'}, ...]}
+        wins는 최신 회차부터 정렬됩니다.
+        """
+        tickets = [sorted(int(n) for n in ticket) for ticket in tickets]
+        for ticket in tickets:
+            if len(set(ticket)) != 6 or not all(1 <= n <= 45 for n in ticket):
+                raise ValueError(f"티켓은 1~45 사이의 서로 다른 번호 6개여야 합니다: {ticket}")
+        if not tickets:
+            return []
+
+        matched_main, matched_bonus, ranks = prize_ranks(
+            tickets_to_onehot(tickets), self.main_incidence, self.bonus_incidence
+        )
+        results = [{'ticket': ticket, 'rank_counts': {rank: 0 for rank in RANK_LABELS}, 'wins': []} for ticket in tickets]
+        ticket_idx, draw_idx = np.nonzero(ranks)
+        order = np.lexsort((-draw_idx, ticket_idx)) # 티켓별로 최신 회차부터
+        for k, d in zip(ticket_idx[order], draw_idx[order]):
+            rank = int(ranks[k, d])
+            results[k]['rank_counts'][rank] += 1
+            results[k]['wins'].append({
+                'draw_no': int(self.chrono_draw_nos[d]),
+                'rank': rank,
+                'matched_main': int(matched_main[k, d]),
+                'matched_bonus': int(matched_bonus[k, d]),
+            })
+        return results
@@ -0,0 +1,87 @@
+"""
+연속 회차 간 번호 전이(마르코프) 통계
+
+출현 행렬 X (오래된 순, shape (n, 45))에서 행렬곱 한 번으로
+"t회차에 번호 i -> t+1회차에 번호 j" 전이 횟수 C = X[:-1]^T X[1:] (45 x 45)를 계산합니다.
+행 정규화한 전이 행렬 P의 거듭제곱으로 k회차 뒤 전이 확률을 구하고,
+최근 회차 번호들의 행을 평균하여 다음 회차 번호 가중치로 사용합니다.
+"""
+import numpy as np
+
+
+def transition_counts(incidence):
+    """45 x 45 전이 횟수 행렬. counts[i, j] = 번호 i+1이 나온 다음 회차에 번호 j+1이 나온 횟수"""
+    x = np.asarray(incidence, dtype=np.int32)
+    if len(x) < 2:
+        return np.zeros((45, 45), dtype=np.int64)
+    return (x[:-1].T @ x[1:]).astype(np.int64)
+
+
+def transition_matrix(counts, smoothing=1.0):
+    """행 정규화 전이 행렬 (행 합 1). smoothing: 라플라스 스무딩 값 (관측이 적은 번호 보정)"""
+    counts = np.asarray(counts, dtype=np.float64) + smoothing
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def carry_over_stats(incidence):
+    """
+    직전 회차 번호가 다음 회차에 다시 나오는 이월 통계.
+    반환: {
+        'distribution': 이월 개수(0~6)별 비율 (길이 7),
+        'per_number': 번호별 이월 확률 P(t+1회차 출현 | t회차 출현) (길이 45),
+    }
+    """
+    x = np.asarray(incidence, dtype=bool)
+    if len(x) < 2:
+        return {'distribution': np.zeros(7), 'per_number': np.zeros(45)}
+    repeated = x[:-1] & x[1:]
+    distribution = np.bincount(repeated.sum(axis=1), minlength=7)[:7] / (len(x) - 1)
+    appeared = x[:-1].sum(axis=0)
+    per_number = np.divide(repeated.sum(axis=0), appeared, out=np.zeros(45), where=appeared > 0)
+    return {'distribution': distribution, 'per_number': per_number}
+
+
+class MarkovModel:
+    """
+    전이 행렬 기반 번호 점수 모델.
+    fit 이후 k단계 전이 행렬은 캐시되므로 점수 계산은 45 x 45 벡터-행렬곱 한 번입니다.
+    """
+
+    def __init__(self, smoothing=1.0):
+        self.smoothing = smoothing
+        self.counts = np.zeros((45, 45), dtype=np.int64)
+        self.matrix = transition_matrix(self.counts, smoothing)
+        self._powers = {}
+
+    def fit(self, incidence):
+        return self.fit_counts(transition_counts(incidence))
+
+    def fit_counts(self, counts):
+        """이미 계산된 전이 횟수 행렬로 학습 (증분 갱신용)"""
+        self.counts = np.asarray(counts)
+        self.matrix = transition_matrix(self.counts, self.smoothing)
+        self._powers = {1: self.matrix}
+        return self
+
+    def k_step(self, k=1):
+        """k회차 뒤 전이 확률 행렬 P^k"""
+        if k not in self._powers:
+            self._powers[k] = np.linalg.matrix_power(self.matrix, k)
+        return self._powers[k]
+
+    def score(self, latest_numbers, k=1):
+        """
+        최근 회차 번호(1-based 리스트)로부터 k회차 뒤 번호별 확률.
+        반환: 길이 45 가중치 (합 1)
+        """
+        state = np.zeros(45)
+        state[np.asarray(list(latest_numbers), dtype=int) - 1] = 1
+        if not state.any():
+            return np.full(45, 1 / 45)
+        return (state / state.sum()) @ self.k_step(k)
+
+    def top_transitions(self, n=10):
+        """전이 횟수가 가장 많은 (from, to, count) n개 (자기 자신으로의 전이 포함)"""
+        flat = np.argsort(self.counts, axis=None)[::-1][:n]
+        rows, cols = np.unravel_index(flat, self.counts.shape)
+        return [(int(i) + 1, int(j) + 1, int(self.counts[i, j])) for i, j in zip(rows, cols)]
@@ -0,0 +1,176 @@
+"""
+과거 당첨 패턴 기반 필터 번호 생성기
+
+제약 조건(dict, 모두 선택 사항):
+    sum_range: (최소, 최대) 번호 합계
+    odd_count: (최소, 최대) 홀수 개수
+    low_count: (최소, 최대) 저번호(1~22) 개수
+    max_consecutive: 허용할 최장 연속 번호 길이
+    min_last_digits: 서로 다른 끝자리 최소 개수
+    recent_overlap: (최소, 최대) 직전 회차 본번호와 겹치는 개수
+
+가중치 기반 배치 추출 후 벡터화된 조건 검사로 걸러내고(rejection),
+통과율이 너무 낮으면 전체 조합 인덱스에서 조건을 만족하는 조합을 직접 골라 추출하므로 무한 반복이 없습니다.
+"""
+import numpy as np
+
+from combo_index import ComboIndex, LOW_MAX
+from sampling import gumbel_top_k
+
+PATTERN_NAMES = {
+    'sum': "번호 합계",
+    'odd': "홀수 개수",
+    'low': f"저번호(1~{LOW_MAX}) 개수",
+    'max_run': "최장 연속 길이",
+    'last_digits': "끝자리 종류 수",
+    'recent_overlap': "직전 회차 중복 개수",
+}
+
+
+def pattern_features(numbers, recent_numbers=None):
+    """
+    (M, 6) 번호 배열의 패턴 특성을 한 번에 계산합니다.
+    반환: {특성 이름: (M,) 배열}
+    """
+    numbers = np.sort(np.asarray(numbers, dtype=np.int16).reshape(-1, 6), axis=1)
+    features = {
+        'sum': numbers.sum(axis=1),
+        'odd': (numbers % 2).sum(axis=1),
+        'low': (numbers <= LOW_MAX).sum(axis=1),
+    }
+    consecutive = np.diff(numbers, axis=1) == 1
+    run = np.zeros(len(numbers), dtype=np.int16)
+    max_run = np.zeros(len(numbers), dtype=np.int16)
+    for j in range(5):
+        run = np.where(consecutive[:, j], run + 1, 0)
+        np.maximum(max_run, run, out=max_run)
+    features['max_run'] = max_run + 1
+
+    digits = np.zeros((len(numbers), 10), dtype=bool)
+    digits[np.arange(len(numbers))[:, None], numbers % 10] = True
+    features['last_digits'] = digits.sum(axis=1)
+
+    if recent_numbers is not None:
+        features['recent_overlap'] = np.isin(numbers, list(recent_numbers)).sum(axis=1)
+    return features
+
+
+def historical_distributions(data_manager):
+    """
+    과거 당첨 번호(본번호)의 패턴별 분포.
+    반환: {특성 이름: {값: 비율}}. 직전 회차 중복은 연속한 두 회차 사이의 중복 개수 분포
+    """
+    chrono = data_manager.main_incidence.astype(bool)
+    chrono = chrono[chrono.sum(axis=1) == 6] # 번호가 누락된 회차 제외
+    numbers = np.nonzero(chrono)[1].reshape(-1, 6) + 1 # 오래된 순, 행마다 정렬된 6개 번호
+    features = pattern_features(numbers)
+    features['recent_overlap'] = (chrono[1:] & chrono[:-1]).sum(axis=1)
+
+    distributions = {}
+    for name, values in features.items():
+        uniq, counts = np.unique(values, return_counts=True)
+        distributions[name] = {int(v): c / counts.sum() for v, c in zip(uniq, counts)}
+    return distributions
+
+
+def suggest_constraints(distributions, coverage=0.9):
+    """과거 분포의 중앙 coverage 구간으로 기본 제약 조건을 만듭니다."""
+    def central(dist):
+        values = np.array(sorted(dist))
+        cdf = np.cumsum([dist[v] for v in values])
+        tail = (1 - coverage) / 2
+        return int(values[np.searchsorted(cdf, tail)]), int(values[min(np.searchsorted(cdf, 1 - tail), len(values) - 1)])
+
+    lo_digits, _ = central(distributions['last_digits'])
+    _, hi_run = central(distributions['max_run'])
+    return {
+        'sum_range': central(distributions['sum']),
+        'odd_count': central(distributions['odd']),
+        'low_count': central(distributions['low']),
+        'max_consecutive': hi_run,
+        'min_last_digits': lo_digits,
+        'recent_overlap': central(distributions['recent_overlap']),
+    }
+
+
+def check_constraints(numbers, constraints, recent_numbers=None):
+    """(M, 6) 번호 배열 중 모든 제약을 만족하는 행의 bool 마스크"""
+    features = pattern_features(numbers, recent_numbers)
+    ok = np.ones(len(features['sum']), dtype=bool)
+
+    def within(name, bounds):
+        return (features[name] >= bounds[0]) & (features[name] <= bounds[1])
+
+    if constraints.get('sum_range'):
+        ok &= within('sum', constraints['sum_range'])
+    if constraints.get('odd_count'):
+        ok &= within('odd', constraints['odd_count'])
+    if constraints.get('low_count'):
+        ok &= within('low', constraints['low_count'])
+    if constraints.get('max_consecutive'):
+        ok &= features['max_run'] <= constraints['max_consecutive']
+    if constraints.get('min_last_digits'):
+        ok &= features['last_digits'] >= constraints['min_last_digits']
+    if constraints.get('recent_overlap') and recent_numbers is not None:
+        ok &= within('recent_overlap', constraints['recent_overlap'])
+    return ok
+
+
+def _sample_from_index(num_sets, weights, constraints, exclude_numbers, include_numbers, recent_numbers, rng, index):
+    """전체 조합 인덱스에서 조건을 만족하는 조합을 골라 가중치 비례로 비복원 추출합니다."""
+    index = index or ComboIndex()
+
+    def as_range(bounds):
+        return list(range(bounds[0], bounds[1] + 1)) if bounds else None
+
+    ranks = index.filter(
+        sum_range=constraints.get('sum_range'),
+        odd_count=as_range(constraints.get('odd_count')),
+        low_count=as_range(constraints.get('low_count')),
+        max_consecutive=constraints.get('max_consecutive'),
+        exclude_numbers=exclude_numbers,
+        include_numbers=include_numbers,
+    )
+    # 인덱스에 없는 조건(끝자리, 직전 회차 중복)은 후보에만 추가 검사
+    numbers = index.numbers(ranks).astype(np.int16)
+    numbers = numbers[check_constraints(numbers, constraints, recent_numbers)]
+    if len(numbers) == 0:
+        raise ValueError("조건을 만족하는 번호 조합이 없습니다. 필터 조건을 완화해주세요.")
+
+    # 조합 가중치 = 번호 가중치의 곱 -> log 합 + Gumbel 노이즈 상위 num_sets개
+    log_w = np.log(np.maximum(np.asarray(weights, dtype=np.float64), 1e-12))
+    scores = log_w[numbers - 1].sum(axis=1) + rng.gumbel(size=len(numbers))
+    n = min(num_sets, len(numbers))
+    top = np.argpartition(-scores, n - 1)[:n]
+    return numbers[top]
+
+
+def generate_constrained(num_sets, constraints, weights=None, exclude_numbers=None, include_numbers=None,
+                         recent_numbers=None, noise_level=0.0, rng=None, batch_size=4096, max_batches=20, index=None):
+    """
+    패턴 제약을 만족하는 번호 num_sets 세트를 생성합니다.
+    1) gumbel_top_k로 batch_size 세트씩 뽑아 벡터화 검사 후 통과한 것만 모음 (최대 max_batches회)
+    2) 그래도 부족하면 전체 조합 인덱스에서 직접 추출
+    반환: 정렬된 번호 리스트의 리스트 (조건을 만족하는 조합 수가 num_sets보다 적으면 그만큼만)
+    예외: 조건을 만족하는 조합이 없거나 제외/포함 설정이 불가능하면 ValueError
+    """
+    rng = rng or np.random.default_rng()
+    weights = np.ones(45) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    accepted = []
+    n_accepted = 0
+    for _ in range(max_batches):
+        batch = gumbel_top_k(weights, max(batch_size, num_sets), 6, exclude_numbers, include_numbers,
+                             noise_level=noise_level, rng=rng)
+        passed = batch[check_constraints(batch, constraints, recent_numbers)]
+        accepted.append(passed)
+        n_accepted += len(passed)
+        if n_accepted >= num_sets:
+            break
+
+    if n_accepted >= num_sets:
+        result = np.vstack(accepted)[:num_sets]
+    else:
+        result = _sample_from_index(num_sets, weights, constraints, exclude_numbers, include_numbers,
+                                    recent_numbers, rng, index)
+    return np.sort(result, axis=1).astype(int).tolist()
@@ -1,48 +1,116 @@
+import os
+import time
+import joblib
 import numpy as np
 import pandas as pd
 from xgboost import XGBClassifier
 from sklearn.multioutput import MultiOutputClassifier
-from PyQt6.QtWidgets import QMessageBox
+from sklearn.model_selection import TimeSeriesSplit
+
+from features import build_training_set, per_number_log_loss
+from sampling import gumbel_top_k
+from pattern_filter import generate_constrained
+
+# 학습된 모델 저장 위치 (스크립트 경로 기준)
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_cache')
+# 신규 회차 반영 시 추가할 부스팅 라운드 수와, 함께 학습할 직전 회차 수
+WARM_START_ROUNDS = 10
+WARM_START_CONTEXT = 100
+# 마지막 전체 학습 이후 이 회차 수를 넘게 쌓이면 warm-start 대신 전체 재학습
+MAX_INCREMENTAL_DRAWS = 52
+
+# 모델 구조 (backend)
+#   multi_output: 번호별 이진 분류기 45개 (MultiOutputClassifier)
+#   native: XGBoost 다중 출력 트리 (트리 하나의 잎이 45개 출력을 모두 가짐, 부스터 1개)
+#   softmax: 45개 클래스 softmax 1개 + 상위 6개 디코딩 (회차당 6개 샘플로 확장)
+# benchmark_backends 측정 (1,201회차, 1 CPU, xgboost 3.2):
+#   학습     multi_output 12.9~13.9s / native 26.3~28.8s / softmax 31.1s
+#   예측 1행 multi_output 18~23ms    / native 0.24~0.58ms / softmax 2.5ms
+#   native는 다중 출력 트리 분할 탐색 비용으로 학습이 약 2배 느리지만, 예측은 부스터 1개라 수십 배 빠름
+BACKENDS = {
+    'multi_output': "번호별 분류기 45개",
+    'native': "다중 출력 트리 단일 모델 (학습 2배 느림, 예측 빠름)",
+    'softmax': "Softmax 단일 모델 (Top-6, 학습 느림)",
+}
 
 class LottoPredictor:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, window_size=5, cache_dir=MODEL_CACHE_DIR, backend='multi_output'):
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 backend: {backend}")
         self.data_manager = data_manager
+        self.window_size = window_size
+        self.backend = backend
+        self.cache_dir = cache_dir
         self.model = None
         self.is_trained = False
+        self.latest_features = None # 다음 회차 예측에 사용할 최신 상태 특성
+        self.base_draw_no = None # 마지막 전체 학습 시점의 최신 회차
 
-    def prepare_data(self, window_size=5):
+    def prepare_data(self, window_size=None):
         """
-        과거 window_size 만큼의 회차 데이터를 Feature로,
-        그 다음 회차 데이터를 Label로 사용하여 학습 데이터를 생성합니다.
+        과거 window_size 회차의 원-핫 이력, 번호별 미출현 기간, 이동 출현율을 Feature로,
+        그 다음 회차의 번호 집합(One-hot)을 Label로 사용하여 학습 데이터를 생성합니다.
+        (features.build_feature_matrix 참고 - 반복문 없이 한 번에 생성)
         """
+        window_size = window_size or self.window_size
         if self.data_manager.df is None or len(self.data_manager.df) < window_size + 1:
             return None, None
 
-        # 데이터 프레임 복사 및 정렬 (오래된 순)
-        df = self.data_manager.df.sort_values(by='draw_no', ascending=True).copy()
-        
-        # 번호만 추출
-        number_cols = [f'num{i}' for i in range(1, 7)]
-        data = df[number_cols].values
-
-        X = []
-        y = []
-
-        for i in range(len(data) - window_size):
-            # 과거 n회차의 번호들을 1차원 배열로 펼침
-            feature_vector = data[i : i + window_size].flatten()
-            target_vector = data[i + window_size] # 다음 회차 번호
-            
-            X.append(feature_vector)
-            
-            # XGBoost MultiOutputClassifier를 위해
-            # 타겟을 "다음 회차에 등장한 번호들의 집합 (One-hot)"으로 변환 (0 or 1)
-            target_one_hot = np.zeros(45)
-            for num in target_vector:
-                target_one_hot[num-1] = 1 # 1-based index to 0-based
-            y.append(target_one_hot)
-
-        return np.array(X), np.array(y)
+        X, y, self.latest_features = build_training_set(self.data_manager.main_incidence, window_size)
+        return X, y
+
+    def _build_model(self):
+        # n_estimators: 부스팅 라운드 수
+        params = dict(
+            n_estimators=100, 
+            learning_rate=0.1, 
+            max_depth=5, 
+            random_state=42, 
+            n_jobs=-1,
+            tree_method='hist',
+        )
+        if self.backend == 'native':
+            # y가 (n, 45) 행렬이면 라운드마다 45개 출력을 함께 갖는 트리 하나를 학습 (hist 필요)
+            return XGBClassifier(multi_strategy='multi_output_tree', eval_metric='logloss', **params)
+        if self.backend == 'softmax':
+            return XGBClassifier(objective='multi:softprob', eval_metric='mlogloss', **params)
+        # XGBClassifier 사용 (MultiOutputClassifier로 감싸서 다중 레이블 지원)
+        xgb = XGBClassifier(eval_metric='logloss', **params) # eval_metric: 경고 방지
+        # 45개의 이진 분류 문제로 변환하여 학습
+        return MultiOutputClassifier(xgb)
+
+    @staticmethod
+    def _expand_softmax_targets(X, y):
+        """회차별 One-hot(6개 당첨)을 (특성, 당첨 번호 인덱스) 6개 샘플로 펼칩니다."""
+        rows, labels = np.nonzero(y)
+        if len(np.unique(labels)) < y.shape[1]:
+            raise ValueError("softmax 학습 구간에 한 번도 나오지 않은 번호가 있습니다.")
+        return X[rows], labels
+
+    def _fit(self, model, X, y, xgb_model=None):
+        if self.backend == 'softmax':
+            X, y = self._expand_softmax_targets(X, y)
+        model.fit(X, y, xgb_model=xgb_model)
+
+    def _positive_proba(self, model, X):
+        """
+        backend별 predict_proba 결과를 번호별 출현 확률 행렬 (n_samples, 45)로 변환합니다.
+        """
+        if self.backend == 'native':
+            return model.predict_proba(X)
+        if self.backend == 'softmax':
+            # 45개 번호 중 1개 분포 -> 6개가 뽑힐 때의 주변 확률 근사 (6 * p)
+            return np.clip(model.predict_proba(X) * 6, 0, 1)
+
+        # MultiOutputClassifier의 predict_proba는 estimator별 (n_samples, n_classes) 리스트를 반환
+        probs_list = model.predict_proba(X)
+        result = np.zeros((X.shape[0], len(probs_list)))
+        for i, probs in enumerate(probs_list):
+            classes = list(model.estimators_[i].classes_)
+            # 만약 클래스가 하나뿐이라면 (예: 학습 구간에서 한 번도 안 나온 번호) shape는 (n, 1)
+            if 1 in classes:
+                result[:, i] = probs[:, classes.index(1)]
+        return result
 
     def train(self):
         try:
@@ -50,113 +118,215 @@ class LottoPredictor:
             if X is None:
                 return False
 
-            # XGBClassifier 사용 (MultiOutputClassifier로 감싸서 다중 레이블 지원)
-            # n_estimators: 부스팅 라운드 수
-            xgb = XGBClassifier(
-                n_estimators=100, 
-                learning_rate=0.1, 
-                max_depth=5, 
-                random_state=42, 
-                n_jobs=-1,
-                eval_metric='logloss' # 경고 방지
-            )
-            # 45개의 이진 분류 문제로 변환하여 학습
-            self.model = MultiOutputClassifier(xgb)
-            self.model.fit(X, y)
+            self.model = self._build_model()
+            self._fit(self.model, X, y)
             self.is_trained = True
+            self.base_draw_no = int(self.data_manager.max_draw_no)
+            self.save_model()
             return True
         except Exception as e:
             print(f"Training error: {e}")
             return False
 
-    def predict(self, recent_data, top_n=6, exclude_numbers=None, include_numbers=None, noise_level=0.0):
+    # --- 모델 캐시 (디스크 저장 / 불러오기 / 증분 학습) ---
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f'lotto_xgb_{self.backend}_w{self.window_size}.joblib')
+
+    def fingerprint(self):
+        """캐시 키: 학습에 사용한 최신 회차와 window_size, 모델 구조"""
+        return {'max_draw_no': int(self.data_manager.max_draw_no), 'window_size': self.window_size, 'backend': self.backend}
+
+    def save_model(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            joblib.dump({
+                'fingerprint': self.fingerprint(),
+                'base_draw_no': self.base_draw_no,
+                'model': self.model,
+            }, self.cache_path)
+        except Exception as e:
+            print(f"Model save error: {e}")
+
+    def load_model(self):
+        """
+        저장된 모델을 불러옵니다. 캐시 이후 신규 회차가 있으면 warm-start 부스팅으로 갱신 후 다시 저장합니다.
+        반환: 사용 가능한 모델을 준비했으면 True, 전체 재학습이 필요하면 False
+        """
+        if not os.path.exists(self.cache_path):
+            return False
+        try:
+            cached = joblib.load(self.cache_path)
+        except Exception as e:
+            print(f"Model load error: {e}")
+            return False
+
+        cached_draw_no = cached['fingerprint']['max_draw_no']
+        current_draw_no = int(self.data_manager.max_draw_no)
+        base_draw_no = cached.get('base_draw_no') or cached_draw_no
+        if (cached['fingerprint']['window_size'] != self.window_size
+                or cached['fingerprint'].get('backend', 'multi_output') != self.backend
+                or getattr(cached['model'], 'multi_strategy', None) != getattr(self._build_model(), 'multi_strategy', None)
+                or cached_draw_no > current_draw_no):
+            return False # 설정이나 트리 구조가 다르거나 데이터가 교체된 경우
+        if current_draw_no - base_draw_no > MAX_INCREMENTAL_DRAWS:
+            return False # 증분이 너무 많이 쌓이면 전체 재학습
+
+        X, y = self.prepare_data()
+        if X is None:
+            return False
+        self.model = cached['model']
+        self.base_draw_no = base_draw_no
+        if cached_draw_no < current_draw_no:
+            try:
+                self.update_model(X, y, cached_draw_no)
+            except Exception as e:
+                print(f"Model update error: {e}")
+                return False
+            self.save_model()
+        self.is_trained = True
+        return True
+
+    def update_model(self, X, y, since_draw_no):
+        """
+        since_draw_no 이후 회차를 기존 부스터에 이어서 학습합니다 (warm-start).
+        신규 회차와 직전 WARM_START_CONTEXT 회차만 사용하여 WARM_START_ROUNDS 라운드를 추가합니다.
+        """
+        # X의 각 행이 예측하는 회차 번호 (오래된 순)
+        target_draw_nos = self.data_manager.chrono_draw_nos[self.window_size:]
+        n_new = int((target_draw_nos > since_draw_no).sum())
+        if n_new == 0:
+            return
+        X_upd = X[-(n_new + WARM_START_CONTEXT):]
+        y_upd = y[-(n_new + WARM_START_CONTEXT):]
+
+        if self.backend != 'multi_output':
+            # 단일 부스터이므로 한 번에 이어서 학습
+            self.model.set_params(n_estimators=WARM_START_ROUNDS)
+            self._fit(self.model, X_upd, y_upd, xgb_model=self.model.get_booster())
+            return
+
+        for i, estimator in enumerate(self.model.estimators_):
+            if len(np.unique(y_upd[:, i])) < 2:
+                continue # 한 클래스만 있는 구간은 이어서 학습할 수 없음
+            estimator.set_params(n_estimators=WARM_START_ROUNDS)
+            estimator.fit(X_upd, y_upd[:, i], xgb_model=estimator.get_booster())
+
+    def cross_validate(self, n_splits=5):
         """
-        recent_data: 가장 최근 window_size 만큼의 데이터 (2D array)
+        Walk-forward(시간 순서) 교차검증.
+        각 fold는 과거 구간으로만 학습하고 바로 다음 구간을 예측하여,
+        번호별 log-loss를 '모든 번호가 6/45 확률'인 균등 기준선과 비교합니다.
+
+        반환: {
+            'folds': [{'train_size', 'test_size', 'model_logloss', 'baseline_logloss'}, ...],
+            'model_logloss': 번호별 평균 log-loss (45,),
+            'baseline_logloss': 번호별 기준선 log-loss (45,),
+            'skill': 1 - model/baseline (양수면 기준선보다 우수)
+        } 또는 데이터 부족 시 None
+        """
+        X, y = self.prepare_data()
+        if X is None or len(X) < n_splits + 1:
+            return None
+
+        baseline_p = 6 / 45
+        folds = []
+        model_losses = []
+        baseline_losses = []
+        for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(X):
+            model = self._build_model()
+            self._fit(model, X[train_idx], y[train_idx])
+            probs = self._positive_proba(model, X[test_idx])
+
+            model_loss = per_number_log_loss(y[test_idx], probs)
+            baseline_loss = per_number_log_loss(y[test_idx], np.full(probs.shape, baseline_p))
+            model_losses.append(model_loss)
+            baseline_losses.append(baseline_loss)
+            folds.append({
+                'train_size': len(train_idx),
+                'test_size': len(test_idx),
+                'model_logloss': float(model_loss.mean()),
+                'baseline_logloss': float(baseline_loss.mean()),
+            })
+
+        model_logloss = np.mean(model_losses, axis=0)
+        baseline_logloss = np.mean(baseline_losses, axis=0)
+        return {
+            'folds': folds,
+            'model_logloss': model_logloss,
+            'baseline_logloss': baseline_logloss,
+            'skill': 1 - model_logloss.mean() / baseline_logloss.mean(),
+        }
+
+    def predict(self, top_n=6, exclude_numbers=None, include_numbers=None, noise_level=0.0):
+        """
+        가장 최근 회차까지의 상태 특성으로 다음 회차 번호 1세트를 예측합니다.
         noise_level: 예측 확률에 추가할 무작위 노이즈의 강도 (0.0 ~ 1.0). 세트마다 다양성을 주기 위해 사용.
         """
+        result = self.predict_batch(1, top_n, exclude_numbers, include_numbers, noise_level)
+        return result[0] if result else []
+
+    def predict_batch(self, num_sets, top_n=6, exclude_numbers=None, include_numbers=None, noise_level=0.0,
+                      constraints=None):
+        """
+        확률 벡터를 한 번만 계산한 뒤 num_sets 세트를 Gumbel-top-k로 동시에 추출합니다.
+        constraints: 패턴 필터 조건 dict (pattern_filter 참고). 지정하면 조건을 만족하는 세트만 반환
+        반환: 정렬된 번호 리스트의 리스트. 실패 시 []
+        """
         if not self.is_trained:
             if not self.train():
                 return []
         
-        # 입력 데이터 shape 맞추기
-        feature_vector = recent_data.flatten().reshape(1, -1)
-        
         try:
-            # MultiOutputClassifier의 predict_proba는 각 estimator별로 (n_samples, 2) 배열을 담은 리스트를 반환
-            probs_list = self.model.predict_proba(feature_vector)
-            
-            # 확률 추출 (Dictionary: {번호: 확률})
-            number_probs = {}
-            for i, probs in enumerate(probs_list):
-                # probs has shape (1, 2) -> [prob_0, prob_1]
-                # 우리가 원하는 것은 1(나올 확률)
-                # 만약 클래스가 하나뿐이라면 (예: 데이터셋에서 한 번도 안 나온 번호) shape는 (1, 1)이 될 수 있음
-                prob_appearing = 0.0
-                if probs.shape[1] == 2:
-                    prob_appearing = probs[0][1]
-                elif probs.shape[1] == 1:
-                    # 해당 클래스가 0인지 1인지 확인 필요하지만
-                    # XGBoost 특성상 보통 0/1 둘 다 없으면 에러 혹은 하나만 있음.
-                    # MultiOutputClassifier의 내부 estimator.classes_ 확인
-                    estimator = self.model.estimators_[i]
-                    if 1 in estimator.classes_:
-                         prob_appearing = probs[0][0] # 유일한 클래스가 1이면 확률 1.0 (거의 없을 듯)
-                    else:
-                         prob_appearing = 0.0 # 유일한 클래스가 0이면 확률 0.0
-                
-                # 가중치 다양화를 위한 노이즈 주입
-                if noise_level > 0:
-                    # -noise_level ~ +noise_level 사이의 랜덤 값 더하기
-                    noise = np.random.uniform(-noise_level, noise_level)
-                    prob_appearing += noise
-                    # 확률 범위 0~1 클리핑 하지 않음 (상대적 크기만 중요하므로, 음수만 처리)
-                
-                if prob_appearing < 0:
-                    prob_appearing = 0.0001 # 0 이하 방지
-
-                number_probs[i + 1] = prob_appearing
-
-            # 1. 포함할 번호 처리
-            picked = []
-            if include_numbers:
-                picked.extend(include_numbers)
-            
-            # 2. 후보군 및 가중치 준비
-            candidates = []
-            weights = []
-            
-            for num, prob in number_probs.items():
-                # 제외 번호이거나 이미 포함된 번호는 건너뜀
-                if (exclude_numbers and num in exclude_numbers) or (num in picked):
-                    continue
-                
-                candidates.append(num)
-                weights.append(prob)
-            
-            # 남은 뽑아야 할 개수
-            remaining_count = top_n - len(picked)
-            
-            if remaining_count > 0:
-                # 가중치 합이 0이면 균등 확률로 설정 (에러 방지)
-                if sum(weights) == 0:
-                    weights = [1.0] * len(weights)
-                
-                weights = np.array(weights)
-                weights = weights / weights.sum() # 정규화
-                
-                # 가중치 기반 랜덤 비복원 추출
-                chosen_randomly = np.random.choice(
-                    candidates, 
-                    size=remaining_count, 
-                    replace=False, 
-                    p=weights
+            probs = self._positive_proba(self.model, self.latest_features)[0]
+            probs = np.maximum(probs, 0.0001) # 0 이하 방지 (모든 번호가 뽑힐 수 있도록)
+            if constraints:
+                return generate_constrained(
+                    num_sets, constraints, probs, exclude_numbers, include_numbers,
+                    recent_numbers=self.data_manager.get_latest_numbers(), noise_level=noise_level
                 )
-                picked.extend(chosen_randomly)
-            
-            return sorted(picked)
+            # 노이즈는 세트마다 따로 주입되어 확률 분포를 약간씩 흔듦
+            return gumbel_top_k(
+                probs, num_sets, top_n, exclude_numbers, include_numbers, noise_level=noise_level
+            ).tolist()
 
         except Exception as e:
             print(f"Prediction error: {e}")
             import traceback
             traceback.print_exc()
             return []
+
+def benchmark_backends(data_manager, backends=tuple(BACKENDS), repeats=20):
+    """
+    backend별 전체 학습 시간과 predict_proba(최신 1행) 지연 시간을 측정합니다.
+    반환: {backend: {'train_sec', 'predict_ms'}}
+    """
+    results = {}
+    for backend in backends:
+        predictor = LottoPredictor(data_manager, backend=backend)
+        X, y = predictor.prepare_data()
+        if X is None:
+            return results
+
+        model = predictor._build_model()
+        start = time.perf_counter()
+        predictor._fit(model, X, y)
+        train_sec = time.perf_counter() - start
+
+        predictor._positive_proba(model, predictor.latest_features) # 워밍업
+        start = time.perf_counter()
+        for _ in range(repeats):
+            predictor._positive_proba(model, predictor.latest_features)
+        predict_ms = (time.perf_counter() - start) / repeats * 1000
+
+        results[backend] = {'train_sec': train_sec, 'predict_ms': predict_ms}
+    return results
+
+
+if __name__ == '__main__':
+    # 사용법: python predictor.py  (스크립트 폴더의 로또.csv로 backend별 속도 비교)
+    from lotto_core import LottoCore
+
+    csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '로또.csv')
+    for backend, stats in benchmark_backends(LottoCore(csv_path)).items():
+        print(f"{backend:<14} train {stats['train_sec']:8.2f}s   predict_proba {stats['predict_ms']:8.2f}ms   ({BACKENDS[backend]})")
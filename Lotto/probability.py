@@ -0,0 +1,126 @@
+"""
+티켓 묶음(포트폴리오)의 등수별 정확한 당첨 확률 / 기대값 계산
+
+균등 추첨을 가정하고 본번호 6개의 모든 조합 C(45, 6) = 8,145,060개를 NumPy 청크로 열거합니다.
+보너스 번호는 본번호를 제외한 39개 중 균등하게 뽑히므로 조합별로 해석적으로 반영합니다.
+티켓 간 번호가 겹쳐도(같은 조합에서 여러 장 당첨) 정확한 분포가 나옵니다.
+"""
+import numpy as np
+
+from scoring import PRIZE_PROBABILITIES, TOTAL_COMBINATIONS, tickets_to_onehot
+
+TICKET_PRICE = 1000
+# 등수별 당첨금 (원). 4·5등은 고정 금액, 1~3등은 판매량에 따라 달라지므로 대략적인 평균값
+DEFAULT_PRIZES = {1: 2_000_000_000, 2: 55_000_000, 3: 1_500_000, 4: 50_000, 5: 5_000}
+
+_combination_cache = {}
+
+
+def combinations_array(n, k):
+    """range(n)의 모든 k-조합을 사전순 (C(n, k), k) 배열로 생성합니다 (itertools 없이 벡터화)."""
+    key = (n, k)
+    if key in _combination_cache:
+        return _combination_cache[key]
+    combos = np.arange(n, dtype=np.int8)[:, None]
+    for _ in range(k - 1):
+        last = combos[:, -1].astype(np.int64)
+        repeats = n - 1 - last # 각 행 뒤에 붙일 수 있는 값의 개수
+        rows = np.repeat(np.arange(len(combos)), repeats)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        combos = np.hstack([combos[rows], (np.repeat(last, repeats) + 1 + offsets).astype(np.int8)[:, None]])
+    _combination_cache[key] = combos
+    return combos
+
+
+def iter_draw_chunks(chunk_size=1_000_000):
+    """
+    본번호 6개 조합 전체(0-based 번호)를 청크 단위로 생성합니다.
+    첫 번호 a를 고정하고 나머지 5개는 a보다 큰 번호의 5-조합 표에서 잘라 씁니다.
+    """
+    tail = combinations_array(45, 5)
+    first = tail[:, 0]
+    for a in range(40):
+        start = int(np.searchsorted(first, a + 1))
+        for lo in range(start, len(tail), chunk_size):
+            block = tail[lo:lo + chunk_size]
+            yield np.hstack([np.full((len(block), 1), a, dtype=np.int8), block])
+
+
+def portfolio_distribution(tickets, chunk_size=1_000_000):
+    """
+    티켓 묶음의 정확한 당첨 분포를 계산합니다.
+    반환: {
+        'best_tier': {1~5: 해당 등수가 최고 등수일 확률, 0: 모두 미당첨 확률},
+        'p_any_win': 한 장 이상 당첨될 확률,
+        'expected_counts': {1~5: 등수별 당첨 티켓 수 기대값},
+    }
+    티켓이 없으면 당첨 확률 0 (best_tier[0] = 1)
+    """
+    if len(tickets) == 0:
+        best = {rank: 0.0 for rank in PRIZE_PROBABILITIES}
+        best[0] = 1.0
+        return {'best_tier': best, 'p_any_win': 0.0, 'expected_counts': dict.fromkeys(PRIZE_PROBABILITIES, 0.0)}
+
+    onehot = tickets_to_onehot(tickets)
+    n_tickets = len(onehot)
+    expected_counts = {rank: n_tickets * p for rank, p in PRIZE_PROBABILITIES.items()}
+
+    if n_tickets == 1: # 단일 티켓은 닫힌 식
+        best = dict(PRIZE_PROBABILITIES)
+        best[0] = 1 - sum(best.values())
+        return {'best_tier': best, 'p_any_win': 1 - best[0], 'expected_counts': expected_counts}
+
+    member = onehot.T.astype(np.int8) # (45, K): 번호가 각 티켓에 포함되는지
+    ticket_sums = (onehot * np.arange(45)).sum(axis=1) # 티켓별 번호 합 (0-based)
+
+    # 최고 등수별 조합 수 (2등은 보너스 확률 가중치가 붙으므로 실수)
+    best_weight = np.zeros(6)
+    for draws in iter_draw_chunks(chunk_size):
+        matches = np.zeros((len(draws), n_tickets), dtype=np.int8)
+        for j in range(6):
+            matches += member[draws[:, j]]
+        best_match = matches.max(axis=1)
+
+        best_weight[1] += np.count_nonzero(best_match == 6)
+        best_weight[4] += np.count_nonzero(best_match == 4)
+        best_weight[5] += np.count_nonzero(best_match == 3)
+
+        # 5개 일치 조합: 5개 일치 티켓들의 '빠진 번호' 중 하나가 보너스면 2등, 아니면 3등
+        rows5 = np.flatnonzero(best_match == 5)
+        if len(rows5):
+            sub = draws[rows5]
+            matched_sum = np.zeros((len(rows5), n_tickets), dtype=np.int64)
+            for j in range(6):
+                matched_sum += member[sub[:, j]] * sub[:, j:j + 1]
+            missing = ticket_sums[None, :] - matched_sum # 5개 일치 티켓의 나머지 1개 번호
+            hit5 = matches[rows5] == 5
+            seen = np.zeros((len(rows5), 45), dtype=bool)
+            row_idx, ticket_idx = np.nonzero(hit5)
+            seen[row_idx, missing[row_idx, ticket_idx]] = True
+            p_second = seen.sum(axis=1) / 39 # 보너스는 본번호 외 39개 중 균등
+            best_weight[2] += p_second.sum()
+            best_weight[3] += (1 - p_second).sum()
+
+    best = {rank: float(best_weight[rank] / TOTAL_COMBINATIONS) for rank in range(1, 6)}
+    best[0] = 1 - sum(best.values())
+    return {'best_tier': best, 'p_any_win': 1 - best[0], 'expected_counts': expected_counts}
+
+
+def portfolio_summary(tickets, prizes=None, ticket_price=TICKET_PRICE):
+    """확률 분포에 비용/기대 당첨금/수익률을 더한 요약"""
+    prizes = prizes or DEFAULT_PRIZES
+    dist = portfolio_distribution(tickets)
+    cost = len(tickets) * ticket_price
+    expected_value = sum(dist['expected_counts'][rank] * prizes[rank] for rank in prizes)
+    dist.update({
+        'tickets': len(tickets),
+        'cost': cost,
+        'expected_value': expected_value,
+        'roi': expected_value / cost - 1 if cost else 0.0,
+    })
+    return dist
+
+
+def compare_portfolios(portfolios, prizes=None):
+    """여러 포트폴리오 {이름: 티켓 리스트}를 같은 기준으로 비교합니다."""
+    return {name: portfolio_summary(tickets, prizes) for name, tickets in portfolios.items()}
@@ -0,0 +1,62 @@
+import numpy as np
+
+NUMBERS = 45
+
+
+def _to_index(numbers, label):
+    """번호(1~45) 목록을 0부터 시작하는 인덱스 배열로 변환합니다. 범위를 벗어나면 ValueError"""
+    values = list(numbers)
+    invalid = [n for n in values if isinstance(n, bool) or not isinstance(n, (int, np.integer)) or not 1 <= n <= NUMBERS]
+    if invalid:
+        raise ValueError(f"{label} 번호는 1~{NUMBERS} 사이의 정수여야 합니다: {invalid}")
+    return np.asarray(values, dtype=int) - 1
+
+
+def build_mask(exclude_numbers=None, include_numbers=None):
+    """
+    제외/포함 번호를 길이 45의 마스크로 변환합니다.
+    반환: (allowed, forced) - allowed: 뽑힐 수 있는 번호, forced: 반드시 포함할 번호
+    예외: 1~45 범위를 벗어난 번호가 있으면 ValueError
+    """
+    allowed = np.ones(NUMBERS, dtype=bool)
+    forced = np.zeros(NUMBERS, dtype=bool)
+    if exclude_numbers:
+        allowed[_to_index(exclude_numbers, "제외할")] = False
+    if include_numbers:
+        forced[_to_index(include_numbers, "포함할")] = True
+    return allowed, forced
+
+
+def gumbel_top_k(weights, num_sets, count=6, exclude_numbers=None, include_numbers=None, noise_level=0.0, rng=None):
+    """
+    가중치 비례 비복원 추출을 num_sets 세트만큼 한 번에 수행합니다 (Gumbel-top-k).
+    log(가중치) + Gumbel 노이즈의 상위 count개를 고르면 가중치 기반 순차 비복원 추출과 같은 분포가 됩니다.
+
+    weights: 길이 45의 음이 아닌 가중치 (index 0 = 번호 1)
+    noise_level: 세트마다 가중치에 더할 균등 노이즈 크기 (다양성 확보용, 0이면 미사용)
+    반환: shape (num_sets, count) 정렬된 번호 배열 (1~45)
+    예외: 포함 번호가 count개를 넘거나, 뽑을 수 있는 번호가 부족하면 ValueError
+    """
+    rng = rng or np.random.default_rng()
+    weights = np.asarray(weights, dtype=np.float64)
+    allowed, forced = build_mask(exclude_numbers, include_numbers)
+
+    n_forced = int(forced.sum())
+    if n_forced > count:
+        raise ValueError(f"포함할 번호({n_forced}개)가 {count}개를 초과합니다.")
+    available = allowed & ~forced & (weights > 0)
+    if n_forced + int(available.sum()) < count:
+        raise ValueError(f"제외/포함 번호 설정으로 인해 유효한 번호 조합을 생성할 수 없습니다. 남은 번호 풀: {int(available.sum())}개")
+
+    w = np.broadcast_to(weights, (num_sets, NUMBERS))
+    if noise_level > 0:
+        w = np.maximum(w + rng.uniform(-noise_level, noise_level, size=(num_sets, NUMBERS)), 0.0001) * (weights > 0)
+
+    with np.errstate(divide='ignore'):
+        scores = np.log(w) + rng.gumbel(size=(num_sets, NUMBERS))
+    scores[:, ~available] = -np.inf
+    scores[:, forced] = np.inf # 포함 번호는 항상 상위에 위치
+
+    top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+    top.sort(axis=1)
+    return top + 1
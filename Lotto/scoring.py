@@ -0,0 +1,45 @@
+from math import comb
+
+import numpy as np
+
+NUMBERS = 45
+
+# 등수 (0 = 미당첨)
+RANK_LABELS = {1: "1등", 2: "2등", 3: "3등", 4: "4등", 5: "5등"}
+
+# 균등 추첨 시 티켓 1장의 등수별 당첨 확률 (총 C(45, 6) = 8,145,060 조합)
+TOTAL_COMBINATIONS = comb(45, 6)
+PRIZE_PROBABILITIES = {
+    1: 1 / TOTAL_COMBINATIONS,
+    2: comb(6, 5) * 1 / TOTAL_COMBINATIONS, # 본번호 5개 + 보너스
+    3: comb(6, 5) * 38 / TOTAL_COMBINATIONS, # 본번호 5개 (보너스 제외 나머지 38개 중 1개)
+    4: comb(6, 4) * comb(39, 2) / TOTAL_COMBINATIONS,
+    5: comb(6, 3) * comb(39, 3) / TOTAL_COMBINATIONS,
+}
+
+
+def tickets_to_onehot(tickets):
+    """번호 배열 (K, 6) 또는 리스트의 리스트를 (K, 45) 원-핫 행렬로 변환합니다."""
+    tickets = np.asarray(tickets, dtype=int).reshape(-1, 6)
+    onehot = np.zeros((len(tickets), NUMBERS), dtype=np.uint8)
+    onehot[np.arange(len(tickets))[:, None], tickets - 1] = 1
+    return onehot
+
+
+def prize_ranks(ticket_onehot, main_incidence, bonus_incidence):
+    """
+    티켓 K장과 추첨 D회를 한 번에 채점합니다 (행렬곱으로 일치 개수 계산).
+    ticket_onehot: (K, 45), main_incidence / bonus_incidence: (D, 45)
+    반환: (matched_main, matched_bonus, ranks) 각각 shape (K, D). ranks는 1~5등, 미당첨 0
+    """
+    tickets = ticket_onehot.astype(np.int16)
+    matched_main = tickets @ main_incidence.T.astype(np.int16)
+    matched_bonus = tickets @ bonus_incidence.T.astype(np.int16)
+
+    ranks = np.zeros(matched_main.shape, dtype=np.int8)
+    ranks[matched_main == 3] = 5
+    ranks[matched_main == 4] = 4
+    ranks[matched_main == 5] = 3
+    ranks[(matched_main == 5) & (matched_bonus == 1)] = 2
+    ranks[matched_main == 6] = 1
+    return matched_main, matched_bonus, ranks
@@ -0,0 +1,200 @@
+"""
+번호 풀 휠링(커버링 디자인) 생성기
+
+"t if m" 보장: 당첨 번호 중 m개가 내 번호 풀에 있으면, 생성된 티켓 중 적어도 한 장은 t개 이상 일치합니다.
+풀의 각 조합은 비트마스크(풀 인덱스 기준, 최대 20비트)로 표현하며,
+탐욕적 집합 덮개 + 국소 탐색으로 티켓 수를 줄입니다.
+자주 쓰는 조합은 wheel_tables.json에 미리 계산된 디자인을 사용합니다.
+"""
+import json
+import os
+from itertools import combinations
+
+import numpy as np
+
+MAX_POOL = 20
+TICKET_SIZE = 6
+
+# 표시 이름 -> (t, m)
+GUARANTEES = {
+    "3 if 3": (3, 3),
+    "3 if 4": (3, 4),
+    "3 if 5": (3, 5),
+    "3 if 6": (3, 6),
+    "4 if 4": (4, 4),
+    "4 if 5": (4, 5),
+    "4 if 6": (4, 6),
+    "5 if 5": (5, 5),
+    "5 if 6": (5, 6),
+}
+
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wheel_tables.json')
+
+# 20비트 popcount 조회표
+_POPCOUNT = np.zeros(1 << MAX_POOL, dtype=np.uint8)
+for _bit in range(MAX_POOL):
+    _POPCOUNT[1 << _bit:1 << (_bit + 1)] = _POPCOUNT[:1 << _bit] + 1
+
+_tables = None
+
+
+def _combination_masks(v, r):
+    """range(v)의 모든 r-부분집합 비트마스크 배열"""
+    if r > v:
+        return np.zeros(0, dtype=np.int32)
+    idx = np.array(list(combinations(range(v), r)), dtype=np.int32)
+    return (1 << idx).sum(axis=1).astype(np.int32)
+
+
+def _mask_to_indices(mask):
+    return [i for i in range(MAX_POOL) if mask >> i & 1]
+
+
+class _CoverState:
+    """m-부분집합(덮어야 할 대상)별로 몇 장의 티켓이 덮고 있는지 추적합니다."""
+
+    def __init__(self, v, t, m):
+        self.t = t
+        self.targets = _combination_masks(v, m)
+        self.candidates = _combination_masks(v, TICKET_SIZE)
+        self.counts = np.zeros(len(self.targets), dtype=np.int32)
+
+    def covers(self, ticket, targets=None):
+        targets = self.targets if targets is None else targets
+        return _POPCOUNT[targets & ticket] >= self.t
+
+    def add(self, ticket):
+        self.counts += self.covers(ticket)
+
+    def remove(self, ticket):
+        self.counts -= self.covers(ticket)
+
+    def greedy_fill(self, rng, budget=20_000_000):
+        """
+        덮이지 않은 대상이 없어질 때까지 티켓을 추가합니다 (탐욕적 집합 덮개).
+        매 단계 덮이지 않은 대상 하나를 무작위로 고르고, 그 대상을 덮는 후보 중
+        남은 대상을 가장 많이 덮는 티켓을 선택합니다. 후보 수 x 남은 대상 수가 budget을 넘으면 후보를 표본 추출합니다.
+        """
+        chosen = []
+        uncovered = self.targets[self.counts == 0]
+        while len(uncovered):
+            target = uncovered[rng.integers(len(uncovered))]
+            cands = self.candidates[self.covers(target, self.candidates)]
+            max_cands = max(50, budget // len(uncovered))
+            if len(cands) > max_cands:
+                cands = rng.choice(cands, size=max_cands, replace=False)
+            gains = (_POPCOUNT[cands[:, None] & uncovered[None, :]] >= self.t).sum(axis=1)
+            ticket = int(cands[np.argmax(gains)])
+            chosen.append(ticket)
+            self.add(ticket)
+            uncovered = uncovered[~self.covers(ticket, uncovered)]
+        return chosen
+
+    def drop_redundant(self, tickets, rng):
+        """빼도 보장이 유지되는 티켓을 제거합니다."""
+        for ticket in rng.permutation(tickets).tolist():
+            covered = self.covers(ticket)
+            if (self.counts[covered] >= 2).all():
+                self.remove(ticket)
+                tickets.remove(ticket)
+        return tickets
+
+
+def _search(v, t, m, iterations=200, seed=None):
+    """탐욕적 초기해 + 국소 탐색 (티켓 2장을 빼고 다시 채워서 더 적거나 같으면 채택)"""
+    rng = np.random.default_rng(seed)
+    state = _CoverState(v, t, m)
+    tickets = state.drop_redundant(state.greedy_fill(rng), rng)
+
+    for _ in range(iterations):
+        if len(tickets) < 2:
+            break
+        removed = rng.choice(len(tickets), size=2, replace=False).tolist()
+        removed_tickets = [tickets[i] for i in removed]
+        for ticket in removed_tickets:
+            state.remove(ticket)
+        kept = [ticket for i, ticket in enumerate(tickets) if i not in removed]
+        refill = state.greedy_fill(rng)
+        if len(refill) <= len(removed_tickets):
+            tickets = state.drop_redundant(kept + refill, rng)
+        else: # 되돌리기
+            for ticket in refill:
+                state.remove(ticket)
+            for ticket in removed_tickets:
+                state.add(ticket)
+    return [_mask_to_indices(ticket) for ticket in tickets]
+
+
+def _load_tables():
+    global _tables
+    if _tables is None:
+        try:
+            with open(TABLES_PATH, 'r', encoding='utf-8') as f:
+                _tables = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _tables = {}
+    return _tables
+
+
+def _table_key(v, t, m):
+    return f"{v}:{t}:{m}"
+
+
+def validate(pool, guarantee):
+    """입력 검사. 문제가 있으면 ValueError"""
+    if guarantee not in GUARANTEES:
+        raise ValueError(f"지원하지 않는 보장 조건: {guarantee}")
+    if len(set(pool)) != len(pool) or not all(1 <= n <= 45 for n in pool):
+        raise ValueError("번호 풀은 1~45 사이의 서로 다른 번호여야 합니다.")
+    if not TICKET_SIZE <= len(pool) <= MAX_POOL:
+        raise ValueError(f"번호 풀은 {TICKET_SIZE}~{MAX_POOL}개여야 합니다. 현재 {len(pool)}개")
+    t, m = GUARANTEES[guarantee]
+    if m > len(pool):
+        raise ValueError(f"'{guarantee}' 보장에는 최소 {m}개의 번호가 필요합니다.")
+
+
+def generate_wheel(pool, guarantee="3 if 4", iterations=200, seed=None, use_tables=True):
+    """
+    번호 풀로 "t if m" 보장 휠을 생성합니다.
+    반환: 정렬된 6개 번호 리스트의 리스트
+    """
+    pool = sorted(pool)
+    validate(pool, guarantee)
+    t, m = GUARANTEES[guarantee]
+    v = len(pool)
+
+    design = _load_tables().get(_table_key(v, t, m)) if use_tables else None
+    if design is None:
+        design = _search(v, t, m, iterations, seed)
+    return sorted(sorted(pool[i] for i in ticket) for ticket in design)
+
+
+def verify_wheel(pool, tickets, guarantee):
+    """모든 m-부분집합이 어떤 티켓과 t개 이상 겹치는지 확인합니다."""
+    pool = sorted(pool)
+    t, m = GUARANTEES[guarantee]
+    position = {num: i for i, num in enumerate(pool)}
+    state = _CoverState(len(pool), t, m)
+    for ticket in tickets:
+        state.add(sum(1 << position[num] for num in ticket))
+    return bool((state.counts > 0).all())
+
+
+def build_tables(max_pool=14, guarantees=("3 if 3", "3 if 4", "3 if 5", "3 if 6", "4 if 4", "4 if 5", "4 if 6"),
+                 iterations=2000):
+    """자주 쓰는 디자인을 미리 계산하여 wheel_tables.json에 저장합니다."""
+    tables = {}
+    for guarantee in guarantees:
+        t, m = GUARANTEES[guarantee]
+        for v in range(max(TICKET_SIZE, m), max_pool + 1):
+            design = _search(v, t, m, iterations, seed=0)
+            tables[_table_key(v, t, m)] = design
+            print(f"{guarantee} / 풀 {v}개: {len(design)}장")
+    with open(TABLES_PATH, 'w', encoding='utf-8') as f:
+        json.dump(tables, f, separators=(',', ':'))
+    return tables
+
+
+if __name__ == '__main__':
+    # 사용법: python wheel.py  (미리 계산된 디자인 표를 다시 생성)
+    build_tables()
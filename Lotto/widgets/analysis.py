@@ -5,11 +5,18 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QIntValidator
 from .mpl_canvas import MplCanvas
+from analysis_service import AnalysisService
 
 class AnalysisWidget(QWidget):
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, analysis_service=None):
         super().__init__()
         self.data_manager = data_manager
+        # 무거운 분석(pandas)은 서비스가 스레드 풀에서 계산하고 시그널로 결과를 전달
+        self.analysis_service = analysis_service or AnalysisService(data_manager, parent=self)
+        self.analysis_service.result_ready.connect(self.on_analysis_ready)
+        self.analysis_service.error.connect(self.on_analysis_error)
+        self.all_freq_data = []
+        self.gap_analysis_data = []
         self.init_ui()
         self.load_analysis_data()
 
@@ -30,6 +37,16 @@ class AnalysisWidget(QWidget):
         # Left Panel: Settings
         freq_left_panel = QGroupBox("분석 설정")
         freq_left_layout = QVBoxLayout()
+
+        # 분석 구간 선택 (전체 / 최근 N회 / 연도별)
+        freq_left_layout.addWidget(QLabel("분석 구간:"))
+        self.window_combo = QComboBox()
+        for label, window in self.data_manager.get_window_presets():
+            self.window_combo.addItem(label, window)
+        self.window_combo.currentIndexChanged.connect(self.on_window_changed)
+        freq_left_layout.addWidget(self.window_combo)
+
+        freq_left_layout.addSpacing(20)
         
         # 특정 번호 검색
         search_specific_layout = QVBoxLayout()
@@ -182,6 +199,17 @@ class AnalysisWidget(QWidget):
         self.plot_button = QPushButton("번호별 출현 빈도 그래프")
         self.plot_button.clicked.connect(self.plot_frequency_chart)
         viz_left_layout.addWidget(self.plot_button)
+
+        viz_left_layout.addSpacing(20)
+
+        # 연도별 출현 추이
+        viz_left_layout.addWidget(QLabel("추이를 볼 번호 (1~45):"))
+        self.trend_num_spinbox = QSpinBox()
+        self.trend_num_spinbox.setRange(1, 45)
+        viz_left_layout.addWidget(self.trend_num_spinbox)
+        self.trend_plot_button = QPushButton("연도별 출현 추이 그래프")
+        self.trend_plot_button.clicked.connect(self.plot_yearly_trend_chart)
+        viz_left_layout.addWidget(self.trend_plot_button)
         
         viz_left_layout.addStretch(1)
         viz_left_panel.setLayout(viz_left_layout)
@@ -200,20 +228,44 @@ class AnalysisWidget(QWidget):
         self.setLayout(layout)
 
     def load_analysis_data(self):
-        # 이 함수는 초기화 시 한 번만 호출되어 모든 분석 데이터를 로드하고 UI에 표시합니다.
-        self.all_freq_data = self.data_manager.get_number_frequency()
-        self.gap_analysis_data = self.data_manager.get_gap_analysis()
-        self.display_frequency_table() # 초기 로드 시 전체 빈도 표시
-        self.display_gap_analysis() # 초기 로드 시 미출현 기간 분석 표시
+        # 초기화 시 한 번 호출되어 모든 분석을 백그라운드로 요청합니다. 결과는 on_analysis_ready에서 표시
+        self.specific_num_result_label.setText("결과: 분석 데이터를 불러오는 중...")
+        self.analysis_service.request('frequency', **self.window_combo.currentData())
+        self.analysis_service.request('gaps')
         self.analyze_pairs_2()
         self.analyze_pairs_3()
-        self.plot_frequency_chart()
+
+    def on_window_changed(self):
+        self.analysis_service.request('frequency', **self.window_combo.currentData())
+
+    def on_analysis_ready(self, kind, params, result):
+        """분석 서비스 결과 수신 (GUI 스레드)"""
+        if kind == 'frequency':
+            if params != self.window_combo.currentData(): # 그 사이 구간이 바뀐 경우 무시
+                return
+            if not self.all_freq_data:
+                self.specific_num_result_label.setText("결과:")
+            self.all_freq_data = result
+            self.display_frequency_table()
+            self.plot_frequency_chart()
+        elif kind == 'gaps':
+            self.gap_analysis_data = result
+            self.display_gap_analysis()
+        elif kind == 'pairs':
+            if params['pair_size'] == 2:
+                self.show_pair_table(self.pair2_table, result[:self.pair2_spinbox.value()])
+            else:
+                self.show_pair_table(self.pair3_table, result[:self.pair3_spinbox.value()])
+
+    def on_analysis_error(self, kind, message):
+        QMessageBox.critical(self, "분석 오류", f"분석 데이터를 계산하는 중 오류가 발생했습니다 ({kind}): {message}")
 
     def display_frequency_table(self, top_n=None, bottom_n=None):
+        # 상위/하위 N개는 현재 구간의 빈도 데이터를 정렬해서 사용 (추가 계산 없음)
         if top_n:
-            data = self.data_manager.get_top_n_frequencies(top_n, ascending=False)
+            data = sorted(self.all_freq_data, key=lambda x: x['count'], reverse=True)[:top_n]
         elif bottom_n:
-            data = self.data_manager.get_top_n_frequencies(bottom_n, ascending=True)
+            data = sorted(self.all_freq_data, key=lambda x: x['count'])[:bottom_n]
         else:
             data = self.all_freq_data # 전체 데이터
 
@@ -236,7 +288,7 @@ class AnalysisWidget(QWidget):
                     found_count = item['count']
                     break
             
-            self.specific_num_result_label.setText(f"결과: 번호 {num}은(는) 총 {found_count}회 출현했습니다.")
+            self.specific_num_result_label.setText(f"결과: 번호 {num}은(는) {self.window_combo.currentText()} 동안 총 {found_count}회 출현했습니다.")
 
         except ValueError:
             QMessageBox.warning(self, "입력 오류", "1에서 45 사이의 유효한 숫자를 입력하세요.")
@@ -251,24 +303,26 @@ class AnalysisWidget(QWidget):
             self.gap_table.setItem(row_idx, 2, QTableWidgetItem(str(item['gap'])))
 
     def analyze_pairs_2(self):
-        top_n = self.pair2_spinbox.value()
-        data = self.data_manager.get_pair_frequencies(pair_size=2, top_n=top_n)
-        self.pair2_table.setRowCount(len(data))
-        for row_idx, item in enumerate(data):
-            self.pair2_table.setItem(row_idx, 0, QTableWidgetItem(item['pair']))
-            self.pair2_table.setItem(row_idx, 1, QTableWidgetItem(str(item['count'])))
+        # 최초 1회만 백그라운드 계산, 이후에는 캐시된 결과가 바로 전달됨
+        self.analysis_service.request('pairs', pair_size=2)
 
     def analyze_pairs_3(self):
-        top_n = self.pair3_spinbox.value()
-        data = self.data_manager.get_pair_frequencies(pair_size=3, top_n=top_n)
-        self.pair3_table.setRowCount(len(data))
+        self.analysis_service.request('pairs', pair_size=3)
+
+    def show_pair_table(self, table, data):
+        table.setRowCount(len(data))
         for row_idx, item in enumerate(data):
-            self.pair3_table.setItem(row_idx, 0, QTableWidgetItem(item['pair']))
-            self.pair3_table.setItem(row_idx, 1, QTableWidgetItem(str(item['count'])))
+            table.setItem(row_idx, 0, QTableWidgetItem(item['pair']))
+            table.setItem(row_idx, 1, QTableWidgetItem(str(item['count'])))
 
     def plot_frequency_chart(self):
-        freq_data_for_plot = self.data_manager.get_number_frequency(include_bonus=True)
+        freq_data_for_plot = sorted(self.all_freq_data, key=lambda x: x['number'])
         x_data = [item['number'] for item in freq_data_for_plot]
         y_data = [item['count'] for item in freq_data_for_plot]
         
-        self.canvas.plot_bar(x_data, y_data, "번호별 총 출현 횟수 (보너스 포함)", "로또 번호", "출현 횟수")
+        self.canvas.plot_bar(x_data, y_data, f"번호별 출현 횟수 - {self.window_combo.currentText()} (보너스 포함)", "로또 번호", "출현 횟수")
+
+    def plot_yearly_trend_chart(self):
+        num = self.trend_num_spinbox.value()
+        years, matrix = self.data_manager.get_yearly_frequencies(include_bonus=True)
+        self.canvas.plot_bar(years, matrix[:, num - 1].tolist(), f"번호 {num} 연도별 출현 횟수 (보너스 포함)", "연도", "출현 횟수")
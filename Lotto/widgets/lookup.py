@@ -1,10 +1,11 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, 
     QTableWidget, QTableWidgetItem, QMessageBox, QGroupBox, QComboBox, 
-    QDateEdit, QHeaderView
+    QDateEdit, QHeaderView, QCheckBox
 )
 from PyQt6.QtCore import QDate
 from PyQt6.QtGui import QIntValidator
+from scoring import RANK_LABELS
 
 class LookupWidget(QWidget):
     def __init__(self, data_manager):
@@ -42,6 +43,9 @@ class LookupWidget(QWidget):
         date_selection_layout.addWidget(QLabel("~"))
         date_selection_layout.addWidget(self.end_date_edit)
         date_group.addLayout(date_selection_layout)
+        # 다른 조건과 함께 날짜 범위로 결과를 제한 (다른 조건이 없으면 항상 날짜 범위로 조회)
+        self.restrict_date_checkbox = QCheckBox("다른 조건과 함께 날짜 범위 적용")
+        date_group.addWidget(self.restrict_date_checkbox)
         left_layout.addLayout(date_group)
 
         left_layout.addSpacing(10)
@@ -54,9 +58,18 @@ class LookupWidget(QWidget):
         numbers_group.addWidget(self.search_numbers_input)
 
         self.match_type_combo = QComboBox()
-        self.match_type_combo.addItems(["모든 번호 포함", "하나라도 포함"])
+        self.match_type_combo.addItems(["모든 번호 포함", "하나라도 포함", "당첨 등수 패턴 (6개 번호)"])
+        self.match_type_combo.currentIndexChanged.connect(self.on_match_type_changed)
         numbers_group.addWidget(self.match_type_combo)
 
+        # 당첨 등수 패턴: 입력한 6개 번호가 해당 등수로 당첨됐을 회차
+        self.rank_combo = QComboBox()
+        self.rank_combo.addItem("1~5등 전체", (1, 2, 3, 4, 5))
+        for rank, label in RANK_LABELS.items():
+            self.rank_combo.addItem(label, (rank,))
+        self.rank_combo.setEnabled(False)
+        numbers_group.addWidget(self.rank_combo)
+
         self.include_bonus_combo = QComboBox()
         self.include_bonus_combo.addItems(["보너스 번호 포함 검색", "보너스 번호 제외 검색"])
         numbers_group.addWidget(self.include_bonus_combo)
@@ -107,44 +120,57 @@ class LookupWidget(QWidget):
                 return []
         return sorted(list(set(numbers)))
 
+    def on_match_type_changed(self, index):
+        is_rank_pattern = index == 2
+        self.rank_combo.setEnabled(is_rank_pattern)
+        self.include_bonus_combo.setEnabled(not is_rank_pattern) # 등수 판정은 보너스 규칙을 따로 적용
+
     def perform_search(self):
+        """입력된 조건들을 조회 인덱스의 쿼리로 만들어 AND로 조합합니다."""
         self.result_table.setRowCount(0) # 기존 결과 초기화
         
         draw_no_text = self.draw_no_input.text()
         start_date = self.start_date_edit.date()
         end_date = self.end_date_edit.date()
         search_numbers_text = self.search_numbers_input.text()
-        
-        results = []
+
+        index = self.data_manager.draw_index
+        query = index.all()
 
         if draw_no_text: # 회차 검색
             try:
                 draw_no = int(draw_no_text)
-                result = self.data_manager.get_draw_by_no(draw_no)
-                if result:
-                    results.append(result)
-                else:
-                    QMessageBox.information(self, "조회 결과", f"{draw_no}회차 정보를 찾을 수 없습니다.")
             except ValueError:
                 QMessageBox.warning(self, "입력 오류", "회차는 숫자여야 합니다.")
                 return
-        elif search_numbers_text: # 번호 포함 검색
+            query = query & index.draw_no(draw_no)
+            if not len(query):
+                QMessageBox.information(self, "조회 결과", f"{draw_no}회차 정보를 찾을 수 없습니다.")
+
+        if search_numbers_text: # 번호 포함 검색
             search_numbers = self.parse_number_input(search_numbers_text)
             if not search_numbers:
                 return # 파싱 오류 발생 시 중단
-            
-            match_all = (self.match_type_combo.currentIndex() == 0) # 0: 모든 번호 포함, 1: 하나라도 포함
-            include_bonus = (self.include_bonus_combo.currentIndex() == 0) # 0: 보너스 포함, 1: 보너스 제외
 
-            results = self.data_manager.get_draws_by_numbers(search_numbers, match_all, include_bonus)
-
-        else: # 날짜 범위 검색
+            match_type = self.match_type_combo.currentIndex() # 0: 모든 번호 포함, 1: 하나라도 포함, 2: 등수 패턴
+            include_bonus = (self.include_bonus_combo.currentIndex() == 0) # 0: 보너스 포함, 1: 보너스 제외
+            if match_type == 2:
+                if len(search_numbers) != 6:
+                    QMessageBox.warning(self, "입력 오류", "당첨 등수 패턴 조회는 서로 다른 번호 6개가 필요합니다.")
+                    return
+                query = query & index.rank_pattern(search_numbers, self.rank_combo.currentData())
+            elif match_type == 0:
+                query = query & index.numbers_all(search_numbers, include_bonus)
+            else:
+                query = query & index.numbers_any(search_numbers, include_bonus)
+
+        if not (draw_no_text or search_numbers_text) or self.restrict_date_checkbox.isChecked(): # 날짜 범위 검색
             if start_date > end_date:
                 QMessageBox.warning(self, "입력 오류", "시작 날짜는 종료 날짜보다 빠르거나 같아야 합니다.")
                 return
-            results = self.data_manager.get_draws_by_date_range(start_date, end_date)
+            query = query & index.date_range(start_date, end_date)
 
-        self.display_results(results)
+        self.display_results(query.records())
 
     def display_results(self, results):
         self.result_table.setRowCount(len(results))
@@ -3,9 +3,43 @@ import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, 
     QListWidget, QMessageBox, QGroupBox, QFormLayout, QDialog, QTableWidget, 
-    QTableWidgetItem, QHeaderView
+    QTableWidgetItem, QHeaderView, QComboBox
 )
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, QThread
+from wheel import generate_wheel, validate, GUARANTEES, MAX_POOL
+from probability import portfolio_summary
+from scoring import RANK_LABELS
+
+class ProbabilityWorker(QThread):
+    """포트폴리오 당첨 확률 계산(전체 조합 열거)을 백그라운드에서 실행합니다."""
+    finished_result = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, tickets):
+        super().__init__()
+        self.tickets = tickets
+
+    def run(self):
+        try:
+            self.finished_result.emit(portfolio_summary(self.tickets))
+        except Exception as e:
+            self.error.emit(str(e))
+
+class WheelWorker(QThread):
+    """휠(커버링 디자인) 생성을 백그라운드에서 실행합니다."""
+    finished_result = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, pool, guarantee):
+        super().__init__()
+        self.pool = pool
+        self.guarantee = guarantee
+
+    def run(self):
+        try:
+            self.finished_result.emit(generate_wheel(self.pool, self.guarantee))
+        except Exception as e:
+            self.error.emit(str(e))
 
 class MyNumbersWidget(QWidget):
     def __init__(self, data_manager, prediction_widget_signal):
@@ -70,7 +104,30 @@ class MyNumbersWidget(QWidget):
         self.load_to_prediction_button.setEnabled(False)
         action_button_layout.addWidget(self.load_to_prediction_button)
 
+        self.probability_button = QPushButton("저장된 번호 전체 당첨 확률 분석")
+        self.probability_button.clicked.connect(self.analyze_portfolio)
+        action_button_layout.addWidget(self.probability_button)
+
         left_layout.addLayout(action_button_layout)
+
+        left_layout.addSpacing(20)
+
+        # 번호 풀 휠링 (커버링 디자인)
+        wheel_group = QGroupBox("번호 풀 휠링")
+        wheel_layout = QFormLayout()
+        self.wheel_pool_input = QLineEdit()
+        self.wheel_pool_input.setPlaceholderText(f"최대 {MAX_POOL}개 (쉼표로 구분)")
+        wheel_layout.addRow("번호 풀:", self.wheel_pool_input)
+        self.wheel_guarantee_combo = QComboBox()
+        self.wheel_guarantee_combo.addItems(list(GUARANTEES))
+        self.wheel_guarantee_combo.setCurrentText("3 if 4")
+        self.wheel_guarantee_combo.setToolTip("'t if m': 당첨 번호 m개가 풀에 있으면 최소 한 장은 t개 일치를 보장")
+        wheel_layout.addRow("보장 조건:", self.wheel_guarantee_combo)
+        self.wheel_button = QPushButton("휠 생성")
+        self.wheel_button.clicked.connect(self.generate_wheel_sets)
+        wheel_layout.addRow(self.wheel_button)
+        wheel_group.setLayout(wheel_layout)
+        left_layout.addWidget(wheel_group)
         
         left_layout.addStretch(1)
         left_panel.setLayout(left_layout)
@@ -273,6 +330,109 @@ class MyNumbersWidget(QWidget):
         dialog.setLayout(dialog_layout)
         dialog.exec()
 
+    def analyze_portfolio(self):
+        if not self.my_numbers_list:
+            QMessageBox.warning(self, "분석 오류", "저장된 번호가 없습니다.")
+            return
+        tickets = [item['numbers'] for item in self.my_numbers_list]
+        self.probability_button.setEnabled(False)
+        self.probability_button.setText("계산 중... (전체 조합 열거)")
+        self.probability_worker = ProbabilityWorker(tickets)
+        self.probability_worker.finished_result.connect(self.show_portfolio_summary)
+        self.probability_worker.error.connect(self.on_probability_error)
+        self.probability_worker.start()
+
+    def on_probability_error(self, message):
+        self.probability_button.setEnabled(True)
+        self.probability_button.setText("저장된 번호 전체 당첨 확률 분석")
+        QMessageBox.critical(self, "분석 오류", message)
+
+    def show_portfolio_summary(self, summary):
+        self.probability_button.setEnabled(True)
+        self.probability_button.setText("저장된 번호 전체 당첨 확률 분석")
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"당첨 확률 분석 ({summary['tickets']}장)")
+        dialog.setGeometry(100, 100, 600, 400)
+        dialog_layout = QVBoxLayout()
+        dialog_layout.addWidget(QLabel(
+            f"구매 비용: {summary['cost']:,}원 / 기대 당첨금: {summary['expected_value']:,.0f}원 "
+            f"(기대 수익률 {summary['roi']:+.1%})\n"
+            f"한 장 이상 당첨될 확률: {summary['p_any_win']:.4%}"
+        ))
+
+        table = QTableWidget()
+        table.setColumnCount(3)
+        table.setHorizontalHeaderLabels(['등수', '최고 등수 확률', '당첨 장수 기대값'])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setRowCount(5)
+        for row_idx, rank in enumerate(range(1, 6)):
+            table.setItem(row_idx, 0, QTableWidgetItem(RANK_LABELS[rank]))
+            table.setItem(row_idx, 1, QTableWidgetItem(f"{summary['best_tier'][rank]:.8%}"))
+            table.setItem(row_idx, 2, QTableWidgetItem(f"{summary['expected_counts'][rank]:.6f}"))
+        dialog_layout.addWidget(table)
+        dialog_layout.addWidget(QLabel("* 1~3등 당첨금은 회차별로 달라지므로 평균적인 금액을 가정한 값입니다."))
+
+        dialog.setLayout(dialog_layout)
+        dialog.exec()
+
+    def generate_wheel_sets(self):
+        text = self.wheel_pool_input.text()
+        try:
+            pool = sorted(set(int(x.strip()) for x in text.split(',') if x.strip()))
+            validate(pool, self.wheel_guarantee_combo.currentText())
+        except ValueError as e:
+            QMessageBox.warning(self, "입력 오류", f"번호 풀을 확인해주세요: {e}")
+            return
+
+        self.wheel_button.setEnabled(False)
+        self.wheel_button.setText("생성 중...")
+        self.wheel_worker = WheelWorker(pool, self.wheel_guarantee_combo.currentText())
+        self.wheel_worker.finished_result.connect(self.show_wheel)
+        self.wheel_worker.error.connect(self.on_wheel_error)
+        self.wheel_worker.start()
+
+    def on_wheel_error(self, message):
+        self.wheel_button.setEnabled(True)
+        self.wheel_button.setText("휠 생성")
+        QMessageBox.critical(self, "휠 생성 오류", message)
+
+    def show_wheel(self, tickets):
+        self.wheel_button.setEnabled(True)
+        self.wheel_button.setText("휠 생성")
+        guarantee = self.wheel_guarantee_combo.currentText()
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"휠 생성 결과 ({guarantee}, {len(tickets)}장)")
+        dialog.setGeometry(100, 100, 500, 500)
+        dialog_layout = QVBoxLayout()
+        dialog_layout.addWidget(QLabel(f"'{guarantee}' 보장을 만족하는 {len(tickets)}장의 티켓"))
+
+        ticket_list = QListWidget()
+        ticket_list.addItems([f"{i+1}: {', '.join(map(str, t))}" for i, t in enumerate(tickets)])
+        dialog_layout.addWidget(ticket_list)
+
+        save_button = QPushButton("나의 번호로 모두 저장")
+        save_button.clicked.connect(lambda: (self.save_wheel_sets(tickets, guarantee), dialog.accept()))
+        dialog_layout.addWidget(save_button)
+
+        dialog.setLayout(dialog_layout)
+        dialog.exec()
+
+    def save_wheel_sets(self, tickets, guarantee):
+        existing = {item['name'] for item in self.my_numbers_list}
+        prefix = f"휠 {guarantee}"
+        for i, ticket in enumerate(tickets, start=1):
+            name = f"{prefix} #{i}"
+            suffix = 2
+            while name in existing: # 중복 이름 방지
+                name = f"{prefix} #{i} ({suffix})"
+                suffix += 1
+            existing.add(name)
+            self.my_numbers_list.append({"name": name, "numbers": ticket})
+        self.save_my_numbers()
+        self.refresh_list_widget()
+
     def load_selected_to_prediction(self):
         selected_items = self.my_numbers_list_widget.selectedItems()
         if not selected_items:
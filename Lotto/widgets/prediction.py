@@ -2,10 +2,56 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, 
     QListWidget, QMessageBox, QGroupBox, QComboBox, QSpinBox, QFormLayout
 )
-from PyQt6.QtCore import pyqtSignal
-from predictor import LottoPredictor
+from PyQt6.QtCore import pyqtSignal, QThread
+from predictor import LottoPredictor, BACKENDS
+from backtest import run_backtest, STRATEGIES
+from pattern_filter import PATTERN_NAMES, suggest_constraints
+from markov import carry_over_stats
 import numpy as np
 
+class ModelLoadWorker(QThread):
+    """저장된 예측 모델을 백그라운드에서 불러오고, 신규 회차가 있으면 증분 학습합니다."""
+    loaded = pyqtSignal(bool)
+
+    def __init__(self, predictor):
+        super().__init__()
+        self.predictor = predictor
+
+    def run(self):
+        self.loaded.emit(self.predictor.load_model())
+
+class BacktestWorker(QThread):
+    """전략 백테스트를 백그라운드에서 실행합니다 (전략별로 프로세스 풀에서 병렬 실행)."""
+    finished_result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, data_manager, tickets, backend):
+        super().__init__()
+        self.data_manager = data_manager
+        self.tickets = tickets
+        self.backend = backend
+
+    def run(self):
+        try:
+            self.finished_result.emit(run_backtest(self.data_manager, tickets=self.tickets, backend=self.backend))
+        except Exception as e:
+            self.error.emit(str(e))
+
+class CrossValidateWorker(QThread):
+    """시계열 교차검증을 백그라운드에서 실행합니다 (fold마다 모델을 새로 학습)."""
+    finished_result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, predictor):
+        super().__init__()
+        self.predictor = predictor
+
+    def run(self):
+        try:
+            self.finished_result.emit(self.predictor.cross_validate())
+        except Exception as e:
+            self.error.emit(str(e))
+
 class PredictionWidget(QWidget):
     # '내 번호' 탭에서 번호를 가져올 때 사용될 시그널
     load_numbers_to_prediction = pyqtSignal(list)
@@ -16,6 +62,28 @@ class PredictionWidget(QWidget):
         self.predictor = LottoPredictor(data_manager) # ML 예측기 초기화
         self.init_ui()
 
+        # 저장된 모델은 시작 시 백그라운드에서 불러옴 (UI 블로킹 방지)
+        self.start_model_loader()
+
+    def start_model_loader(self):
+        self.model_status_label.setText("모델: 저장된 모델 확인 중...")
+        self.model_loader = ModelLoadWorker(self.predictor)
+        self.model_loader.loaded.connect(self.on_model_loaded)
+        self.model_loader.start()
+
+    def on_backend_changed(self):
+        # 모델 구조가 바뀌면 해당 구조의 캐시를 다시 불러옴
+        if self.model_loader.isRunning():
+            self.model_loader.wait()
+        self.predictor = LottoPredictor(self.data_manager, backend=self.backend_combo.currentData())
+        self.start_model_loader()
+
+    def on_model_loaded(self, success):
+        if success:
+            self.model_status_label.setText(f"모델: 저장된 모델 사용 중 ({self.predictor.fingerprint()['max_draw_no']}회차까지 반영)")
+        else:
+            self.model_status_label.setText("모델: 저장된 모델 없음 (첫 예측 시 학습)")
+
     def init_ui(self):
         main_layout = QHBoxLayout() # 메인 레이아웃을 가로 배치로 변경
 
@@ -26,14 +94,33 @@ class PredictionWidget(QWidget):
         form_layout = QFormLayout()
 
         self.num_sets_spinbox = QSpinBox()
-        self.num_sets_spinbox.setRange(1, 10)
+        self.num_sets_spinbox.setRange(1, 10000)
         self.num_sets_spinbox.setValue(5)
         form_layout.addRow("예측 세트 수:", self.num_sets_spinbox)
 
         self.prediction_method_combo = QComboBox()
-        self.prediction_method_combo.addItems(["독립 시행 (순수 랜덤)", "통계 기반 예측", "머신러닝 예측 (XGBoost)"])
+        self.prediction_method_combo.addItems(["독립 시행 (순수 랜덤)", "통계 기반 예측", "머신러닝 예측 (XGBoost)", "마르코프 전이 예측"])
         form_layout.addRow("예측 방식:", self.prediction_method_combo)
 
+        # 통계 기반 예측에 사용할 빈도 구간
+        self.stat_window_combo = QComboBox()
+        for label, window in self.data_manager.get_window_presets():
+            self.stat_window_combo.addItem(label, window)
+        form_layout.addRow("통계 구간:", self.stat_window_combo)
+
+        # 마르코프 전이 예측: 최근 회차로부터 몇 회차 뒤를 예측할지 (전이 행렬 거듭제곱 차수)
+        self.markov_steps_spinbox = QSpinBox()
+        self.markov_steps_spinbox.setRange(1, 10)
+        self.markov_steps_spinbox.setValue(1)
+        form_layout.addRow("전이 단계 (k):", self.markov_steps_spinbox)
+
+        # 머신러닝 예측 모델 구조
+        self.backend_combo = QComboBox()
+        for backend, label in BACKENDS.items():
+            self.backend_combo.addItem(label, backend)
+        self.backend_combo.currentIndexChanged.connect(self.on_backend_changed)
+        form_layout.addRow("모델 구조:", self.backend_combo)
+
         # 제외/포함 번호 설정
         self.exclude_numbers_input = QLineEdit()
         self.exclude_numbers_input.setPlaceholderText("예: 44, 45 (쉼표로 구분)")
@@ -45,9 +132,27 @@ class PredictionWidget(QWidget):
 
         left_layout.addLayout(form_layout)
 
+        left_layout.addWidget(self.create_pattern_filter_group())
+
         self.predict_button = QPushButton("예측하기")
         self.predict_button.clicked.connect(self.predict_numbers)
         left_layout.addWidget(self.predict_button)
+
+        self.validate_button = QPushButton("모델 검증 (시계열 교차검증)")
+        self.validate_button.clicked.connect(self.validate_model)
+        left_layout.addWidget(self.validate_button)
+
+        self.transition_button = QPushButton("번호 전이 통계 보기")
+        self.transition_button.clicked.connect(self.show_transition_stats)
+        left_layout.addWidget(self.transition_button)
+
+        self.backtest_button = QPushButton("전략 백테스트 (과거 회차 재생)")
+        self.backtest_button.clicked.connect(self.run_backtest)
+        left_layout.addWidget(self.backtest_button)
+
+        self.model_status_label = QLabel("모델: 저장된 모델 확인 중...")
+        self.model_status_label.setWordWrap(True)
+        left_layout.addWidget(self.model_status_label)
         
         left_layout.addStretch(1) # 하단 여백 채우기
         left_panel.setLayout(left_layout)
@@ -70,6 +175,84 @@ class PredictionWidget(QWidget):
         # 시그널 연결 (MyNumbersWidget에서 번호를 가져올 때 사용)
         self.load_numbers_to_prediction.connect(self.set_include_numbers)
 
+    def create_pattern_filter_group(self):
+        """과거 당첨 패턴 필터 설정 (기본값: 과거 분포의 중앙 90% 구간)"""
+        self.pattern_group = QGroupBox("패턴 필터 (과거 당첨 분포 기반)")
+        self.pattern_group.setCheckable(True)
+        self.pattern_group.setChecked(False)
+        layout = QFormLayout()
+
+        defaults = suggest_constraints(self.data_manager.get_pattern_distributions())
+
+        def range_row(bounds, lo, hi):
+            row = QHBoxLayout()
+            spins = []
+            for value in bounds:
+                spin = QSpinBox()
+                spin.setRange(lo, hi)
+                spin.setValue(value)
+                spins.append(spin)
+            row.addWidget(spins[0])
+            row.addWidget(QLabel("~"))
+            row.addWidget(spins[1])
+            return row, spins
+
+        row, self.sum_range_spins = range_row(defaults['sum_range'], 21, 255)
+        layout.addRow("번호 합계:", row)
+        row, self.odd_count_spins = range_row(defaults['odd_count'], 0, 6)
+        layout.addRow("홀수 개수:", row)
+        row, self.low_count_spins = range_row(defaults['low_count'], 0, 6)
+        layout.addRow(f"{PATTERN_NAMES['low']}:", row)
+        row, self.recent_overlap_spins = range_row(defaults['recent_overlap'], 0, 6)
+        layout.addRow("직전 회차 중복:", row)
+
+        self.max_consecutive_spinbox = QSpinBox()
+        self.max_consecutive_spinbox.setRange(1, 6)
+        self.max_consecutive_spinbox.setValue(defaults['max_consecutive'])
+        layout.addRow("최대 연속 번호:", self.max_consecutive_spinbox)
+
+        self.min_last_digits_spinbox = QSpinBox()
+        self.min_last_digits_spinbox.setRange(1, 6)
+        self.min_last_digits_spinbox.setValue(defaults['min_last_digits'])
+        layout.addRow("끝자리 최소 종류:", self.min_last_digits_spinbox)
+
+        self.pattern_stats_button = QPushButton("과거 패턴 분포 보기")
+        self.pattern_stats_button.clicked.connect(self.show_pattern_distributions)
+        layout.addRow(self.pattern_stats_button)
+
+        self.pattern_group.setLayout(layout)
+        return self.pattern_group
+
+    def get_pattern_constraints(self):
+        """패턴 필터가 켜져 있으면 제약 조건 dict, 아니면 None"""
+        if not self.pattern_group.isChecked():
+            return None
+
+        def bounds(spins):
+            return tuple(sorted(spin.value() for spin in spins))
+
+        return {
+            'sum_range': bounds(self.sum_range_spins),
+            'odd_count': bounds(self.odd_count_spins),
+            'low_count': bounds(self.low_count_spins),
+            'max_consecutive': self.max_consecutive_spinbox.value(),
+            'min_last_digits': self.min_last_digits_spinbox.value(),
+            'recent_overlap': bounds(self.recent_overlap_spins),
+        }
+
+    def show_pattern_distributions(self):
+        """과거 당첨 번호의 패턴별 분포를 결과 목록에 표시합니다."""
+        self.result_list_widget.clear()
+        for name, dist in self.data_manager.get_pattern_distributions().items():
+            if name == 'sum': # 합계는 값이 많으므로 10 단위 구간으로 묶음
+                binned = {}
+                for value, ratio in dist.items():
+                    binned[value // 10 * 10] = binned.get(value // 10 * 10, 0) + ratio
+                text = ', '.join(f"{v}~{v + 9}: {r:.1%}" for v, r in sorted(binned.items()))
+            else:
+                text = ', '.join(f"{v}: {r:.1%}" for v, r in sorted(dist.items()))
+            self.result_list_widget.addItem(f"[{PATTERN_NAMES[name]}] {text}")
+
     def set_include_numbers(self, numbers):
         """'내 번호' 탭에서 전달된 번호를 포함할 번호 입력 필드에 설정합니다."""
         self.include_numbers_input.setText(', '.join(map(str, numbers)))
@@ -108,51 +291,158 @@ class PredictionWidget(QWidget):
             QMessageBox.warning(self, "입력 오류", f"포함할 번호가 6개({len(include_numbers)}개)를 초과할 수 없습니다. 처음 6개만 사용됩니다.")
             include_numbers = include_numbers[:6]
 
+        constraints = self.get_pattern_constraints()
         self.result_list_widget.clear()
         
-        for i in range(num_sets):
-            predicted_nums = []
-            if method == "독립 시행 (순수 랜덤)":
-                predicted_nums = self.data_manager.generate_random_numbers(
-                    exclude_numbers=exclude_numbers, include_numbers=include_numbers
-                )
-            elif method == "통계 기반 예측":
-                predicted_nums = self.data_manager.generate_statistical_numbers(
-                    exclude_numbers=exclude_numbers, include_numbers=include_numbers
+        # 모든 세트를 한 번에 생성 (가중치 계산 1회 + 벡터화된 비복원 추출)
+        predicted_sets = []
+        if method == "독립 시행 (순수 랜덤)":
+            predicted_sets = self.data_manager.generate_batch(
+                num_sets, 'random', exclude_numbers=exclude_numbers, include_numbers=include_numbers,
+                constraints=constraints
+            )
+        elif method == "통계 기반 예측":
+            predicted_sets = self.data_manager.generate_batch(
+                num_sets, 'statistical', exclude_numbers=exclude_numbers, include_numbers=include_numbers,
+                window=self.stat_window_combo.currentData(), constraints=constraints
+            )
+        elif method == "마르코프 전이 예측":
+            # 전이 행렬은 구간별로 캐시되므로 점수 계산은 즉시 끝남 (통계 구간 설정을 학습 구간으로 사용)
+            predicted_sets = self.data_manager.generate_batch(
+                num_sets, 'markov', exclude_numbers=exclude_numbers, include_numbers=include_numbers,
+                window=self.stat_window_combo.currentData(), constraints=constraints,
+                markov_steps=self.markov_steps_spinbox.value()
+            )
+        elif method == "머신러닝 예측 (XGBoost)":
+            # 백그라운드 모델 로드가 끝날 때까지 대기 (동시에 학습하지 않도록)
+            if self.model_loader.isRunning():
+                self.model_loader.wait()
+
+            # ML 모델 학습 (필요한 경우)
+            if not self.predictor.is_trained:
+                self.result_list_widget.addItem("모델 학습 중... 잠시만 기다려주세요.")
+                QMessageBox.information(self, "학습 시작", "머신러닝 모델(XGBoost) 학습을 시작합니다. 데이터 양에 따라 시간이 소요될 수 있습니다.")
+                success = self.predictor.train()
+                self.result_list_widget.clear()
+                if not success:
+                    QMessageBox.critical(self, "오류", "모델 학습에 실패했습니다. 데이터 부족 등의 이유일 수 있습니다.")
+                    return
+                self.on_model_loaded(True)
+
+            # diversity를 위해 noise_level 주입
+            # 0.0 ~ 0.2 사이의 노이즈를 세트마다 주어 확률 분포를 약간씩 흔듦
+            predicted_sets = self.predictor.predict_batch(
+                num_sets,
+                top_n=6, 
+                exclude_numbers=exclude_numbers, 
+                include_numbers=include_numbers,
+                noise_level=0.15, # 15% 정도의 변동성
+                constraints=constraints
+            )
+
+        if not predicted_sets:
+            self.result_list_widget.addItem("번호 생성 실패 (설정을 확인하세요)")
+            return
+        if constraints and len(predicted_sets) < num_sets:
+            self.result_list_widget.addItem(f"패턴 필터를 만족하는 조합이 {len(predicted_sets)}개뿐입니다.")
+        self.result_list_widget.addItems(
+            [f"예측 {i+1}: {', '.join(map(str, nums))}" for i, nums in enumerate(predicted_sets)]
+        )
+
+    def show_transition_stats(self):
+        """최근 회차 기준 전이 확률 상위 번호, 이월 개수 분포, 자주 나온 전이를 결과 목록에 표시합니다."""
+        window = self.stat_window_combo.currentData()
+        model = self.data_manager.get_markov_model(window)
+        lo, hi = self.data_manager.get_window_bounds(**window)
+        carry_over = carry_over_stats(self.data_manager.main_incidence[lo:hi])
+        latest = self.data_manager.get_latest_numbers()
+        k = self.markov_steps_spinbox.value()
+
+        self.result_list_widget.clear()
+        self.result_list_widget.addItem(f"[{self.stat_window_combo.currentText()}] 최근 회차 번호: {', '.join(map(str, latest))}")
+        scores = model.score(latest, k)
+        top = np.argsort(scores)[::-1][:10]
+        self.result_list_widget.addItem(
+            f"{k}회차 뒤 전이 확률 상위: " + ', '.join(f"{n + 1}({scores[n]:.2%})" for n in top)
+        )
+        self.result_list_widget.addItem(
+            "직전 회차 이월 개수 분포: " + ', '.join(f"{i}개 {r:.1%}" for i, r in enumerate(carry_over['distribution']))
+        )
+        per_number = carry_over['per_number']
+        top_carry = np.argsort(per_number)[::-1][:5]
+        self.result_list_widget.addItem(
+            "이월 확률 상위 번호: " + ', '.join(f"{n + 1}({per_number[n]:.1%})" for n in top_carry)
+        )
+        self.result_list_widget.addItem(
+            "가장 많이 나온 전이: " + ', '.join(f"{i}→{j} ({c}회)" for i, j, c in model.top_transitions(5))
+        )
+
+    def validate_model(self):
+        """Walk-forward 교차검증으로 XGBoost 모델과 균등 확률(6/45) 기준선의 log-loss를 비교합니다."""
+        self.validate_button.setEnabled(False)
+        self.result_list_widget.clear()
+        self.result_list_widget.addItem("교차검증 중... fold마다 모델을 새로 학습하므로 시간이 소요됩니다.")
+
+        self.validate_worker = CrossValidateWorker(self.predictor)
+        self.validate_worker.finished_result.connect(self.on_validate_finished)
+        self.validate_worker.error.connect(self.on_validate_error)
+        self.validate_worker.start()
+
+    def on_validate_finished(self, result):
+        self.validate_button.setEnabled(True)
+        self.result_list_widget.clear()
+        if result is None:
+            QMessageBox.critical(self, "오류", "교차검증에 필요한 데이터가 부족합니다.")
+            return
+
+        for i, fold in enumerate(result['folds']):
+            self.result_list_widget.addItem(
+                f"Fold {i+1} (학습 {fold['train_size']}회 / 검증 {fold['test_size']}회): "
+                f"모델 {fold['model_logloss']:.4f} vs 기준선 {fold['baseline_logloss']:.4f}"
+            )
+        self.result_list_widget.addItem(
+            f"평균 log-loss: 모델 {result['model_logloss'].mean():.4f} vs 기준선 {result['baseline_logloss'].mean():.4f} "
+            f"(skill {result['skill']:+.2%}, 양수일 때만 기준선보다 우수)"
+        )
+        # 기준선 대비 가장 잘/못 맞춘 번호
+        diff = result['baseline_logloss'] - result['model_logloss']
+        best = np.argsort(diff)[::-1][:5] + 1
+        worst = np.argsort(diff)[:5] + 1
+        self.result_list_widget.addItem(f"기준선 대비 개선 상위 번호: {', '.join(map(str, best))}")
+        self.result_list_widget.addItem(f"기준선 대비 악화 상위 번호: {', '.join(map(str, worst))}")
+
+    def on_validate_error(self, message):
+        self.validate_button.setEnabled(True)
+        self.result_list_widget.clear()
+        QMessageBox.critical(self, "오류", f"교차검증 중 오류가 발생했습니다: {message}")
+
+    def run_backtest(self):
+        """전체 과거 회차를 재생하며 랜덤/통계/XGBoost 전략의 등수별 적중률을 무작위 기대값과 비교합니다."""
+        tickets = min(self.num_sets_spinbox.value(), 100)
+        self.backtest_button.setEnabled(False)
+        self.result_list_widget.clear()
+        self.result_list_widget.addItem(f"백테스트 실행 중... (회차당 {tickets}장, XGBoost는 주기적 재학습으로 시간이 소요됩니다)")
+
+        self.backtest_worker = BacktestWorker(self.data_manager, tickets, self.backend_combo.currentData())
+        self.backtest_worker.finished_result.connect(self.on_backtest_finished)
+        self.backtest_worker.error.connect(self.on_backtest_error)
+        self.backtest_worker.start()
+
+    def on_backtest_finished(self, results):
+        self.backtest_button.setEnabled(True)
+        self.result_list_widget.clear()
+        if not results:
+            QMessageBox.warning(self, "데이터 부족", "백테스트에 필요한 과거 회차가 부족합니다.")
+            return
+        for strategy, result in results.items():
+            self.result_list_widget.addItem(f"[{STRATEGIES[strategy]}] {result['draws']}회 x {result['tickets']}장")
+            for tier in result['tiers']:
+                self.result_list_widget.addItem(
+                    f"    {tier['label']}: {tier['hits']}회, 적중률 {tier['rate']:.5%} "
+                    f"(95% CI {tier['lower']:.5%} ~ {tier['upper']:.5%} / 무작위 기대값 {tier['expected']:.5%})"
                 )
-            elif method == "머신러닝 예측 (XGBoost)":
-                # ML 모델 학습 (필요한 경우)
-                if not self.predictor.is_trained:
-                    self.result_list_widget.addItem("모델 학습 중... 잠시만 기다려주세요.")
-                    QMessageBox.information(self, "학습 시작", "머신러닝 모델(XGBoost) 학습을 시작합니다. 데이터 양에 따라 시간이 소요될 수 있습니다.")
-                    success = self.predictor.train()
-                    if not success:
-                        QMessageBox.critical(self, "오류", "모델 학습에 실패했습니다. 데이터 부족 등의 이유일 수 있습니다.")
-                        self.result_list_widget.clear()
-                        return
-
-                # 최근 5회차 데이터 준비
-                window_size = 5
-                if len(self.data_manager.df) < window_size:
-                     QMessageBox.warning(self, "데이터 부족", "예측을 위한 최근 데이터가 부족합니다.")
-                     predicted_nums = []
-                else:
-                    # 최신순 정렬이므로 앞에서부터가 아니라, 날짜 정렬 후 뒤에서 가져와야 함
-                    recent_df = self.data_manager.df.head(window_size).sort_values(by='draw_no', ascending=True)
-                    number_cols = [f'num{i}' for i in range(1, 7)]
-                    recent_data = recent_df[number_cols].values # shape (5, 6)
-                    
-                    # diversity를 위해 noise_level 주입
-                    # 0.0 ~ 0.2 사이의 노이즈를 주어 확률 분포를 약간씩 흔듦
-                    predicted_nums = self.predictor.predict(
-                        recent_data, 
-                        top_n=6, 
-                        exclude_numbers=exclude_numbers, 
-                        include_numbers=include_numbers,
-                        noise_level=0.15 # 15% 정도의 변동성
-                    )
-
-            if predicted_nums:
-                self.result_list_widget.addItem(f"예측 {i+1}: {', '.join(map(str, predicted_nums))}")
-            else:
-                self.result_list_widget.addItem(f"예측 {i+1}: 번호 생성 실패 (설정을 확인하세요)")
+
+    def on_backtest_error(self, message):
+        self.backtest_button.setEnabled(True)
+        self.result_list_widget.clear()
+        QMessageBox.critical(self, "오류", f"백테스트 중 오류가 발생했습니다: {message}")